@@ -1,26 +1,79 @@
+from typing import Any, Dict
 from config import settings
 from adapters.redis_adapter import RedisAdapter
-from adapters.supabase_adapter import SupabaseAdapter
-from adapters.firestore_adapter import FirestoreAdapter
-from adapters.mongodb_adapter import MongoDBAdapter # Import MongoDBAdapter
 from adapters.caching_adapter import CachingAdapter
+from adapters.cache_health import CacheHealth
 from adapters.base import AbstractStorageAdapter
+from adapters.write_behind import WriteBehindQueue
+from adapters.instrumented import InstrumentedAdapter
+from utils.connections import get_connection_manager
+from utils.metrics import preregister
+
+# Models whose metric series are created at import, so dashboards see them before the first request
+INSTRUMENTED_MODELS = [
+    "User", "Wallet", "Reputation", "Transaction", "SNFT", "PropertyListing", "BidHistoryEntry",
+    "Seller", "PropertyMarketplaceItem", "CollectionItem", "Webhook",
+]
+preregister(["redis", settings.STORAGE_ENGINE.lower()], INSTRUMENTED_MODELS)
+
+# One breaker per worker: get_adapter() builds a CachingAdapter per call, but they all share the Redis tier
+cache_health = CacheHealth(
+    error_rate=settings.CACHE_BYPASS_ERROR_RATE,
+    slow_call_seconds=settings.CACHE_BYPASS_LATENCY_MS / 1000,
+    probe_interval=settings.CACHE_PROBE_SECONDS,
+    max_pending=settings.CACHE_MAX_PENDING_INVALIDATIONS,
+)
+
+# One write-behind queue per Redis client: each registers its Lua scripts, and main.py starts the flusher of
+# the same instance every CachingAdapter enqueues to
+_write_behind_queues: Dict[int, WriteBehindQueue] = {}
+
+def write_behind_queue(redis_client: Any) -> WriteBehindQueue:
+    queue = _write_behind_queues.get(id(redis_client))
+    if queue is None:
+        queue = _write_behind_queues[id(redis_client)] = WriteBehindQueue(redis_client) # Holds the client, so its id is not reused
+    return queue
+
+def is_trusted(engine: str) -> bool:
+    """Whether reads from `engine` may skip validation (see TRUSTED_READ_ADAPTERS)."""
+    return engine in settings.TRUSTED_READ_ADAPTERS
+
+def caching(redis: RedisAdapter, primary: AbstractStorageAdapter) -> CachingAdapter:
+    """Fronts `primary` with the Redis cache, using the configured per-model write policies."""
+    return CachingAdapter(
+        cache=InstrumentedAdapter(redis, "redis"),
+        primary=InstrumentedAdapter(primary, settings.STORAGE_ENGINE.lower()),
+        write_policies=settings.CACHE_WRITE_POLICIES,
+        write_behind=write_behind_queue(redis.client),
+        health=cache_health,
+        read_timeout=settings.CACHE_READ_TIMEOUT_MS / 1000,
+        invalidate_timeout=settings.CACHE_INVALIDATE_TIMEOUT_MS / 1000,
+    )
 
 def get_adapter() -> AbstractStorageAdapter:
-    redis = RedisAdapter(ttl_seconds=3600)
+    # Adapters are cheap per-call wrappers; the clients and their pools are shared through the connection manager
+    connections = get_connection_manager()
+    redis = RedisAdapter(ttl_seconds=3600, trusted_reads=is_trusted("REDIS"), client=connections.redis())
 
+    # Backend packages (supabase, google-cloud-firestore, motor) are imported for the configured engine only,
+    # on the first call rather than at startup
     if settings.STORAGE_ENGINE == "SUPABASE":
-        return CachingAdapter(cache=redis, primary=SupabaseAdapter())
+        from adapters.supabase_adapter import SupabaseAdapter
+        return caching(redis, SupabaseAdapter(trusted_reads=is_trusted("SUPABASE"), client=connections.supabase()))
     elif settings.STORAGE_ENGINE == "FIRESTORE":
-        return CachingAdapter(cache=redis, primary=FirestoreAdapter())
+        from adapters.firestore_adapter import FirestoreAdapter
+        return caching(redis, FirestoreAdapter(trusted_reads=is_trusted("FIRESTORE"), client=connections.firestore()))
     elif settings.STORAGE_ENGINE == "MONGODB": # Add condition for MongoDB
+        from adapters.mongodb_adapter import MongoDBAdapter
         # Assuming settings has MONGODB_CONNECTION_STRING and MONGODB_DATABASE_NAME
         mongodb_adapter = MongoDBAdapter(
             connection_string=settings.MONGODB_CONNECTION_STRING,
-            database_name=settings.MONGODB_DATABASE_NAME
+            database_name=settings.MONGODB_DATABASE_NAME,
+            trusted_reads=is_trusted("MONGODB"),
+            connections=connections,
         )
-        return CachingAdapter(cache=redis, primary=mongodb_adapter)
+        return caching(redis, mongodb_adapter)
     elif settings.STORAGE_ENGINE == "REDIS":
-        return redis
+        return InstrumentedAdapter(redis, "redis")
     else:
         raise ValueError(f"Unsupported STORAGE_ENGINE: {settings.STORAGE_ENGINE}")
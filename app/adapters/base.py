@@ -1,23 +1,47 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Optional, Type, Any # Import necessary types
+from typing import AsyncIterator, Dict, List, Optional, Type, Any # Import necessary types
 from pydantic import BaseModel # Import BaseModel
 
+DEFAULT_ITER_BATCH_SIZE = 500
+
+def matches(record: Any, filters: Optional[Dict[str, Any]]) -> bool:
+    """In-memory equality filter for backends that cannot push `filters` down."""
+    if not filters:
+        return True
+    get = record.get if isinstance(record, dict) else lambda name: getattr(record, name, None)
+    return all(get(name) == value for name, value in filters.items())
+
 class AbstractStorageAdapter(ABC):
     @abstractmethod
     async def create(self, model_instance: BaseModel) -> BaseModel:
         """Creates a new record."""
         pass
 
+    async def create_many(self, model_instances: List[BaseModel]) -> List[BaseModel]:
+        """Creates several records. Results follow the order of `model_instances`."""
+        # Backends override this with batched writes
+        return list(await asyncio.gather(*(self.create(instance) for instance in model_instances)))
+
     @abstractmethod
     async def read(self, model_type: Type[BaseModel], id: Any) -> Optional[BaseModel]:
         """Reads a record by ID."""
         pass
 
+    async def read_many(self, model_type: Type[BaseModel], ids: List[Any]) -> List[Optional[BaseModel]]:
+        """Reads several records by ID. Results follow the order of `ids`, with None for missing records."""
+        # Backends override this with a single batched query
+        return list(await asyncio.gather(*(self.read(model_type, id) for id in ids)))
+
     @abstractmethod
     async def update(self, model_instance: BaseModel) -> BaseModel:
         """Updates an existing record."""
         pass
 
+    async def update_many(self, model_instances: List[BaseModel]) -> List[BaseModel]:
+        """Updates several records. Results follow the order of `model_instances`."""
+        return list(await asyncio.gather(*(self.update(instance) for instance in model_instances)))
+
     @abstractmethod
     async def delete(self, model_type: Type[BaseModel], id: Any) -> None:
         """Deletes a record by ID."""
@@ -27,3 +51,21 @@ class AbstractStorageAdapter(ABC):
     async def list(self, model_type: Type[BaseModel]) -> List[BaseModel]:
         """Lists all records of a given type."""
         pass
+
+    async def iter(
+        self,
+        model_type: Type[BaseModel],
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = DEFAULT_ITER_BATCH_SIZE,
+        fields: Optional[List[str]] = None,
+    ) -> AsyncIterator[BaseModel]:
+        """
+        Yields records of a given type, optionally matching `filters` (field -> value equality).
+        Backends override this to fetch `batch_size` records at a time, so memory stays flat.
+        Backends that support projections fetch only `fields` (plus the ID) and return partial
+        models; the others ignore it and return whole records.
+        """
+        # Fallback for adapters without a streaming implementation
+        for record in await self.list(model_type):
+            if matches(record, filters):
+                yield record
@@ -0,0 +1,130 @@
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from utils.logger import get_logger
+from utils.metrics import CACHE_HEALTHY, CACHE_PENDING_INVALIDATIONS
+
+logger = get_logger(__name__)
+
+CLOSED = "closed" # Healthy: calls go to the cache
+OPEN = "open" # Unhealthy: calls bypass the cache until the next probe
+PROBING = "probing" # One call is testing whether the cache has recovered
+
+class CacheHealth:
+    """
+    Circuit breaker for the cache tier, shared by every CachingAdapter in the
+    process and fed with the outcome and latency of each cache call.
+
+    Over the last `window` calls, an error rate (timeouts included) of at least
+    `error_rate` or a mean latency of at least `slow_call_seconds` opens the
+    breaker: callers then skip the cache and go straight to the primary. Every
+    `probe_interval` seconds one call is let through; if it succeeds the
+    breaker closes again.
+
+    Invalidations that could not reach the cache are kept in `pending` (at most
+    `max_pending`, oldest dropped first; dropped entries expire with the cache
+    TTL). Reads of a pending record bypass the cache until CachingAdapter has
+    replayed its invalidation.
+    """
+
+    def __init__(
+        self,
+        error_rate: float = 0.5,
+        slow_call_seconds: float = 0.05,
+        window: int = 50,
+        min_calls: int = 10,
+        probe_interval: float = 5.0,
+        max_pending: int = 10000,
+        tier: str = "redis",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.min_calls = min_calls
+        self.probe_interval = probe_interval
+        self.max_pending = max_pending
+        self.clock = clock
+        self._healthy = CACHE_HEALTHY.labels(tier)
+        self._pending_gauge = CACHE_PENDING_INVALIDATIONS.labels(tier)
+
+        self.state = CLOSED
+        self._calls: Deque[Tuple[bool, float]] = deque(maxlen=window) # (succeeded, seconds)
+        self._opened_at = 0.0
+        self._pending: "OrderedDict[Tuple[Type[BaseModel], Any], int]" = OrderedDict() # (model, id) -> sequence
+        self._sequence = 0
+        self.replay_task: Any = None # CachingAdapter's running replay, if any
+        self._healthy.set(1)
+
+    def allow(self) -> bool:
+        """Whether to call the cache now. While open, True once per probe interval (the caller is the probe)."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self.clock() - self._opened_at >= self.probe_interval:
+            self.state = PROBING
+            return True
+        return False
+
+    def record(self, succeeded: bool, seconds: float) -> None:
+        """Records one cache call made after allow() returned True."""
+        if self.state == PROBING:
+            if succeeded:
+                self._close()
+            else:
+                self._open("probe failed")
+            return
+        if self.state == OPEN:
+            return # Started before the breaker opened
+        self._calls.append((succeeded, seconds))
+        if len(self._calls) < self.min_calls:
+            return
+        failures = sum(1 for ok, _ in self._calls if not ok)
+        mean_seconds = sum(seconds for _, seconds in self._calls) / len(self._calls)
+        if failures / len(self._calls) >= self.error_rate:
+            self._open(f"{failures} of the last {len(self._calls)} calls failed")
+        elif mean_seconds >= self.slow_call_seconds:
+            self._open(f"mean latency {mean_seconds * 1000:.1f}ms over the last {len(self._calls)} calls")
+
+    def _open(self, reason: str) -> None:
+        if self.state == CLOSED:
+            logger.warning(f"[Cache Health] Bypassing the cache: {reason}")
+        self.state = OPEN
+        self._opened_at = self.clock()
+        self._calls.clear()
+        self._healthy.set(0)
+
+    def _close(self) -> None:
+        logger.info("[Cache Health] Cache recovered, resuming reads")
+        self.state = CLOSED
+        self._calls.clear()
+        self._healthy.set(1)
+
+    def defer_invalidation(self, model_type: Type[BaseModel], id: Any) -> None:
+        key = (model_type, id)
+        self._sequence += 1
+        self._pending.pop(key, None)
+        self._pending[key] = self._sequence
+        if len(self._pending) > self.max_pending:
+            dropped, _ = self._pending.popitem(last=False)
+            logger.warning(f"[Cache Health] Too many pending invalidations, dropped {dropped[0].__name__} {dropped[1]}")
+        self._pending_gauge.set(len(self._pending))
+
+    def is_pending(self, model_type: Type[BaseModel], id: Any) -> bool:
+        return bool(self._pending) and (model_type, id) in self._pending
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def pending(self) -> List[Tuple[Type[BaseModel], Any, int]]:
+        """Snapshot of the pending invalidations, oldest first, with the sequence to pass to invalidated()."""
+        return [(model_type, id, sequence) for (model_type, id), sequence in self._pending.items()]
+
+    def invalidated(self, model_type: Type[BaseModel], id: Any, sequence: Optional[int] = None) -> None:
+        """Drops a replayed invalidation, unless it was deferred again since the snapshot it came from."""
+        key = (model_type, id)
+        if sequence is None or self._pending.get(key) == sequence:
+            self._pending.pop(key, None)
+            self._pending_gauge.set(len(self._pending))
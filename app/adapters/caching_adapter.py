@@ -1,89 +1,320 @@
-from adapters.base import AbstractStorageAdapter
+import asyncio
+import importlib
+import pkgutil
+import time
+import models
+from adapters.base import AbstractStorageAdapter, DEFAULT_ITER_BATCH_SIZE
+from adapters.cache_health import CLOSED, CacheHealth
+from adapters.ids import id_codec, normalize_id
+from adapters.write_behind import WriteBehindQueue
 from models.user import User
 from utils.logger import get_logger
-from typing import List, Optional, Type, Any # Import missing types
+from utils.metrics import cache_bypasses, cache_metrics
+from utils.tracing import tracer
+from typing import AsyncIterator, Awaitable, Dict, List, Optional, Type, Any # Import missing types
 from pydantic import BaseModel # Import BaseModel
 from typing import cast # Import cast
 
 logger = get_logger(__name__)
 
+# Per-model write policies (CACHE_WRITE_POLICIES, keyed by model class name)
+INVALIDATE = "invalidate" # Write the primary, then drop the cached copy
+WRITE_THROUGH = "write_through" # Write the primary, then cache the written value
+WRITE_BEHIND = "write_behind" # Cache the value and queue the primary write for a batched flush
+
+CACHE_TIER = "redis" # Label for hit-ratio metrics; the GraphQL response cache is the "response" tier
+
+def _models_named(name: str) -> List[Type[BaseModel]]:
+    """Every loaded model class called `name`. Policies are keyed by class name, which models in different modules may share."""
+    for module in pkgutil.iter_modules(models.__path__):
+        importlib.import_module(f"models.{module.name}") # So the app's models are all found, whatever was imported so far
+    found: List[Type[BaseModel]] = []
+    subclasses = list(BaseModel.__subclasses__())
+    while subclasses:
+        model_type = subclasses.pop()
+        subclasses.extend(model_type.__subclasses__())
+        if model_type.__name__ == name:
+            found.append(model_type)
+    return found
+
 class CachingAdapter(AbstractStorageAdapter):
     def __init__(
         self,
         cache: AbstractStorageAdapter,
         primary: AbstractStorageAdapter,
+        write_policies: Optional[Dict[str, str]] = None,
+        write_behind: Optional[WriteBehindQueue] = None,
+        health: Optional[CacheHealth] = None, # Shared breaker; None always calls the cache
+        read_timeout: Optional[float] = None, # Seconds per cache read; None waits as long as the client does
+        invalidate_timeout: Optional[float] = None, # Seconds per invalidation, fill or write-through write
     ):
         self.cache = cache
         self.primary = primary
+        self.write_policies = write_policies or {}
+        self.write_behind = write_behind
+        self.health = health
+        self.read_timeout = read_timeout
+        self.invalidate_timeout = invalidate_timeout
+        for name, policy in self.write_policies.items():
+            if policy != WRITE_BEHIND:
+                continue
+            for model_type in _models_named(name):
+                if "id" not in model_type.model_fields:
+                    # Queued writes and their cache entries are keyed by the record's ID
+                    raise ValueError(f"Write-behind needs an id field, but {model_type.__module__}.{model_type.__qualname__} has none")
+
+    def _policy(self, model_type: Type[BaseModel]) -> str:
+        policy = self.write_policies.get(model_type.__name__, INVALIDATE)
+        if policy == WRITE_BEHIND and self.write_behind is None:
+            return WRITE_THROUGH # No queue to defer writes to
+        return policy
+
+    def _cache_usable(self, model_type: Type[BaseModel], id: Any = None) -> bool:
+        """Whether to call the cache now: not while the breaker is open, nor for a record with a pending invalidation."""
+        if self.health is None:
+            return True
+        if id is not None and self.health.is_pending(model_type, id):
+            return False # Checked first, so no probe is spent on a call that is not made
+        return self.health.allow()
+
+    async def _cache_call(self, call: Awaitable[Any], timeout: Optional[float]) -> Any:
+        """Awaits a cache call within `timeout`, reporting its outcome and latency to the breaker."""
+        started = time.perf_counter()
+        succeeded = False
+        try:
+            result = await (asyncio.wait_for(call, timeout) if timeout else call)
+            succeeded = True
+        finally:
+            if self.health is not None: # Also on cancellation, so a probe never leaves the breaker waiting
+                self.health.record(succeeded, time.perf_counter() - started)
+        if self.health is not None and self.health.has_pending and self.health.state == CLOSED:
+            self._schedule_replay()
+        return result
+
+    def _schedule_replay(self) -> None:
+        task = self.health.replay_task # type: ignore[union-attr]
+        if task is None or task.done():
+            self.health.replay_task = asyncio.create_task(self._replay()) # type: ignore[union-attr]
+
+    async def _replay(self) -> None:
+        """Replays the invalidations deferred while the cache was unusable, oldest first."""
+        health = cast(CacheHealth, self.health)
+        pending = health.pending()
+        logger.info(f"[Cache Health] Replaying {len(pending)} deferred invalidations")
+        for model_type, id, sequence in pending:
+            if health.state != CLOSED:
+                return # Unhealthy again; the next successful call resumes the replay
+            try:
+                await self._cache_call(self.cache.delete(model_type, id), self.invalidate_timeout)
+            except Exception as e:
+                logger.error(f"[Cache Error] Error replaying invalidation for {model_type.__name__} with ID {id}: {e}")
+                return
+            health.invalidated(model_type, id, sequence)
+
+    async def _invalidate(self, model_type: Type[BaseModel], id: Any) -> None:
+        """Drops the cached copy of a record, or defers that until the cache is usable again."""
+        if self._cache_usable(model_type):
+            try:
+                logger.debug(f"[Cache Invalidate] Invalidating cache for {model_type.__name__} with ID {id}")
+                await self._cache_call(self.cache.delete(model_type, id), self.invalidate_timeout)
+                self._invalidated(model_type, id)
+                return
+            except Exception as e:
+                logger.error(f"[Cache Error] Error invalidating cache for {model_type.__name__} with ID {id}: {e}")
+        if self.health is not None:
+            id = normalize_id(model_type, id)
+            if id is not None:
+                self.health.defer_invalidation(model_type, id) # Reads of the record bypass the cache until replayed
+
+    def _invalidated(self, model_type: Type[BaseModel], id: Any) -> None:
+        """The cached copy of a record is current again, so any deferred invalidation for it is moot."""
+        if self.health is not None and self.health.has_pending:
+            self.health.invalidated(model_type, normalize_id(model_type, id))
+
+    async def _sync_cache(self, instances: List[BaseModel], policy: str, op: str) -> None:
+        """Brings the cache in line with records just written to the primary."""
+        for instance in instances:
+            item_id = getattr(instance, 'id', None)
+            if not item_id:
+                continue
+            model_type = instance.__class__
+            if policy == WRITE_THROUGH and self._cache_usable(model_type):
+                try:
+                    logger.debug(f"[Cache Write] Caching written {model_type.__name__} with ID {item_id}")
+                    # Overwrites any previous entry and resets its TTL
+                    await self._cache_call(self.cache.update(instance), self.invalidate_timeout)
+                    self._invalidated(model_type, item_id)
+                    continue
+                except Exception as e:
+                    logger.error(f"[Cache Error] Error updating cache for {model_type.__name__} with ID {item_id}: {e}")
+            if policy == WRITE_THROUGH or op == "update":
+                await self._invalidate(model_type, item_id) # Never leave the previous value behind
+
+    async def _write_behind(self, model_instance: BaseModel, op: str) -> BaseModel:
+        """Queues the primary write durably, then serves the new value from the cache until it is flushed."""
+        if not getattr(model_instance, 'id', None):
+            # The primary has not assigned an ID yet, so take one in the model's ID format
+            model_instance = model_instance.model_copy(update={"id": id_codec(model_instance.__class__).generate()})
+        await self.write_behind.enqueue(model_instance, op) # type: ignore[union-attr]
+        await self._sync_cache([model_instance], WRITE_THROUGH, op)
+        return model_instance
+
+    async def _write_many(self, model_instances: List[BaseModel], op: str) -> List[BaseModel]:
+        """Applies each model's write policy to a batch. Results follow the order of `model_instances`."""
+        results: List[Optional[BaseModel]] = [None] * len(model_instances)
+        groups: Dict[str, List[int]] = {}
+        for index, instance in enumerate(model_instances):
+            groups.setdefault(self._policy(instance.__class__), []).append(index)
+        for policy, indexes in groups.items():
+            batch = [model_instances[index] for index in indexes]
+            if policy == WRITE_BEHIND:
+                written = [await self._write_behind(instance, op) for instance in batch]
+            else:
+                write = self.primary.create_many if op == "create" else self.primary.update_many
+                written = await write(batch)
+                await self._sync_cache(written, policy, op)
+            for index, instance in zip(indexes, written):
+                results[index] = instance
+        return cast(List[BaseModel], results)
 
     async def create(self, model_instance: BaseModel) -> BaseModel:
-        """Creates a new record in the primary adapter."""
-        # Cache is not typically involved in creation in this pattern
-        return await self.primary.create(model_instance)
+        """Creates a new record according to the model's write policy."""
+        policy = self._policy(model_instance.__class__)
+        if policy == WRITE_BEHIND:
+            return await self._write_behind(model_instance, "create")
+        created_instance = await self.primary.create(model_instance)
+        # Invalidate has nothing to drop for a new record; write-through caches it for the reads that follow
+        await self._sync_cache([created_instance], policy, "create")
+        return created_instance
+
+    async def create_many(self, model_instances: List[BaseModel]) -> List[BaseModel]:
+        """Creates several records with the primary adapter's batched write path."""
+        return await self._write_many(model_instances, "create")
+
+    def _span(self, name: str, model_type: Type[BaseModel]) -> Any:
+        return tracer.start_as_current_span(name, attributes={"cache.tier": CACHE_TIER, "db.model": model_type.__name__})
 
     async def read(self, model_type: Type[BaseModel], id: Any) -> Optional[BaseModel]:
         """Reads a record, attempting cache first, then primary."""
-        try:
-            # Attempt to read from cache using the generic read method
-            cached_result = await self.cache.read(model_type, id)
-            if cached_result:
-                logger.debug(f"[Cache] Cache hit for {model_type.__name__} with ID {id}")
-                return cached_result
-            logger.info(f"[Cache Miss] {model_type.__name__} with ID {id} not found in cache, hitting primary")
-        except Exception as e:
-            # Log cache read errors but don't fail the operation
-            logger.error(f"[Cache Error] Error reading from cache for {model_type.__name__} with ID {id}: {e}")
+        with self._span("cache.read", model_type) as span:
+            return await self._read(model_type, id, span)
 
+    async def _read(self, model_type: Type[BaseModel], id: Any, span: Any) -> Optional[BaseModel]:
+        # Both tiers are keyed by the canonical ID, so e.g. an upper-case UUID hits the same entry
+        id = normalize_id(model_type, id)
+        if id is None:
+            return None # Not a valid ID for this model; neither store can have it
+        if self._cache_usable(model_type, id):
+            try:
+                # Attempt to read from cache using the generic read method
+                cached_result = await self._cache_call(self.cache.read(model_type, id), self.read_timeout)
+                if cached_result:
+                    logger.debug(f"[Cache] Cache hit for {model_type.__name__} with ID {id}")
+                    cache_metrics(CACHE_TIER, model_type.__name__)[0].inc()
+                    span.set_attribute("cache.hit", True)
+                    return cached_result
+                logger.info(f"[Cache Miss] {model_type.__name__} with ID {id} not found in cache, hitting primary")
+            except Exception as e:
+                # Log cache read errors (timeouts included) but don't fail the operation
+                logger.error(f"[Cache Error] Error reading from cache for {model_type.__name__} with ID {id}: {e}")
+            cache_metrics(CACHE_TIER, model_type.__name__)[1].inc() # Cache errors count as misses
+        else:
+            cache_bypasses(CACHE_TIER, model_type.__name__).inc()
+        span.set_attribute("cache.hit", False)
         # Read from primary
         primary_result = await self.primary.read(model_type, id)
 
         # If found in primary, store in cache
-        if primary_result:
+        if primary_result and self._cache_usable(model_type, id):
             try:
                 logger.debug(f"[Cache Fill] Storing {model_type.__name__} with ID {id} in cache")
                 # Use the generic create or update method for caching
                 # Assuming create is suitable for adding to cache
-                await self.cache.create(primary_result)
+                await self._cache_call(self.cache.create(primary_result), self.invalidate_timeout)
             except Exception as e:
                 logger.error(f"[Cache Error] Error writing to cache for {model_type.__name__} with ID {id}: {e}")
 
         return primary_result
 
-    async def update(self, model_instance: BaseModel) -> BaseModel:
-        """Updates a record in the primary adapter and invalidates cache."""
-        # Update in primary
-        updated_instance = await self.primary.update(model_instance)
+    async def read_many(self, model_type: Type[BaseModel], ids: List[Any]) -> List[Optional[BaseModel]]:
+        """Reads several records: one batched cache read, then one batched primary read for the misses."""
+        with self._span("cache.read_many", model_type) as span:
+            return await self._read_many(model_type, ids, span)
 
-        # Invalidate or update cache for the specific item
-        try:
-            # Assuming the model instance has an 'id' attribute
-            item_id = getattr(updated_instance, 'id', None)
-            if item_id:
-                 # Attempt to delete from cache to invalidate using the generic delete method
-                logger.debug(f"[Cache Invalidate] Invalidating cache for {updated_instance.__class__.__name__} with ID {item_id}")
-                await self.cache.delete(updated_instance.__class__, item_id)
-        except Exception as e:
-             # Use getattr safely for item_id in error message as well
-             error_item_id = getattr(updated_instance, 'id', 'N/A')
-             logger.error(f"[Cache Error] Error invalidating cache for {updated_instance.__class__.__name__} with ID {error_item_id}: {e}")
+    async def _read_many(self, model_type: Type[BaseModel], ids: List[Any], span: Any) -> List[Optional[BaseModel]]:
+        ids = [normalize_id(model_type, id) for id in ids]
+        results: List[Optional[BaseModel]] = [None] * len(ids)
+        if self._cache_usable(model_type):
+            try:
+                results = list(await self._cache_call(self.cache.read_many(model_type, ids), self.read_timeout))
+            except Exception as e:
+                logger.error(f"[Cache Error] Error batch reading {model_type.__name__} from cache: {e}")
+            if self.health is not None and self.health.has_pending: # Possibly stale until their invalidation is replayed
+                results = [None if id is not None and self.health.is_pending(model_type, id) else result for id, result in zip(ids, results)]
+            missing = [index for index, result in enumerate(results) if result is None and ids[index] is not None]
+            hits, misses = cache_metrics(CACHE_TIER, model_type.__name__)
+            hits.inc(len(ids) - len(missing))
+            misses.inc(len(missing))
+        else:
+            missing = [index for index, id in enumerate(ids) if id is not None]
+            cache_bypasses(CACHE_TIER, model_type.__name__).inc(len(missing))
+        span.set_attribute("cache.hits", len(ids) - len(missing))
+        span.set_attribute("cache.misses", len(missing))
+        if not missing:
+            logger.debug(f"[Cache] Cache hit for all {len(ids)} {model_type.__name__} records")
+            return results
+        logger.info(f"[Cache Miss] {len(missing)} of {len(ids)} {model_type.__name__} records not in cache, hitting primary")
 
+        primary_results = await self.primary.read_many(model_type, [ids[index] for index in missing])
+        fills = []
+        for index, primary_result in zip(missing, primary_results):
+            results[index] = primary_result
+            if primary_result and not (self.health is not None and self.health.is_pending(model_type, ids[index])):
+                fills.append(primary_result)
+        if fills and self._cache_usable(model_type):
+            try:
+                # One batched write, so the fill stays a single round trip whatever the batch size
+                await self._cache_call(self.cache.create_many(fills), self.invalidate_timeout)
+            except Exception as e:
+                logger.error(f"[Cache Error] Error writing {len(fills)} {model_type.__name__} records to cache: {e}")
+        return results
 
+    async def update(self, model_instance: BaseModel) -> BaseModel:
+        """Updates a record according to the model's write policy (by default: primary, then invalidate the cache)."""
+        policy = self._policy(model_instance.__class__)
+        if policy == WRITE_BEHIND:
+            return await self._write_behind(model_instance, "update")
+        updated_instance = await self.primary.update(model_instance)
+        await self._sync_cache([updated_instance], policy, "update")
         return updated_instance
 
+    async def update_many(self, model_instances: List[BaseModel]) -> List[BaseModel]:
+        """Updates several records with the primary adapter's batched write path, then syncs each cached copy."""
+        return await self._write_many(model_instances, "update")
+
     async def delete(self, model_type: Type[BaseModel], id: Any) -> None:
         """Deletes a record from the primary adapter and invalidates cache."""
+        if self._policy(model_type) == WRITE_BEHIND:
+            await self.write_behind.discard(model_type, id) # type: ignore[union-attr]
         # Delete from primary
         await self.primary.delete(model_type, id)
 
         # Invalidate cache for the specific item
-        try:
-            logger.debug(f"[Cache Invalidate] Invalidating cache for {model_type.__name__} with ID {id}")
-            await self.cache.delete(model_type, id)
-        except Exception as e:
-            logger.error(f"[Cache Error] Error invalidating cache for {model_type.__name__} with ID {id}: {e}")
+        await self._invalidate(model_type, id)
 
     async def list(self, model_type: Type[BaseModel]) -> List[BaseModel]:
         """Lists all records from the primary adapter (caching list results is complex and often not done)."""
         # For simplicity, list operations typically bypass cache or use a separate caching strategy
         logger.debug(f"[Cache Bypass] Listing {model_type.__name__} from primary adapter")
         return await self.primary.list(model_type)
+
+    async def iter(
+        self,
+        model_type: Type[BaseModel],
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = DEFAULT_ITER_BATCH_SIZE,
+        fields: Optional[List[str]] = None,
+    ) -> AsyncIterator[BaseModel]:
+        """Streams from the primary adapter. Scans bypass the cache so they neither serve stale data nor evict hot keys."""
+        async for record in self.primary.iter(model_type, filters, batch_size, fields):
+            yield record
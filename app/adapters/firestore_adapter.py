@@ -1,64 +1,107 @@
 from google.cloud.firestore_v1 import AsyncClient
-from adapters.base import AbstractStorageAdapter
+from google.cloud.firestore_v1.base_query import FieldFilter
+from adapters.base import AbstractStorageAdapter, DEFAULT_ITER_BATCH_SIZE
+from adapters.ids import id_codec, normalize_id
+from adapters.validation import load_model
 from pydantic import BaseModel
-from typing import List, Optional, Type, Any
+from typing import AsyncIterator, Dict, List, Optional, Type, Any
 from strawberry import ID # Keep ID import if used by models
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FIRESTORE_BATCH_LIMIT = 500 # Maximum number of writes Firestore accepts in one batch
 
 class FirestoreAdapter(AbstractStorageAdapter):
-    def __init__(self):
+    def __init__(self, trusted_reads: bool = False, client: Optional[Any] = None):
         # Initialize Firestore client. Project ID is typically inferred from the environment.
-        self.client = AsyncClient()
+        self.client = client if client is not None else AsyncClient()
+        self.trusted_reads = trusted_reads # Skip re-validating documents this API wrote
+
+    @staticmethod
+    def _new_id(model_instance: BaseModel) -> str:
+        codec = id_codec(model_instance.__class__)
+        instance_id = getattr(model_instance, 'id', None)
+        return codec.normalize(instance_id) if instance_id else codec.generate()
 
     async def create(self, model_instance: BaseModel) -> BaseModel:
         """Creates a new record in Firestore."""
         collection_name = model_instance.__class__.__name__.lower()
-        # Add a new document with a Firestore-generated ID
-        doc_ref = await self.client.collection(collection_name).add(model_instance.model_dump())
-        # Retrieve the created document to get the generated ID and full data
-        doc = await doc_ref[0].get() # add() returns a tuple (DocumentReference, dict)
-        if doc.exists:
-            # Update the model instance with the generated ID before returning
-            created_data = doc.to_dict()
-            if created_data is not None: # Check if data is not None
-                created_data['id'] = doc.id # Assuming Pydantic model has an 'id' field
-                return model_instance.__class__.model_validate(created_data)
-        raise Exception(f"Failed to create {collection_name} record.")
+        # Create the document under the caller's ID, or a new one in the model's ID format. The written
+        # state is the local data, so it is returned directly instead of being read back.
+        doc_id = self._new_id(model_instance)
+        write_result = await self.client.collection(collection_name).document(doc_id).create(model_instance.model_dump())
+        logger.debug(f"[Firestore] Created {collection_name}/{doc_id} at {write_result.update_time}")
+        return model_instance.model_copy(update={"id": doc_id})
+
+    async def create_many(self, model_instances: List[BaseModel]) -> List[BaseModel]:
+        """Creates several records with batched writes, one commit per FIRESTORE_BATCH_LIMIT documents."""
+        created: List[BaseModel] = []
+        for start in range(0, len(model_instances), FIRESTORE_BATCH_LIMIT):
+            batch = self.client.batch()
+            for model_instance in model_instances[start:start + FIRESTORE_BATCH_LIMIT]:
+                doc_ref = self.client.collection(model_instance.__class__.__name__.lower()).document(self._new_id(model_instance))
+                batch.create(doc_ref, model_instance.model_dump())
+                created.append(model_instance.model_copy(update={"id": doc_ref.id}))
+            write_results = await batch.commit()
+            logger.debug(f"[Firestore] Batch created {len(write_results)} documents")
+        return created
 
     async def read(self, model_type: Type[BaseModel], id: Any) -> Optional[BaseModel]:
         """Reads a record by ID from Firestore."""
         collection_name = model_type.__name__.lower()
-        doc_ref = self.client.collection(collection_name).document(str(id)) # Ensure ID is string
-        doc = await doc_ref.get()
+        normalized_id = normalize_id(model_type, id)
+        if normalized_id is None:
+            return None # Not a valid ID for this model, so it cannot exist
+        doc = await self.client.collection(collection_name).document(normalized_id).get()
         if doc.exists:
             data = doc.to_dict()
             if data is not None: # Check if data is not None
                 data['id'] = doc.id # Include document ID in data
-                return model_type.model_validate(data)
+                return load_model(model_type, data, self.trusted_reads)
         return None
 
+    async def read_many(self, model_type: Type[BaseModel], ids: List[Any]) -> List[Optional[BaseModel]]:
+        """Reads several documents in one batched get_all call. Results follow the order of `ids`."""
+        collection = self.client.collection(model_type.__name__.lower())
+        normalized_ids = [normalize_id(model_type, id) for id in ids]
+        refs = [collection.document(id) for id in normalized_ids if id is not None]
+        found = {}
+        if refs:
+            async for doc in self.client.get_all(refs): # get_all does not preserve request order
+                data = doc.to_dict() if doc.exists else None
+                if data is not None:
+                    data['id'] = doc.id
+                    found[doc.id] = load_model(model_type, data, self.trusted_reads)
+        return [found.get(id) if id is not None else None for id in normalized_ids]
+
     async def update(self, model_instance: BaseModel) -> BaseModel:
         """Updates an existing record in Firestore."""
         collection_name = model_instance.__class__.__name__.lower()
-        # Assuming the model instance has an 'id' attribute
         # type: ignore comment to suppress Pylance error about missing 'id'
-        doc_ref = self.client.collection(collection_name).document(str(model_instance.id)) # type: ignore
-        # Use set with merge=True to update fields without overwriting
-        await doc_ref.set(model_instance.model_dump(), merge=True)
-        # Retrieve the updated document to return the latest state
-        doc = await doc_ref.get()
-        if doc.exists:
-             updated_data = doc.to_dict()
-             if updated_data is not None: # Check if data is not None
-                 updated_data['id'] = doc.id # Include document ID in data
-                 return model_instance.__class__.model_validate(updated_data)
-        # type: ignore comment to suppress Pylance error about missing 'id' attribute
-        raise Exception(f"Failed to retrieve updated {collection_name} record with id {model_instance.id}.") # type: ignore
+        doc_ref = self.client.collection(collection_name).document(id_codec(model_instance.__class__).normalize(model_instance.id)) # type: ignore
+        # Use set with merge=True to update fields without overwriting. Every model field is written,
+        # so the merged document matches the instance and no read-back is needed.
+        write_result = await doc_ref.set(model_instance.model_dump(), merge=True)
+        logger.debug(f"[Firestore] Updated {collection_name}/{doc_ref.id} at {write_result.update_time}")
+        return model_instance
 
+    async def update_many(self, model_instances: List[BaseModel]) -> List[BaseModel]:
+        """Updates several records with batched merge writes, one commit per FIRESTORE_BATCH_LIMIT documents."""
+        for start in range(0, len(model_instances), FIRESTORE_BATCH_LIMIT):
+            batch = self.client.batch()
+            for model_instance in model_instances[start:start + FIRESTORE_BATCH_LIMIT]:
+                collection_name = model_instance.__class__.__name__.lower()
+                doc_ref = self.client.collection(collection_name).document(id_codec(model_instance.__class__).normalize(model_instance.id)) # type: ignore
+                batch.set(doc_ref, model_instance.model_dump(), merge=True)
+            write_results = await batch.commit()
+            logger.debug(f"[Firestore] Batch updated {len(write_results)} documents")
+        return list(model_instances)
 
     async def delete(self, model_type: Type[BaseModel], id: Any) -> None:
         """Deletes a record by ID from Firestore."""
         collection_name = model_type.__name__.lower()
-        doc_ref = self.client.collection(collection_name).document(str(id)) # Ensure ID is string
+        doc_ref = self.client.collection(collection_name).document(id_codec(model_type).normalize(id))
         await doc_ref.delete()
 
 
@@ -71,5 +114,30 @@ class FirestoreAdapter(AbstractStorageAdapter):
             data = doc.to_dict()
             if data is not None: # Check if data is not None
                 data['id'] = doc.id # Include document ID in data
-                items.append(model_type.model_validate(data))
+                items.append(load_model(model_type, data, self.trusted_reads))
         return items
+
+    async def iter(
+        self,
+        model_type: Type[BaseModel],
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = DEFAULT_ITER_BATCH_SIZE,
+        fields: Optional[List[str]] = None,
+    ) -> AsyncIterator[BaseModel]:
+        """Streams records in pages of `batch_size`, resuming each page after the last document of the previous one."""
+        query = self.client.collection(model_type.__name__.lower())
+        for field, value in (filters or {}).items():
+            query = query.where(filter=FieldFilter(field, "==", value))
+        query = query.order_by("__name__").limit(batch_size)
+        last = None
+        while True:
+            page = query.start_after(last) if last is not None else query
+            docs = [doc async for doc in page.stream()]
+            for doc in docs:
+                data = doc.to_dict()
+                if data is not None:
+                    data['id'] = doc.id
+                    yield load_model(model_type, data, self.trusted_reads)
+            if len(docs) < batch_size:
+                break
+            last = docs[-1]
@@ -0,0 +1,78 @@
+import uuid
+from typing import Any, Dict, Optional, Type
+
+from bson.objectid import ObjectId
+from pydantic import BaseModel
+
+from config import settings
+
+class InvalidIdError(ValueError):
+    """Raised when an ID is not valid for its model's codec."""
+
+class IdCodec:
+    """
+    How one model's IDs look. Every adapter passes IDs through the model's codec,
+    so an ID has one canonical string form (used in the API, cache keys, Redis,
+    Firestore and Supabase) and one native form (the MongoDB `_id`).
+    """
+    kind = "string"
+
+    def normalize(self, id: Any) -> str:
+        """Canonical string form of `id`. Raises InvalidIdError if it is not a valid ID."""
+        normalized = str(id) if id is not None else ""
+        if not normalized:
+            raise InvalidIdError("ID must not be empty")
+        return normalized
+
+    def generate(self) -> str:
+        return str(uuid.uuid4())
+
+    def to_native(self, id: Any) -> Any:
+        """Value stored as the MongoDB `_id`."""
+        return self.normalize(id)
+
+class UuidIdCodec(IdCodec):
+    """UUIDs, normalized to lowercase hyphenated form (e.g. Supabase auth user IDs)."""
+    kind = "uuid"
+
+    def normalize(self, id: Any) -> str:
+        try:
+            return str(id if isinstance(id, uuid.UUID) else uuid.UUID(str(id)))
+        except ValueError:
+            raise InvalidIdError(f"Invalid UUID: {id!r}")
+
+class ObjectIdCodec(IdCodec):
+    """MongoDB ObjectIds, stored natively in MongoDB and as 24-char hex strings elsewhere."""
+    kind = "objectid"
+
+    def normalize(self, id: Any) -> str:
+        if isinstance(id, ObjectId):
+            return str(id)
+        if not ObjectId.is_valid(str(id)):
+            raise InvalidIdError(f"Invalid ObjectId: {id!r}")
+        return str(id).lower()
+
+    def generate(self) -> str:
+        return str(ObjectId())
+
+    def to_native(self, id: Any) -> Any:
+        return ObjectId(self.normalize(id))
+
+ID_CODECS: Dict[str, IdCodec] = {codec.kind: codec for codec in (IdCodec(), UuidIdCodec(), ObjectIdCodec())}
+
+def _default_kind() -> str:
+    if settings.DEFAULT_ID_CODEC:
+        return settings.DEFAULT_ID_CODEC
+    # Documents created by MongoDB itself are keyed by ObjectId; the other stores use string IDs
+    return "objectid" if settings.STORAGE_ENGINE == "MONGODB" else "string"
+
+def id_codec(model_type: Type[BaseModel]) -> IdCodec:
+    """The codec for `model_type`, from MODEL_ID_CODECS (keyed by model class name) or the engine default."""
+    return ID_CODECS[settings.MODEL_ID_CODECS.get(model_type.__name__, _default_kind())]
+
+def normalize_id(model_type: Type[BaseModel], id: Any) -> Optional[str]:
+    """Canonical form of `id`, or None if it cannot be an ID of `model_type` (so lookups can skip the store)."""
+    try:
+        return id_codec(model_type).normalize(id)
+    except InvalidIdError:
+        return None
@@ -0,0 +1,128 @@
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
+
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from pydantic import BaseModel
+
+from adapters.base import AbstractStorageAdapter, DEFAULT_ITER_BATCH_SIZE
+from utils.metrics import operation_metrics
+from utils.operation_stats import count_adapter_call
+from utils.tracing import tracer
+
+def _size(record: Any) -> int:
+    """JSON size of one record (serialized by pydantic-core, without building a dict)."""
+    if not isinstance(record, BaseModel):
+        return 0
+    try:
+        return len(record.__pydantic_serializer__.to_json(record, warnings=False))
+    except Exception:
+        return 0 # Partial (projected) records may not serialize; they are still counted as rows
+
+class InstrumentedAdapter(AbstractStorageAdapter):
+    """
+    Wraps a storage adapter and records latency, errors, row counts and payload
+    bytes per backend, model and operation, plus a client span per call
+    (`redis.read`, `mongodb.iter`, ...). Anything else (the Redis client,
+    ensure_indexes, ...) is delegated to the wrapped adapter.
+
+    Payload bytes for multi-record operations are estimated from the first
+    record, so batches are not serialized a second time just to be measured.
+    """
+
+    def __init__(self, inner: Any, backend: str):
+        self.inner = inner
+        self.backend = backend
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.inner, name)
+
+    def _record(self, model: str, operation: str, started: float, records: List[Any]) -> int:
+        metrics = operation_metrics(self.backend, model, operation)
+        metrics.latency.observe(time.perf_counter() - started)
+        found = [record for record in records if record is not None]
+        if found:
+            metrics.rows.inc(len(found))
+            metrics.bytes.inc(_size(found[0]) * len(found))
+        return len(found)
+
+    def _failed(self, model: str, operation: str, started: float) -> None:
+        metrics = operation_metrics(self.backend, model, operation)
+        metrics.latency.observe(time.perf_counter() - started)
+        metrics.errors.inc()
+
+    def _span_attributes(self, model: str) -> Dict[str, str]:
+        return {"db.system": self.backend, "db.model": model}
+
+    async def _call(self, model: str, operation: str, many: bool, call: Any, *args: Any) -> Any:
+        count_adapter_call(self.backend, operation, model)
+        started = time.perf_counter()
+        with tracer.start_as_current_span(f"{self.backend}.{operation}", kind=SpanKind.CLIENT, attributes=self._span_attributes(model)) as span:
+            try:
+                result = await call(*args)
+            except Exception:
+                self._failed(model, operation, started)
+                raise # The span records the exception
+            rows = self._record(model, operation, started, result if many else [result])
+            if span.is_recording():
+                span.set_attribute("db.rows", rows)
+        return result
+
+    async def create(self, model_instance: BaseModel) -> BaseModel:
+        return await self._call(model_instance.__class__.__name__, "create", False, self.inner.create, model_instance)
+
+    async def create_many(self, model_instances: List[BaseModel]) -> List[BaseModel]:
+        model = model_instances[0].__class__.__name__ if model_instances else "-"
+        return await self._call(model, "create_many", True, self.inner.create_many, model_instances)
+
+    async def read(self, model_type: Type[BaseModel], id: Any) -> Optional[BaseModel]:
+        return await self._call(model_type.__name__, "read", False, self.inner.read, model_type, id)
+
+    async def read_many(self, model_type: Type[BaseModel], ids: List[Any]) -> List[Optional[BaseModel]]:
+        return await self._call(model_type.__name__, "read_many", True, self.inner.read_many, model_type, ids)
+
+    async def update(self, model_instance: BaseModel) -> BaseModel:
+        return await self._call(model_instance.__class__.__name__, "update", False, self.inner.update, model_instance)
+
+    async def update_many(self, model_instances: List[BaseModel]) -> List[BaseModel]:
+        model = model_instances[0].__class__.__name__ if model_instances else "-"
+        return await self._call(model, "update_many", True, self.inner.update_many, model_instances)
+
+    async def delete(self, model_type: Type[BaseModel], id: Any) -> None:
+        await self._call(model_type.__name__, "delete", False, self.inner.delete, model_type, id)
+
+    async def list(self, model_type: Type[BaseModel]) -> List[BaseModel]:
+        return await self._call(model_type.__name__, "list", True, self.inner.list, model_type)
+
+    async def iter(
+        self,
+        model_type: Type[BaseModel],
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = DEFAULT_ITER_BATCH_SIZE,
+        fields: Optional[List[str]] = None,
+    ) -> AsyncIterator[BaseModel]:
+        """Measures the whole scan, from the first fetch until the consumer stops iterating."""
+        metrics = operation_metrics(self.backend, model_type.__name__, "iter")
+        count_adapter_call(self.backend, "iter", model_type.__name__)
+        started = time.perf_counter()
+        # Not made current: a context attached inside an async generator would leak into the consumer between yields
+        span = tracer.start_span(f"{self.backend}.iter", kind=SpanKind.CLIENT, attributes=self._span_attributes(model_type.__name__))
+        rows = 0
+        first_size = 0
+        try:
+            async for record in self.inner.iter(model_type, filters, batch_size, fields):
+                if rows == 0:
+                    first_size = _size(record) # Sampled from the first record, like the other batch operations
+                rows += 1
+                yield record
+        except Exception as e:
+            metrics.errors.inc()
+            span.record_exception(e)
+            span.set_status(Status(StatusCode.ERROR))
+            raise
+        finally:
+            metrics.latency.observe(time.perf_counter() - started)
+            metrics.rows.inc(rows)
+            metrics.bytes.inc(first_size * rows)
+            if span.is_recording():
+                span.set_attribute("db.rows", rows)
+            span.end()
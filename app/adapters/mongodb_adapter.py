@@ -1,55 +1,107 @@
-from adapters.base import AbstractStorageAdapter
+from adapters.base import AbstractStorageAdapter, DEFAULT_ITER_BATCH_SIZE
 from pydantic import BaseModel
-from typing import List, Optional, Type, Any
+from typing import AsyncIterator, Dict, List, Optional, Type, Any
+from functools import cached_property
 import motor.motor_asyncio
+from pymongo import ASCENDING, IndexModel
 
-from bson.objectid import ObjectId # Import ObjectId
+from adapters.ids import id_codec, normalize_id
+from adapters.validation import construct_trusted, load_model
 from app.models.webhook import Webhook # Import Webhook model
+from models.auction import BidHistoryEntry
+from models.property import CollectionItem, PropertyMarketplaceItem
+from models.trade import PropertyListing
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Indexes each model's collection needs, applied by MongoDBAdapter.ensure_indexes() at startup.
+# Keep these in step with the filters services pass to `iter`.
+MONGODB_INDEXES: Dict[Type[BaseModel], List[IndexModel]] = {
+    Webhook: [
+        IndexModel([("event_type", ASCENDING), ("is_active", ASCENDING)], name="event_type_is_active"),
+        IndexModel([("owner_id", ASCENDING)], name="owner_id"),
+    ],
+    BidHistoryEntry: [IndexModel([("bidder", ASCENDING), ("timestamp", ASCENDING)], name="bidder_timestamp")],
+    PropertyListing: [IndexModel([("user_id", ASCENDING)], name="user_id")],
+    PropertyMarketplaceItem: [IndexModel([("user_id", ASCENDING)], name="user_id")],
+    CollectionItem: [IndexModel([("user_id", ASCENDING)], name="user_id")],
+}
 
 class MongoDBAdapter(AbstractStorageAdapter):
-    def __init__(self, connection_string: str, database_name: str):
-        self.client = motor.motor_asyncio.AsyncIOMotorClient(connection_string)
-        self.db = self.client[database_name]
+    def __init__(self, connection_string: str, database_name: str, trusted_reads: bool = False, connections: Any = None):
+        self.connection_string = connection_string
+        self.database_name = database_name
+        self.trusted_reads = trusted_reads # Skip re-validating documents this API wrote
+        self.connections = connections # ConnectionManager owning the shared, bounded client; None builds a private one
+
+    # Built on first use: constructing a Motor client starts pymongo's monitor threads and server discovery
+    @cached_property
+    def client(self) -> motor.motor_asyncio.AsyncIOMotorClient:
+        if self.connections is not None:
+            return self.connections.mongo(self.connection_string)
+        return motor.motor_asyncio.AsyncIOMotorClient(self.connection_string)
+
+    @cached_property
+    def db(self) -> motor.motor_asyncio.AsyncIOMotorDatabase:
+        return self.client[self.database_name]
+
+    async def ensure_indexes(self, indexes: Optional[Dict[Type[BaseModel], List[IndexModel]]] = None) -> None:
+        """Creates the declared indexes. createIndexes is a no-op for indexes that already exist, so this runs on every startup."""
+        for model_type, models in (MONGODB_INDEXES if indexes is None else indexes).items():
+            collection_name = model_type.__name__.lower()
+            created = await self.db[collection_name].create_indexes(models)
+            logger.info(f"[MongoDB] Ensured indexes {created} on {collection_name}")
 
     async def create(self, model_instance: BaseModel) -> BaseModel:
         """Creates a new record."""
         collection_name = model_instance.__class__.__name__.lower()
         collection = self.db[collection_name]
-        # Convert Pydantic model to dictionary, excluding unset fields
-        data = model_instance.model_dump(by_alias=True, exclude_unset=True)
-        
-        # Handle 'id' for Webhook model specifically, if it's not an ObjectId
-        if isinstance(model_instance, Webhook) and model_instance.id:
-            data['_id'] = model_instance.id
-            # Ensure 'id' is not duplicated if it's already set as _id
-            data.pop('id', None)
-        
-        result = await collection.insert_one(data)
-        
-        # If the Pydantic model has an 'id' field and it was generated by MongoDB, update it
-        if hasattr(model_instance, 'id') and result.inserted_id and not getattr(model_instance, 'id', None):
-            setattr(model_instance, 'id', str(result.inserted_id))
+        # Convert Pydantic model to dictionary, excluding unset fields; the ID is stored as '_id'
+        data = model_instance.model_dump(by_alias=True, exclude_unset=True, exclude={'id'})
+
+        # Use the caller's ID if it has one, otherwise a new one in the model's ID format
+        codec = id_codec(model_instance.__class__)
+        instance_id = getattr(model_instance, 'id', None)
+        normalized_id = codec.normalize(instance_id) if instance_id else codec.generate()
+        data['_id'] = codec.to_native(normalized_id)
+
+        await collection.insert_one(data)
+
+        if hasattr(model_instance, 'id'):
+            setattr(model_instance, 'id', normalized_id)
         return model_instance
 
     async def read(self, model_type: Type[BaseModel], id: Any) -> Optional[BaseModel]:
         """Reads a record by ID."""
         collection_name = model_type.__name__.lower()
         collection = self.db[collection_name]
-        # Assume ID is stored as ObjectId in MongoDB
-        try:
-            object_id = ObjectId(str(id))
-        except Exception:
-            return None # Invalid ID format
+        normalized_id = normalize_id(model_type, id)
+        if normalized_id is None:
+            return None # Not a valid ID for this model, so it cannot exist
 
-        document = await collection.find_one({"_id": object_id})
+        document = await collection.find_one({"_id": id_codec(model_type).to_native(normalized_id)})
 
         if document:
             # Convert MongoDB document to Pydantic model
             # Assuming MongoDB '_id' should map to Pydantic 'id'
             document['id'] = str(document.pop('_id'))
-            return model_type.model_validate(document)
+            return load_model(model_type, document, self.trusted_reads)
         return None
 
+    async def read_many(self, model_type: Type[BaseModel], ids: List[Any]) -> List[Optional[BaseModel]]:
+        """Reads several records with a single `$in` query. Results follow the order of `ids`."""
+        collection = self.db[model_type.__name__.lower()]
+        codec = id_codec(model_type)
+        normalized_ids = [normalize_id(model_type, id) for id in ids] # Invalid IDs simply come back as None
+        native_ids = [codec.to_native(id) for id in normalized_ids if id is not None]
+        found = {}
+        if native_ids:
+            async for document in collection.find({"_id": {"$in": native_ids}}):
+                document['id'] = str(document.pop('_id'))
+                found[document['id']] = load_model(model_type, document, self.trusted_reads)
+        return [found.get(id) if id is not None else None for id in normalized_ids]
+
     async def update(self, model_instance: BaseModel) -> BaseModel:
         """Updates an existing record."""
         collection_name = model_instance.__class__.__name__.lower()
@@ -60,20 +112,21 @@ class MongoDBAdapter(AbstractStorageAdapter):
              # Or raise a specific error if ID is required for update
             raise ValueError("Model instance must have an ID for update")
 
-        try:
-            object_id = ObjectId(str(instance_id))
-        except Exception:
-            raise ValueError(f"Invalid ID format: {instance_id}")
+        object_id = id_codec(model_instance.__class__).to_native(instance_id) # InvalidIdError is a ValueError
 
-        # Convert Pydantic model to dictionary, excluding unset fields and the id/ _id field
+        # Only the fields that were explicitly set are written, so concurrent updates to other fields are not clobbered
         data = model_instance.model_dump(by_alias=True, exclude_unset=True, exclude={'id'})
         # MongoDB uses _id, so ensure it's not in the update data if it was somehow included
         data.pop('_id', None)
 
+        if data:
+            result = await collection.update_one({"_id": object_id}, {"$set": data})
+            found = result.matched_count > 0
+        else:
+            # An empty $set is rejected by the server; only check that the document exists
+            found = await collection.find_one({"_id": object_id}, {"_id": 1}) is not None
 
-        result = await collection.replace_one({"_id": object_id}, data)
-
-        if result.matched_count == 0:
+        if not found:
             # Or raise a specific error if the document was not found
              raise ValueError(f"Document with ID {instance_id} not found for update")
 
@@ -85,10 +138,7 @@ class MongoDBAdapter(AbstractStorageAdapter):
         collection_name = model_type.__name__.lower()
         collection = self.db[collection_name]
 
-        try:
-            object_id = ObjectId(str(id))
-        except Exception:
-            raise ValueError(f"Invalid ID format: {id}")
+        object_id = id_codec(model_type).to_native(id) # InvalidIdError is a ValueError
 
         result = await collection.delete_one({"_id": object_id})
 
@@ -109,6 +159,35 @@ class MongoDBAdapter(AbstractStorageAdapter):
             # Convert MongoDB document to Pydantic model
             # Assuming MongoDB '_id' should map to Pydantic 'id'
             document['id'] = str(document.pop('_id'))
-            documents.append(model_type.model_validate(document))
-
-        return documents
\ No newline at end of file
+            documents.append(load_model(model_type, document, self.trusted_reads))
+
+        return documents
+
+    async def iter(
+        self,
+        model_type: Type[BaseModel],
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = DEFAULT_ITER_BATCH_SIZE,
+        fields: Optional[List[str]] = None,
+    ) -> AsyncIterator[BaseModel]:
+        """
+        Streams records through a server-side cursor that fetches `batch_size` documents per round trip.
+        With `fields`, only those fields are fetched and the records are built as partial models.
+        """
+        query = dict(filters or {})
+        if 'id' in query:
+            # Records are keyed by '_id' in MongoDB
+            raw_id = query.pop('id')
+            normalized_id = normalize_id(model_type, raw_id)
+            if normalized_id is None:
+                return # No record can have an invalid ID
+            query['_id'] = id_codec(model_type).to_native(normalized_id)
+        projection = {field: 1 for field in fields if field != 'id'} if fields else None # '_id' is always returned
+        collection = self.db[model_type.__name__.lower()]
+        async for document in collection.find(query, projection).batch_size(batch_size):
+            document['id'] = str(document.pop('_id'))
+            if projection is None:
+                yield load_model(model_type, document, self.trusted_reads)
+            else:
+                # Required fields are missing by design, so the partial record cannot be validated
+                yield construct_trusted(model_type, document)
@@ -3,25 +3,36 @@ import json
 import redis.asyncio as redis
 import json
 from pydantic import BaseModel
-from typing import List, Optional, Type, Any
-import uuid # Import uuid for generating IDs if needed
+from typing import AsyncIterator, Dict, List, Optional, Type, Any
+from adapters.base import DEFAULT_ITER_BATCH_SIZE, matches
+from adapters.ids import id_codec, normalize_id
+from adapters.validation import load_model
 
 class RedisAdapter: # Removed inheritance from AbstractStorageAdapter
-    def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0, ttl_seconds: int = 3600):
-        self.client = redis.Redis(host=host, port=port, db=db, decode_responses=True)
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        ttl_seconds: int = 3600,
+        trusted_reads: bool = False,
+        client: Optional[Any] = None, # A shared client (see utils/connections.py); host, port and db are then unused
+    ):
+        self.client = client if client is not None else redis.Redis(host=host, port=port, db=db, decode_responses=True)
         self.ttl = ttl_seconds
+        self.trusted_reads = trusted_reads # Entries are model_dump_json() of already-validated models
 
     def _get_key(self, model_type: Type[BaseModel], id: Any) -> str:
-        """Generates a Redis key for a model instance."""
-        return f"{model_type.__name__.lower()}:{id}"
+        """Generates a Redis key for a model instance, from the ID's canonical form (see adapters/ids.py)."""
+        return f"{model_type.__name__.lower()}:{id_codec(model_type).normalize(id)}"
 
     async def create(self, model_instance: BaseModel) -> BaseModel:
         """Creates a new record in Redis."""
         # Assuming the model instance might not have an ID yet, generate one
         # type: ignore comment to suppress Pylance error about missing 'id'
         if not hasattr(model_instance, 'id') or model_instance.id is None: # type: ignore
-             # Generate a simple UUID for the ID
-             model_instance.id = str(uuid.uuid4()) # type: ignore
+             # Generate an ID in the model's ID format
+             model_instance.id = id_codec(model_instance.__class__).generate() # type: ignore
 
         key = self._get_key(model_instance.__class__, model_instance.id) # type: ignore
         try:
@@ -38,7 +49,10 @@ class RedisAdapter: # Removed inheritance from AbstractStorageAdapter
 
     async def read(self, model_type: Type[BaseModel], id: Any) -> Optional[BaseModel]:
         """Reads a record by ID from Redis."""
-        key = self._get_key(model_type, id)
+        normalized_id = normalize_id(model_type, id)
+        if normalized_id is None:
+            return None # Not a valid ID for this model, so it cannot exist
+        key = self._get_key(model_type, normalized_id)
         raw_data = await self.client.get(key)
 
         if not raw_data:
@@ -48,11 +62,33 @@ class RedisAdapter: # Removed inheritance from AbstractStorageAdapter
             data = json.loads(raw_data)
             # Ensure the 'id' from the key is in the data for model validation
             if 'id' not in data:
-                 data['id'] = str(id)
-            return model_type.model_validate(data)
+                 data['id'] = normalized_id
+            return load_model(model_type, data, self.trusted_reads)
         except Exception as e:
             raise ValueError(f"[Redis] Failed to parse cached data for {model_type.__name__} id {id}: {e}")
 
+    async def read_many(self, model_type: Type[BaseModel], ids: List[Any]) -> List[Optional[BaseModel]]:
+        """Reads several records with a single MGET. Results follow the order of `ids`."""
+        if not ids:
+            return []
+        normalized_ids = [normalize_id(model_type, id) for id in ids]
+        valid_ids = [id for id in normalized_ids if id is not None]
+        raw_by_id = dict(zip(valid_ids, await self.client.mget([self._get_key(model_type, id) for id in valid_ids]))) if valid_ids else {}
+        items: List[Optional[BaseModel]] = []
+        for id in normalized_ids:
+            raw_data = raw_by_id.get(id) if id is not None else None
+            if not raw_data:
+                items.append(None) # Cache miss for this ID
+                continue
+            try:
+                data = json.loads(raw_data)
+                if 'id' not in data:
+                     data['id'] = str(id)
+                items.append(load_model(model_type, data, self.trusted_reads))
+            except Exception as e:
+                raise ValueError(f"[Redis] Failed to parse cached data for {model_type.__name__} id {id}: {e}")
+        return items
+
     async def update(self, model_instance: BaseModel) -> BaseModel:
         """Updates an existing record in Redis."""
         # Assuming the model instance has an 'id' attribute
@@ -68,6 +104,30 @@ class RedisAdapter: # Removed inheritance from AbstractStorageAdapter
         except Exception as e:
             raise RuntimeError(f"[Redis] Failed to update record with id {model_instance.id}: {e}") # type: ignore
 
+    async def create_many(self, model_instances: List[BaseModel]) -> List[BaseModel]:
+        """Creates several records in one pipelined round trip. Raises if any already existed (the others are kept)."""
+        for model_instance in model_instances:
+            if getattr(model_instance, 'id', None) is None:
+                model_instance.id = id_codec(model_instance.__class__).generate() # type: ignore
+        async with self.client.pipeline(transaction=False) as pipe:
+            for model_instance in model_instances:
+                pipe.set(self._get_key(model_instance.__class__, model_instance.id), model_instance.model_dump_json(), ex=self.ttl, nx=True) # type: ignore
+            results = await pipe.execute()
+        existing = [str(m.id) for m, created in zip(model_instances, results) if not created] # type: ignore
+        if existing:
+            raise RuntimeError(f"[Redis] Failed to create records: ids {', '.join(existing)} already exist in Redis.")
+        return model_instances
+
+    async def update_many(self, model_instances: List[BaseModel]) -> List[BaseModel]:
+        """Updates several records in one pipelined round trip."""
+        if any(getattr(model_instance, 'id', None) is None for model_instance in model_instances):
+            raise ValueError("Model instance must have an ID to update.")
+        async with self.client.pipeline(transaction=False) as pipe:
+            for model_instance in model_instances:
+                pipe.set(self._get_key(model_instance.__class__, model_instance.id), model_instance.model_dump_json(), ex=self.ttl) # type: ignore
+            await pipe.execute()
+        return model_instances
+
 
     async def delete(self, model_type: Type[BaseModel], id: Any) -> None:
         """Deletes a record by ID from Redis."""
@@ -97,7 +157,40 @@ class RedisAdapter: # Removed inheritance from AbstractStorageAdapter
                     if 'id' not in data:
                          # Extract ID from key (e.g., "user:123" -> "123")
                          data['id'] = key.split(":", 1)[-1]
-                    items.append(model_type.model_validate(data))
+                    items.append(load_model(model_type, data, self.trusted_reads))
                 except Exception as e:
                     print(f"[Redis] Failed to parse cached data for key {key}: {e}") # Log parsing errors
         return items
+
+    async def iter(
+        self,
+        model_type: Type[BaseModel],
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = DEFAULT_ITER_BATCH_SIZE,
+        fields: Optional[List[str]] = None,
+    ) -> AsyncIterator[BaseModel]:
+        """Streams records using SCAN (non-blocking, unlike KEYS) and one MGET per `batch_size` keys."""
+        pattern = f"{model_type.__name__.lower()}:*"
+        keys: List[str] = []
+        async for key in self.client.scan_iter(match=pattern, count=batch_size):
+            keys.append(key)
+            if len(keys) >= batch_size:
+                for item in await self._load_batch(model_type, keys, filters):
+                    yield item
+                keys = []
+        for item in await self._load_batch(model_type, keys, filters):
+            yield item
+
+    async def _load_batch(self, model_type: Type[BaseModel], keys: List[str], filters: Optional[Dict[str, Any]]) -> List[BaseModel]:
+        if not keys:
+            return []
+        items = []
+        for key, raw_data in zip(keys, await self.client.mget(keys)):
+            if not raw_data:
+                continue # Expired between SCAN and MGET
+            data = json.loads(raw_data)
+            if 'id' not in data:
+                data['id'] = key.split(":", 1)[-1]
+            if matches(data, filters): # Redis has no secondary indexes; filter before building models
+                items.append(load_model(model_type, data, self.trusted_reads))
+        return items
@@ -1,12 +1,17 @@
+import asyncio
 from supabase import create_client
-from adapters.base import AbstractStorageAdapter
+from adapters.base import AbstractStorageAdapter, DEFAULT_ITER_BATCH_SIZE
+from adapters.ids import id_codec, normalize_id
+from adapters.validation import load_model
 from config import settings
 from pydantic import BaseModel
-from typing import List, Optional, Type, Any
+from typing import AsyncIterator, Dict, List, Optional, Type, Any
 
 class SupabaseAdapter(AbstractStorageAdapter):
-    def __init__(self):
-        self.client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    def __init__(self, trusted_reads: bool = False, client: Optional[Any] = None):
+        # A shared client (see utils/connections.py) reuses one bounded HTTP pool across adapters
+        self.client = client if client is not None else create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+        self.trusted_reads = trusted_reads # Only safe if every writer to these tables validates
 
     async def create(self, model_instance: BaseModel) -> BaseModel:
         """Creates a new record in Supabase."""
@@ -25,18 +30,34 @@ class SupabaseAdapter(AbstractStorageAdapter):
     async def read(self, model_type: Type[BaseModel], id: Any) -> Optional[BaseModel]:
         """Reads a record by ID from Supabase."""
         table_name = model_type.__name__.lower()
-        response = self.client.table(table_name).select("*").eq("id", id).execute()
+        normalized_id = normalize_id(model_type, id)
+        if normalized_id is None:
+            return None # Not a valid ID for this model, so it cannot exist
+        response = self.client.table(table_name).select("*").eq("id", normalized_id).execute()
         if response.data:
-            return model_type.model_validate(response.data[0])
+            return load_model(model_type, response.data[0], self.trusted_reads)
         # Return None if no data is found
         return None
 
+    async def read_many(self, model_type: Type[BaseModel], ids: List[Any]) -> List[Optional[BaseModel]]:
+        """Reads several records with a single `in` filter. Results follow the order of `ids`."""
+        if not ids:
+            return []
+        table_name = model_type.__name__.lower()
+        normalized_ids = [normalize_id(model_type, id) for id in ids]
+        valid_ids = [id for id in normalized_ids if id is not None]
+        if not valid_ids:
+            return [None] * len(ids)
+        response = self.client.table(table_name).select("*").in_("id", valid_ids).execute()
+        found = {normalize_id(model_type, item["id"]): load_model(model_type, item, self.trusted_reads) for item in (response.data or [])}
+        return [found.get(id) if id is not None else None for id in normalized_ids]
+
     async def update(self, model_instance: BaseModel) -> BaseModel:
         """Updates an existing record in Supabase."""
         table_name = model_instance.__class__.__name__.lower()
         # Assuming the model instance has an 'id' attribute for updating
         # type: ignore comment to suppress Pylance error about missing 'id'
-        response = self.client.table(table_name).update(model_instance.model_dump()).eq("id", model_instance.id).execute() # type: ignore
+        response = self.client.table(table_name).update(model_instance.model_dump()).eq("id", id_codec(model_instance.__class__).normalize(model_instance.id)).execute() # type: ignore
         # Assuming Supabase returns the updated data on success
         if response.data:
             return model_instance.__class__.model_validate(response.data[0])
@@ -52,7 +73,7 @@ class SupabaseAdapter(AbstractStorageAdapter):
     async def delete(self, model_type: Type[BaseModel], id: Any) -> None:
         """Deletes a record by ID from Supabase."""
         table_name = model_type.__name__.lower()
-        response = self.client.table(table_name).delete().eq("id", id).execute()
+        response = self.client.table(table_name).delete().eq("id", id_codec(model_type).normalize(id)).execute()
         # Optional: Check response for errors if needed
         # Check if response.error is not None
         if response.error is not None: # type: ignore
@@ -65,6 +86,33 @@ class SupabaseAdapter(AbstractStorageAdapter):
         response = self.client.table(table_name).select("*").execute()
         if response.data:
             # Validate each item in the list with the specified model type
-            return [model_type.model_validate(item) for item in response.data]
+            return [load_model(model_type, item, self.trusted_reads) for item in response.data]
         # Return an empty list if no data is found
         return []
+
+    async def iter(
+        self,
+        model_type: Type[BaseModel],
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = DEFAULT_ITER_BATCH_SIZE,
+        fields: Optional[List[str]] = None,
+    ) -> AsyncIterator[BaseModel]:
+        """
+        Streams records in keyset pages ordered by id. PostgREST exposes no
+        server-side cursors, and keyset pages stay cheap at any depth, unlike OFFSET.
+        """
+        table_name = model_type.__name__.lower()
+        last_id = None
+        while True:
+            query = self.client.table(table_name).select("*").order("id").limit(batch_size)
+            if filters:
+                query = query.match(filters)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            response = await asyncio.to_thread(query.execute) # supabase-py is synchronous; keep the loop free between pages
+            rows = response.data or []
+            for row in rows:
+                yield load_model(model_type, row, self.trusted_reads)
+            if len(rows) < batch_size:
+                break
+            last_id = rows[-1]["id"]
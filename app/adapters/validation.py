@@ -0,0 +1,101 @@
+import types
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Annotated, Any, Callable, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+Converter = Callable[[Any], Any]
+
+def _nullable(convert: Converter) -> Converter:
+    return lambda value: None if value is None else convert(value)
+
+def _converter(annotation: Any) -> Optional[Converter]:
+    """
+    Returns the cheap coercion a stored value needs to match `annotation`, or None
+    when it can be used as-is. Only structure and wire-format types are handled:
+    nested models, ISO datetimes/dates and enums. Validators (EmailStr, phone
+    numbers, constraints) are deliberately skipped.
+    """
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is Annotated:
+        return _converter(args[0])
+    if origin in (Union, types.UnionType):
+        converters = [c for c in (_converter(a) for a in args if a is not type(None)) if c is not None]
+        return _nullable(converters[0]) if len(converters) == 1 else None # Ambiguous unions are left as stored
+    if origin in (list, List, tuple, set):
+        item = _converter(args[0]) if args else None
+        if item is None:
+            return None
+        return _nullable(lambda value: [item(v) for v in value])
+    if origin in (dict, Dict):
+        item = _converter(args[1]) if len(args) == 2 else None
+        if item is None:
+            return None
+        return _nullable(lambda value: {k: item(v) for k, v in value.items()})
+    if not isinstance(annotation, type):
+        return None
+    if issubclass(annotation, BaseModel):
+        return _nullable(lambda value: construct_trusted(annotation, value) if isinstance(value, dict) else value)
+    if issubclass(annotation, datetime):
+        return _nullable(lambda value: datetime.fromisoformat(value) if isinstance(value, str) else value)
+    if issubclass(annotation, date):
+        return _nullable(lambda value: date.fromisoformat(value) if isinstance(value, str) else value)
+    if issubclass(annotation, Enum):
+        return _nullable(lambda value: value if isinstance(value, annotation) else annotation(value))
+    return None
+
+@lru_cache(maxsize=None)
+def _plan(model_type: Type[BaseModel]) -> Tuple[Tuple[str, Optional[str], Optional[Converter]], ...]:
+    """Per-model (field name, alias, converter) table, built once per model class."""
+    return tuple(
+        (name, field.alias, _converter(field.annotation))
+        for name, field in model_type.model_fields.items()
+    )
+
+def _has_python_validators(schema: Any) -> bool:
+    """True if a pydantic-core schema contains any Python-level validator function."""
+    if isinstance(schema, dict):
+        if str(schema.get("type", "")).startswith("function-"):
+            return True
+        return any(_has_python_validators(v) for k, v in schema.items() if k not in ("serialization", "metadata"))
+    if isinstance(schema, (list, tuple)):
+        return any(_has_python_validators(v) for v in schema)
+    return False
+
+@lru_cache(maxsize=None)
+def validation_is_costly(model_type: Type[BaseModel]) -> bool:
+    """
+    Whether validating `model_type` runs Python code (EmailStr, phone numbers,
+    custom validators). Models validated entirely in pydantic-core are faster
+    to validate than to construct field by field in Python, so they keep the
+    normal path even for trusted reads.
+    """
+    return _has_python_validators(model_type.__pydantic_core_schema__)
+
+def construct_trusted(model_type: Type[BaseModel], data: Dict[str, Any]) -> BaseModel:
+    """
+    Builds `model_type` from a row that was validated when it was written.
+
+    Uses `model_construct`, so no validators run; nested models, datetimes and
+    enums are still rebuilt so the result behaves like a validated instance.
+    Unknown keys are dropped and missing fields take their defaults.
+    """
+    values: Dict[str, Any] = {}
+    for name, alias, convert in _plan(model_type):
+        if name in data:
+            value = data[name]
+        elif alias is not None and alias in data:
+            value = data[alias]
+        else:
+            continue
+        values[name] = convert(value) if convert is not None else value
+    return model_type.model_construct(**values)
+
+def load_model(model_type: Type[BaseModel], data: Dict[str, Any], trusted: bool) -> BaseModel:
+    """Turns a stored row into a model: fast construction for trusted stores, full validation otherwise."""
+    if trusted and validation_is_costly(model_type):
+        return construct_trusted(model_type, data)
+    return model_type.model_validate(data)
@@ -0,0 +1,217 @@
+import asyncio
+import importlib
+import uuid
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from adapters.base import AbstractStorageAdapter
+from adapters.ids import id_codec
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+KEY_PREFIX = "cache:write_behind"
+
+# Queues one record write, coalescing it with any unflushed write of the same record.
+# A pending create stays a create, so a record created and then updated before a flush is inserted once.
+# A write after a delete (a record re-created under its ID) clears the delete's tombstone.
+# KEYS[1] = pending hash, KEYS[2] = model registry set, KEYS[3] = tombstone; ARGV = id, op, payload, model path
+ENQUEUE_LUA = """
+local op = ARGV[2]
+local existing = redis.call('HGET', KEYS[1], ARGV[1])
+if existing and string.sub(existing, 1, 7) == 'create:' then op = 'create' end
+redis.call('HSET', KEYS[1], ARGV[1], op .. ':' .. ARGV[3])
+redis.call('SADD', KEYS[2], ARGV[4])
+redis.call('DEL', KEYS[3])
+return 1
+"""
+
+# Drops a record's queued writes, pending or claimed, and leaves a tombstone: a flusher that claimed the
+# record before the delete checks it before and after writing, so the delete is not undone.
+# KEYS[1] = pending hash, KEYS[2] = in-flight hash, KEYS[3] = tombstone; ARGV = id, tombstone ttl_ms
+DISCARD_LUA = """
+redis.call('HDEL', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('SET', KEYS[3], '1', 'PX', ARGV[2])
+return 1
+"""
+
+# Claims a model's queued writes for one flusher. Pending writes are renamed to an in-flight hash,
+# so writes queued during the flush wait for the next one and nothing is lost if the flusher dies:
+# an in-flight hash left behind is retried before new writes are claimed.
+# KEYS[1] = pending hash, KEYS[2] = in-flight hash, KEYS[3] = lock; ARGV = token, lease_ms
+# Returns nil when another flusher holds the lock, otherwise the claimed hash as a flat list
+CLAIM_LUA = """
+if not redis.call('SET', KEYS[3], ARGV[1], 'NX', 'PX', ARGV[2]) then return false end
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        redis.call('DEL', KEYS[3])
+        return {}
+    end
+    redis.call('RENAME', KEYS[1], KEYS[2])
+end
+return redis.call('HGETALL', KEYS[2])
+"""
+
+# KEYS[1] = lock; ARGV[1] = token
+RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end
+return 0
+"""
+
+def _model_path(model_type: Type[BaseModel]) -> str:
+    return f"{model_type.__module__}:{model_type.__qualname__}"
+
+def _import_model(path: str) -> Type[BaseModel]:
+    module_name, _, name = path.partition(":")
+    return getattr(importlib.import_module(module_name), name)
+
+class WriteBehindQueue:
+    """
+    Durable queue of primary-store writes for CachingAdapter's write-behind policy.
+
+    Writes are kept in one Redis hash per model (record ID -> latest payload), so a
+    record updated many times between flushes is written to the primary once. A
+    background task flushes the queue every `interval` seconds with the primary's
+    batched create_many/update_many. Delivery is at-least-once.
+    """
+
+    def __init__(self, redis_client: Any, lease_seconds: float = 30.0, key_prefix: str = KEY_PREFIX):
+        self.redis_client = redis_client
+        self.lease_ms = int(lease_seconds * 1000)
+        self.key_prefix = key_prefix
+        self._enqueue = redis_client.register_script(ENQUEUE_LUA)
+        self._claim = redis_client.register_script(CLAIM_LUA)
+        self._release = redis_client.register_script(RELEASE_LUA)
+        self._discard = redis_client.register_script(DISCARD_LUA)
+        self._task: Optional[asyncio.Task] = None
+
+    def _keys(self, model_type: Type[BaseModel]) -> Tuple[str, str, str]:
+        base = f"{self.key_prefix}:{model_type.__name__.lower()}"
+        return f"{base}:pending", f"{base}:inflight", f"{base}:lock"
+
+    def _tombstone(self, model_type: Type[BaseModel], record_id: str) -> str:
+        return f"{self.key_prefix}:{model_type.__name__.lower()}:deleted:{record_id}"
+
+    async def _deleted(self, model_type: Type[BaseModel], record_ids: List[str]) -> List[str]:
+        """The IDs among `record_ids` deleted since their writes were queued."""
+        if not record_ids:
+            return []
+        tombstones = await self.redis_client.mget([self._tombstone(model_type, record_id) for record_id in record_ids])
+        return [record_id for record_id, tombstone in zip(record_ids, tombstones) if tombstone is not None]
+
+    async def enqueue(self, model_instance: BaseModel, op: str) -> None:
+        """Queues a 'create' or 'update' of `model_instance`, which must already carry its ID."""
+        model_type = model_instance.__class__
+        pending, _, _ = self._keys(model_type)
+        record_id = id_codec(model_type).normalize(getattr(model_instance, 'id', None))
+        await self._enqueue(
+            keys=[pending, f"{self.key_prefix}:models", self._tombstone(model_type, record_id)],
+            args=[record_id, op, model_instance.model_dump_json(), _model_path(model_type)],
+        )
+
+    async def discard(self, model_type: Type[BaseModel], id: Any) -> None:
+        """Drops a record's queued writes, so a deleted record is not written back by this or the next flush."""
+        pending, inflight, _ = self._keys(model_type)
+        record_id = id_codec(model_type).normalize(id)
+        # The tombstone outlives any flush that claimed the record before the delete (flushes hold a lease)
+        await self._discard(keys=[pending, inflight, self._tombstone(model_type, record_id)], args=[record_id, 2 * self.lease_ms])
+
+    async def flush(self, primary: AbstractStorageAdapter) -> int:
+        """Writes every queued record to `primary`. Returns the number of records written."""
+        written = 0
+        for path in await self.redis_client.smembers(f"{self.key_prefix}:models"):
+            try:
+                model_type = _import_model(path)
+            except (ImportError, AttributeError) as e:
+                logger.error(f"[Write Behind] Cannot load model {path}: {e}")
+                continue
+            written += await self._flush_model(primary, model_type)
+        return written
+
+    async def _flush_model(self, primary: AbstractStorageAdapter, model_type: Type[BaseModel]) -> int:
+        pending, inflight, lock = self._keys(model_type)
+        token = uuid.uuid4().hex
+        claimed = await self._claim(keys=[pending, inflight, lock], args=[token, self.lease_ms])
+        if claimed is None:
+            return 0 # Another flusher is writing this model
+        try:
+            entries: Dict[str, Tuple[str, BaseModel]] = {}
+            for record_id, raw in zip(claimed[::2], claimed[1::2]):
+                op, _, payload = raw.partition(":")
+                entries[record_id] = (op, model_type.model_validate_json(payload))
+            deleted = await self._deleted(model_type, list(entries))
+            for record_id in deleted:
+                del entries[record_id] # Deleted since the claim
+            if deleted:
+                await self.redis_client.hdel(inflight, *deleted)
+            if not entries:
+                return 0
+            done = await self._write(primary, model_type, entries)
+            if done:
+                await self.redis_client.hdel(inflight, *done)
+            # A delete that landed while the batch was being written ran before our write: delete again
+            for record_id in await self._deleted(model_type, done):
+                try:
+                    await primary.delete(model_type, record_id)
+                except Exception as e:
+                    logger.error(f"[Write Behind] Failed to re-delete {model_type.__name__} {record_id}: {e}")
+            logger.debug(f"[Write Behind] Flushed {len(done)} of {len(entries)} {model_type.__name__} records")
+            return len(done)
+        finally:
+            await self._release(keys=[lock], args=[token])
+
+    async def _write(self, primary: AbstractStorageAdapter, model_type: Type[BaseModel], entries: Dict[str, Tuple[str, BaseModel]]) -> List[str]:
+        """Writes `entries` in two batches; if a batch fails, falls back to per-record writes. Returns the IDs written."""
+        creates = [record_id for record_id, (op, _) in entries.items() if op == "create"]
+        updates = [record_id for record_id, (op, _) in entries.items() if op != "create"]
+        try:
+            if creates:
+                await primary.create_many([entries[record_id][1] for record_id in creates])
+            if updates:
+                await primary.update_many([entries[record_id][1] for record_id in updates])
+            return creates + updates
+        except Exception as e:
+            logger.error(f"[Write Behind] Batch write of {model_type.__name__} failed, retrying per record: {e}")
+
+        done = []
+        for record_id, (op, instance) in entries.items():
+            try:
+                if op == "create":
+                    try:
+                        await primary.create(instance)
+                    except Exception:
+                        await primary.update(instance) # Created by the failed batch or an earlier flush that died
+                else:
+                    await primary.update(instance)
+                done.append(record_id)
+            except Exception as e:
+                # Left in flight and retried by the next flush
+                logger.error(f"[Write Behind] Failed to write {model_type.__name__} {record_id}: {e}")
+        return done
+
+    async def _flush_loop(self, primary: AbstractStorageAdapter, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush(primary)
+            except Exception as e:
+                logger.error(f"[Write Behind] Flush failed: {e}")
+
+    async def start(self, primary: AbstractStorageAdapter, interval: float) -> None:
+        """Starts flushing to `primary` every `interval` seconds."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop(primary, interval))
+
+    async def stop(self, primary: Optional[AbstractStorageAdapter] = None) -> None:
+        """Stops the background flusher, then flushes once more to `primary` if given."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if primary is not None:
+            await self.flush(primary)
@@ -0,0 +1,52 @@
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from adapters import get_adapter
+from services.export_service import (
+    DEFAULT_BATCH_SIZE,
+    EXPORT_DATASETS,
+    ExportService,
+    coalesce,
+    encode_csv,
+    encode_ndjson,
+    gzip_stream,
+)
+
+EXPORT_ROLES = {"admin"} # Back-office only
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+@router.get("/{dataset}")
+async def export_dataset(
+    dataset: str,
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=5000),
+):
+    """Streams a full dataset as NDJSON or CSV, gzip-compressed when the client accepts it."""
+    role = getattr(request.state, "role", None)
+    roles = set(role) if isinstance(role, list) else {role}
+    if not roles & EXPORT_ROLES:
+        raise HTTPException(status_code=403, detail="Exports are restricted to back-office roles")
+
+    model_type = EXPORT_DATASETS.get(dataset)
+    if model_type is None:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset '{dataset}'")
+
+    rows = ExportService(get_adapter(), batch_size=batch_size).rows(model_type)
+    if format == "csv":
+        body = encode_csv(rows, list(model_type.model_fields))
+        media_type, extension = "text/csv", "csv"
+    else:
+        body = encode_ndjson(rows)
+        media_type, extension = "application/x-ndjson", "ndjson"
+    body = coalesce(body)
+
+    headers = {"Content-Disposition": f'attachment; filename="{dataset}.{extension}"'}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return StreamingResponse(body, media_type=media_type, headers=headers)
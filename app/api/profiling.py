@@ -0,0 +1,53 @@
+import asyncio
+import os
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+
+from config import settings
+from utils.logger import get_logger
+from utils.profiler import SamplingProfiler, collapsed_stacks
+
+logger = get_logger(__name__)
+
+PROFILING_ROLES = {"admin"}
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+_profile_lock = asyncio.Lock() # One run per worker; concurrent samplers would profile each other
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    request: Request,
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+):
+    """
+    Samples this worker's stacks for `seconds` and returns them as collapsed
+    stacks, e.g. `flamegraph.pl profile.folded > profile.svg` or speedscope.
+    With several workers, each call profiles whichever worker serves it (see
+    the X-Worker-Pid header).
+    """
+    role = getattr(request.state, "role", None)
+    roles = set(role) if isinstance(role, list) else {role}
+    if not roles & PROFILING_ROLES:
+        raise HTTPException(status_code=403, detail="Profiling is restricted to admins")
+    if seconds > settings.PROFILER_MAX_SECONDS:
+        raise HTTPException(status_code=422, detail=f"seconds must be at most {settings.PROFILER_MAX_SECONDS}")
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running on this worker")
+
+    async with _profile_lock:
+        profiler = SamplingProfiler(interval=interval_ms / 1000)
+        logger.info(f"[Profiler] Sampling for {seconds}s every {interval_ms}ms")
+        stacks = await asyncio.to_thread(profiler.run, seconds) # The event loop keeps serving while it is sampled
+
+    pid = os.getpid()
+    return PlainTextResponse(
+        collapsed_stacks(stacks),
+        headers={
+            "Content-Disposition": f'attachment; filename="profile-{pid}.folded"',
+            "X-Worker-Pid": str(pid),
+            "X-Profile-Samples": str(profiler.samples),
+        },
+    )
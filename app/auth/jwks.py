@@ -0,0 +1,181 @@
+import asyncio
+import json
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+import jwt
+from jwt import PyJWK
+
+from config import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class JWKSVerifier:
+    """
+    Verifies JWTs against a pre-parsed JWKS key cache.
+
+    Keys are loaded from a JWKS URL or a local JWKS file and indexed by `kid`.
+    Refreshing happens in a background task with stale-while-revalidate
+    semantics, so `verify` never performs network I/O on the request path.
+    """
+
+    def __init__(
+        self,
+        jwks_url: Optional[str] = None,
+        jwks_path: Optional[str] = None,
+        shared_secret: Optional[str] = None,
+        audience: Optional[str] = None,
+        refresh_interval: float = 300,
+        max_stale: float = 86400,
+        min_refresh_interval: float = 30,
+        fetch_timeout: float = 5.0,
+    ):
+        self.jwks_url = jwks_url
+        self.jwks_path = jwks_path
+        self.shared_secret = shared_secret # Legacy HS256 secret, accepted while tokens are rotated
+        self.audience = audience
+        self.refresh_interval = refresh_interval
+        self.max_stale = max_stale
+        self.min_refresh_interval = min_refresh_interval
+        self.fetch_timeout = fetch_timeout
+
+        self._keys: Dict[str, PyJWK] = {} # kid -> pre-parsed key
+        self._loaded_at: Optional[float] = None
+        self._last_attempt: float = 0.0
+        self._refresh_requested = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def has_keys(self) -> bool:
+        return bool(self._keys)
+
+    async def _fetch_document(self) -> Dict[str, Any]:
+        """Loads the raw JWKS document from the configured file or URL."""
+        if self.jwks_path:
+            with open(self.jwks_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        if self.jwks_url:
+            async with httpx.AsyncClient(timeout=self.fetch_timeout) as client:
+                response = await client.get(self.jwks_url)
+                response.raise_for_status()
+                return response.json()
+        raise RuntimeError("No JWKS source configured")
+
+    def load_document(self, document: Dict[str, Any]) -> None:
+        """Parses a JWKS document and atomically swaps it in as the active key set."""
+        keys: Dict[str, PyJWK] = {}
+        for jwk_data in document.get("keys", []):
+            if jwk_data.get("use", "sig") != "sig":
+                continue
+            try:
+                key = PyJWK(jwk_data)
+            except jwt.PyJWTError as e:
+                logger.warning(f"[JWKS] Skipping unusable key {jwk_data.get('kid')}: {e}")
+                continue
+            if key.key_id:
+                keys[key.key_id] = key
+        if not keys:
+            raise ValueError("JWKS document contains no usable signing keys")
+        self._keys = keys
+        self._loaded_at = time.monotonic()
+
+    async def refresh(self) -> bool:
+        """Fetches the JWKS document and replaces the key cache. Keeps the old keys on failure."""
+        self._last_attempt = time.monotonic()
+        try:
+            self.load_document(await self._fetch_document())
+            logger.debug(f"[JWKS] Loaded {len(self._keys)} signing keys")
+            return True
+        except Exception as e:
+            logger.error(f"[JWKS] Key refresh failed, serving cached keys: {e}")
+            return False
+
+    def request_refresh(self) -> None:
+        """Asks the background task to refresh soon. Never blocks the caller."""
+        if time.monotonic() - self._last_attempt >= self.min_refresh_interval:
+            self._refresh_requested.set()
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._refresh_requested.wait(), timeout=self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._refresh_requested.clear()
+            await self.refresh()
+
+    async def start(self) -> None:
+        """Loads the initial key set and starts the background refresher."""
+        if not (self.jwks_url or self.jwks_path):
+            return
+        await self.refresh()
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _get_key(self, kid: Optional[str]) -> PyJWK:
+        if self._loaded_at is None:
+            raise jwt.InvalidTokenError("Signing keys not loaded")
+        age = time.monotonic() - self._loaded_at
+        if age > self.max_stale:
+            self.request_refresh()
+            raise jwt.InvalidTokenError("Signing keys are too stale to trust")
+        if age > self.refresh_interval:
+            self.request_refresh() # Serve stale keys while the refresher revalidates
+
+        key = self._keys.get(kid) if kid else None
+        if key is None:
+            # A new kid usually means keys were rotated; refresh in the background
+            self.request_refresh()
+            raise jwt.InvalidTokenError(f"Unknown signing key id: {kid}")
+        return key
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verifies a token and returns its claims.
+        Raises jwt.ExpiredSignatureError or jwt.InvalidTokenError on failure.
+        """
+        header = jwt.get_unverified_header(token)
+        alg = header.get("alg")
+
+        kwargs: Dict[str, Any] = {}
+        if self.audience:
+            kwargs["audience"] = self.audience
+
+        if alg == "HS256":
+            if not self.shared_secret:
+                raise jwt.InvalidTokenError("HS256 tokens are not accepted")
+            return jwt.decode(token, self.shared_secret, algorithms=["HS256"], **kwargs)
+
+        key = self._get_key(header.get("kid"))
+        if alg != key.algorithm_name:
+            raise jwt.InvalidTokenError(f"Token algorithm {alg} does not match key algorithm")
+        return jwt.decode(token, key.key, algorithms=[key.algorithm_name], **kwargs)
+
+
+_verifier: Optional[JWKSVerifier] = None
+
+def get_jwks_verifier() -> JWKSVerifier:
+    """Returns the process-wide verifier built from settings."""
+    global _verifier
+    if _verifier is None:
+        _verifier = JWKSVerifier(
+            jwks_url=settings.SUPABASE_JWKS_URL,
+            jwks_path=settings.SUPABASE_JWKS_PATH,
+            shared_secret=settings.SUPABASE_JWT_SECRET or None,
+            audience=settings.SUPABASE_JWT_AUDIENCE,
+            refresh_interval=settings.JWKS_REFRESH_SECONDS,
+            max_stale=settings.JWKS_MAX_STALE_SECONDS,
+        )
+    return _verifier
@@ -3,9 +3,10 @@ from starlette.middleware.base import BaseHTTPMiddleware
 import jwt
 from config import settings
 from models.auth import TokenPayload
+from auth.jwks import get_jwks_verifier
 from typing import List, Optional, Union
 
-PUBLIC_ROUTES = ["/", "/graphql", "/health"]
+PUBLIC_ROUTES = ["/", "/graphql", "/health", "/metrics"] # /metrics is scraped from inside the cluster, without a token
 ALLOWED_ROLES = ["admin", "broker", "user"]  # Modify as needed
 
 def is_public_request(request: Request, body: Optional[bytes] = None) -> bool:
@@ -18,7 +19,7 @@ def is_public_request(request: Request, body: Optional[bytes] = None) -> bool:
 
 def decode_jwt_token(token: str) -> TokenPayload:
     try:
-        decoded = jwt.decode(token, settings.SUPABASE_JWT_SECRET, algorithms=["HS256"])
+        decoded = get_jwks_verifier().verify(token)
         return TokenPayload.model_validate(decoded)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
@@ -0,0 +1,283 @@
+import ipaddress
+import json
+import re
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Literal, Optional, Sequence, Tuple, Union
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Sliding-window log: one ZSET member per admitted request, scored by time in ms.
+# KEYS[1] = bucket key; ARGV = now_ms, window_ms, limit, cost, member_prefix
+# Returns {allowed, remaining, retry_after_ms}
+SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+if count + cost > limit then
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    local retry = window
+    if oldest[2] then retry = tonumber(oldest[2]) + window - now end
+    return {0, limit - count, retry}
+end
+for i = 1, cost do
+    redis.call('ZADD', key, now, ARGV[5] .. ':' .. i)
+end
+redis.call('PEXPIRE', key, window)
+return {1, limit - count - cost, 0}
+"""
+
+# Token bucket stored as a hash of (tokens, ts). Refill is computed lazily on each call.
+# KEYS[1] = bucket key; ARGV = now_ms, capacity, refill_per_ms, cost
+# Returns {allowed, remaining, retry_after_ms}
+TOKEN_BUCKET_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local rate = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry = math.ceil((cost - tokens) / rate)
+end
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', key, math.ceil(capacity / rate))
+return {allowed, math.floor(tokens), retry}
+"""
+
+class RateLimitRule(BaseModel):
+    """A limit of `limit` requests per `window_seconds` for one identity."""
+    name: str
+    limit: int
+    window_seconds: float
+    algorithm: Literal["sliding_window", "token_bucket"] = "token_bucket"
+    scope: Literal["user", "ip"] = "user" # Falls back to IP when the request is anonymous
+    local_reserve: Optional[int] = None # Overrides the limiter-wide reserve size
+
+class RateLimitResult(BaseModel):
+    allowed: bool
+    remaining: int
+    retry_after: float = 0.0
+
+# Limits applied to every request, plus per-operation limits keyed by GraphQL root field name
+DEFAULT_RULES: List[RateLimitRule] = [
+    RateLimitRule(name="ip", limit=600, window_seconds=60, scope="ip"),
+    RateLimitRule(name="user", limit=300, window_seconds=60),
+]
+DEFAULT_OPERATION_RULES: Dict[str, RateLimitRule] = {
+    "createListing": RateLimitRule(name="createListing", limit=10, window_seconds=60, algorithm="sliding_window", local_reserve=0),
+    "updateListing": RateLimitRule(name="updateListing", limit=30, window_seconds=60, algorithm="sliding_window", local_reserve=0),
+    "createMarketplaceItem": RateLimitRule(name="createMarketplaceItem", limit=10, window_seconds=60, algorithm="sliding_window", local_reserve=0),
+    "createWebhook": RateLimitRule(name="createWebhook", limit=5, window_seconds=60, algorithm="sliding_window", local_reserve=0),
+}
+
+class RateLimiter:
+    """
+    Redis-backed rate limiter. Each check is a single atomic Lua script call.
+
+    To keep most checks off the network, the limiter leases a small batch of
+    tokens per key and admits subsequent requests from that local reserve until
+    it is used up or the lease expires. Unused leased tokens are simply dropped,
+    so a reserve can only make the limit stricter, never looser.
+    """
+
+    def __init__(self, redis_client: Any, local_reserve: int = 5, lease_seconds: float = 1.0, max_local_keys: int = 10000):
+        self.redis_client = redis_client
+        self.local_reserve = local_reserve
+        self.lease_seconds = lease_seconds
+        self.max_local_keys = max_local_keys
+        self._scripts = {
+            "sliding_window": redis_client.register_script(SLIDING_WINDOW_LUA),
+            "token_bucket": redis_client.register_script(TOKEN_BUCKET_LUA),
+        }
+        self._reserves: "OrderedDict[str, Tuple[int, float]]" = OrderedDict() # key -> (tokens, lease expiry)
+
+    def _key(self, rule: RateLimitRule, identity: str) -> str:
+        return f"rate:{rule.algorithm}:{rule.name}:{identity}"
+
+    def _take_local(self, key: str) -> Optional[int]:
+        reserve = self._reserves.get(key)
+        if reserve is None:
+            return None
+        tokens, expires_at = reserve
+        if tokens <= 0 or time.monotonic() >= expires_at:
+            del self._reserves[key]
+            return None
+        self._reserves[key] = (tokens - 1, expires_at)
+        self._reserves.move_to_end(key)
+        return tokens - 1
+
+    def _store_local(self, key: str, tokens: int) -> None:
+        if tokens <= 0:
+            return
+        self._reserves[key] = (tokens, time.monotonic() + self.lease_seconds)
+        self._reserves.move_to_end(key)
+        while len(self._reserves) > self.max_local_keys:
+            self._reserves.popitem(last=False)
+
+    async def _run(self, rule: RateLimitRule, key: str, cost: int) -> Tuple[bool, int, float]:
+        now_ms = int(time.time() * 1000)
+        window_ms = int(rule.window_seconds * 1000)
+        if rule.algorithm == "sliding_window":
+            args = [now_ms, window_ms, rule.limit, cost, uuid.uuid4().hex]
+        else:
+            args = [now_ms, rule.limit, rule.limit / window_ms, cost]
+        allowed, remaining, retry_ms = await self._scripts[rule.algorithm](keys=[key], args=args)
+        return bool(allowed), int(remaining), int(retry_ms) / 1000
+
+    async def check(self, rule: RateLimitRule, identity: str) -> RateLimitResult:
+        """Consumes one unit for `identity` under `rule`."""
+        key = self._key(rule, identity)
+        remaining = self._take_local(key)
+        if remaining is not None:
+            return RateLimitResult(allowed=True, remaining=remaining)
+
+        reserve = self.local_reserve if rule.local_reserve is None else rule.local_reserve
+        if reserve > 1:
+            # Lease a batch; the current request takes one and the rest stay local
+            allowed, remaining, _ = await self._run(rule, key, reserve)
+            if allowed:
+                self._store_local(key, reserve - 1)
+                return RateLimitResult(allowed=True, remaining=remaining + reserve - 1)
+
+        allowed, remaining, retry_after = await self._run(rule, key, 1)
+        return RateLimitResult(allowed=allowed, remaining=max(remaining, 0), retry_after=retry_after)
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+def _trusted(ip: str, trusted_proxies: Sequence[Network]) -> bool:
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    return any(address in network for network in trusted_proxies)
+
+def _client_ip(request: Request, trusted_proxies: Sequence[Network] = ()) -> str:
+    """
+    The address to key per-IP limits on. X-Forwarded-For is only honoured when
+    the peer is a trusted proxy, since any client can send the header: the
+    entries are then read right to left, skipping our own proxies, and the
+    first address not in `trusted_proxies` is the client.
+    """
+    peer = request.client.host if request.client else "unknown"
+    forwarded = request.headers.get("x-forwarded-for")
+    if not forwarded or not _trusted(peer, trusted_proxies):
+        return peer
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _trusted(hop, trusted_proxies):
+            return hop
+    return hops[0] if hops else peer # Proxies all the way down
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """
+    Applies the global rules to every request and the operation rules to GraphQL
+    requests whose document selects a protected root field (e.g. createListing).
+    Must be added before AuthMiddleware so it runs inside it and sees request.state.user_id.
+    """
+
+    def __init__(
+        self,
+        app,
+        limiter: RateLimiter,
+        rules: Optional[List[RateLimitRule]] = None,
+        operation_rules: Optional[Dict[str, RateLimitRule]] = None,
+        trusted_proxies: Iterable[str] = (), # IPs or CIDRs of the proxies allowed to set X-Forwarded-For
+        persisted_queries: Any = None, # PersistedQueryStore, to rate limit operations sent as a hash only
+    ):
+        super().__init__(app)
+        self.limiter = limiter
+        self.persisted_queries = persisted_queries
+        self.trusted_proxies = [ipaddress.ip_network(proxy, strict=False) for proxy in trusted_proxies]
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self.operation_rules = DEFAULT_OPERATION_RULES if operation_rules is None else operation_rules
+        self._operation_pattern = (
+            re.compile(r"\b(" + "|".join(re.escape(name) for name in self.operation_rules) + r")\b")
+            if self.operation_rules else None
+        )
+
+    async def _operations(self, request: Request) -> List[str]:
+        if self._operation_pattern is None or request.method != "POST" or request.url.path != "/graphql":
+            return []
+        try:
+            payload = json.loads(await request.body())
+        except ValueError:
+            return []
+        payloads = payload if isinstance(payload, list) else [payload]
+        names = set()
+        for item in payloads:
+            query = await self._query(item) if isinstance(item, dict) else None
+            if isinstance(query, str):
+                names.update(self._operation_pattern.findall(query))
+        return sorted(names)
+
+    async def _query(self, item: Dict[str, Any]) -> Optional[str]:
+        """The document an operation will run, including a persisted one sent as its hash alone."""
+        query = item.get("query")
+        if query or self.persisted_queries is None:
+            return query
+        extensions = item.get("extensions")
+        persisted = extensions.get("persistedQuery") if isinstance(extensions, dict) else None
+        sha = persisted.get("sha256Hash") if isinstance(persisted, dict) else None
+        if not isinstance(sha, str):
+            return None
+        try:
+            entry = await self.persisted_queries.get(sha) # Unknown hashes fail with PERSISTED_QUERY_NOT_FOUND anyway
+        except Exception as e:
+            logger.error(f"[RateLimit] Failed to look up persisted query {sha}: {e}")
+            return None
+        return entry.query if entry is not None else None
+
+    def _identity(self, rule: RateLimitRule, request: Request, ip: str) -> str:
+        user_id = getattr(request.state, "user_id", None)
+        if rule.scope == "user" and user_id:
+            return f"user:{user_id}"
+        return f"ip:{ip}"
+
+    async def dispatch(self, request: Request, call_next):
+        ip = _client_ip(request, self.trusted_proxies)
+        checks = [(rule, self._identity(rule, request, ip)) for rule in self.rules]
+        for name in await self._operations(request):
+            rule = self.operation_rules[name]
+            checks.append((rule, self._identity(rule, request, ip)))
+
+        remaining: Optional[int] = None
+        for rule, identity in checks:
+            try:
+                result = await self.limiter.check(rule, identity)
+            except Exception as e:
+                # Fail open: an unavailable limiter must not take the API down with it
+                logger.error(f"[RateLimit] Check failed for {rule.name}, allowing request: {e}")
+                continue
+            if not result.allowed:
+                return JSONResponse(
+                    status_code=429,
+                    content={"error": "Rate limit exceeded", "limit": rule.name, "reset_in": result.retry_after},
+                    headers={"Retry-After": str(max(1, int(result.retry_after + 0.999)))},
+                )
+            remaining = result.remaining if remaining is None else min(remaining, result.remaining)
+
+        response = await call_next(request)
+        if remaining is not None:
+            response.headers["X-RateLimit-Remaining"] = str(remaining)
+        return response
@@ -1,9 +1,8 @@
 import jwt
-from config import settings
+from auth.jwks import get_jwks_verifier
 
 def decode_jwt(token: str) -> dict:
     try:
-        payload = jwt.decode(token, settings.SUPABASE_JWT_SECRET, algorithms=["HS256"])
-        return payload
+        return get_jwks_verifier().verify(token)
     except jwt.PyJWTError as e:
         raise ValueError("Invalid JWT token") from e
@@ -4,8 +4,9 @@ load_dotenv(
 )
 
 import os
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 
 # print("loaded env", os.environ["SUPABASE_URL"])
 
@@ -22,9 +23,80 @@ class Settings(BaseSettings):
     REDIS_DB: int
     STORAGE_ENGINE: str = "SUPABASE"
     DEBUG: str
+    SUPABASE_JWKS_URL: Optional[str] = None # e.g. https://<project>.supabase.co/auth/v1/.well-known/jwks.json
+    SUPABASE_JWKS_PATH: Optional[str] = None # Local JWKS file, takes precedence over the URL (tests, air-gapped envs)
+    SUPABASE_JWT_AUDIENCE: Optional[str] = None
+    JWKS_REFRESH_SECONDS: int = 300
+    JWKS_MAX_STALE_SECONDS: int = 86400
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOCAL_RESERVE: int = 5 # Tokens leased per Redis call; 0 or 1 disables the local reserve
+    # Load balancers / reverse proxies whose X-Forwarded-For is believed (IPs or CIDRs); other peers are keyed on their own address
+    RATE_LIMIT_TRUSTED_PROXIES: List[str] = []
+    PERSISTED_QUERY_MANIFEST: Optional[str] = None # JSON manifest of {sha256: query} warmed at startup
+    PERSISTED_QUERIES_ONLY: bool = False # Production mode: reject operations not in the manifest
+    # Adapters whose reads skip validation (model_construct). Only list stores written exclusively through
+    # this API; Supabase tables are also written by seed scripts and SQL jobs, so it is opted out by default.
+    TRUSTED_READ_ADAPTERS: List[str] = ["REDIS", "MONGODB", "FIRESTORE"]
+    # ID codec ("string", "uuid" or "objectid") per model class name; see adapters/ids.py
+    MODEL_ID_CODECS: Dict[str, str] = {"Webhook": "string"} # Webhook IDs are chosen by the client
+    DEFAULT_ID_CODEC: Optional[str] = None # None: "objectid" when STORAGE_ENGINE is MONGODB, else "string"
+    # CachingAdapter write policy per model class name; unlisted models use "invalidate".
+    # Write-behind is for high-churn, low-criticality records with an `id` field: the primary lags by up to the flush
+    # interval. CachingAdapter refuses it for models without one.
+    CACHE_WRITE_POLICIES: Dict[str, Literal["invalidate", "write_through", "write_behind"]] = {
+        "PropertyListing": "write_through", # Written, then read immediately by every watcher
+    }
+    CACHE_WRITE_BEHIND_FLUSH_SECONDS: float = 2.0
+    # Cache degradation (adapters/cache_health.py). Cache calls that exceed their timeout count as errors; while the
+    # error rate or mean latency is over its threshold, reads bypass the cache and invalidations are queued for
+    # replay. One call per probe interval tests whether the cache has recovered.
+    CACHE_READ_TIMEOUT_MS: float = 100.0
+    CACHE_INVALIDATE_TIMEOUT_MS: float = 250.0 # Also cache fills and write-through writes
+    CACHE_BYPASS_ERROR_RATE: float = 0.5
+    CACHE_BYPASS_LATENCY_MS: float = 50.0
+    CACHE_PROBE_SECONDS: float = 5.0
+    CACHE_MAX_PENDING_INVALIDATIONS: int = 10000 # Per worker; older ones are dropped and expire with the cache TTL
+    # OpenTelemetry. Tracing is off (no-op API) unless an OTLP endpoint is set, e.g. http://localhost:4318/v1/traces
+    OTEL_EXPORTER_OTLP_ENDPOINT: Optional[str] = None
+    OTEL_SERVICE_NAME: str = "api-central"
+    OTEL_TRACES_SAMPLE_RATIO: float = 0.05 # Share of root traces recorded; children follow their parent
+    # Admin profiling: GraphQL operations at or over the threshold are kept (per worker) for the slowOperations query
+    SLOW_OPERATION_THRESHOLD_MS: float = 500.0
+    SLOW_OPERATION_BUFFER_SIZE: int = 200
+    PROFILER_MAX_SECONDS: float = 60.0 # Longest run accepted by GET /admin/profile
+    # N+1 detection (development and tests): "warn" logs repeated per-item adapter calls, "raise" also adds an error to the result
+    N_PLUS_ONE_DETECTION: Literal["off", "warn", "raise"] = "off"
+    # Multi-worker deployment (gunicorn.conf.py). WORKERS=0 runs one worker per available CPU; the launcher
+    # exports the resolved count, so a single process started any other way counts as one worker
+    WORKERS: int = 0
+    # Connection pools (utils/connections.py). Sizes are budgets for the whole deployment, split evenly between
+    # workers; a caller finding its worker's pool exhausted waits up to the pool timeout, then fails
+    REDIS_MAX_CONNECTIONS: int = 256
+    REDIS_POOL_TIMEOUT_SECONDS: float = 2.0
+    REDIS_IDLE_TIMEOUT_SECONDS: float = 300.0
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 2.0 # Backstop for every Redis command; cache calls have stricter timeouts below
+    REDIS_CONNECT_TIMEOUT_SECONDS: float = 2.0
+    MONGODB_MAX_POOL_SIZE: int = 200
+    MONGODB_POOL_TIMEOUT_SECONDS: float = 2.0
+    MONGODB_IDLE_TIMEOUT_SECONDS: float = 300.0
+    SUPABASE_MAX_CONNECTIONS: int = 100
+    SUPABASE_POOL_TIMEOUT_SECONDS: float = 2.0
+    SUPABASE_IDLE_TIMEOUT_SECONDS: float = 60.0
+    CONNECTION_PING_SECONDS: float = 15.0 # Liveness pings of every backend in use (backend_up metric)
+    # Celery broker and result backend; by default databases 1 and 2 of the app's Redis server
+    CELERY_BROKER_URL: Optional[str] = None
+    CELERY_RESULT_BACKEND: Optional[str] = None
+    CELERY_BROKER_MAX_CONNECTIONS: int = 64 # Budget for the deployment's API workers (publishers)
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
+    @model_validator(mode="after")
+    def default_celery_urls(self) -> "Settings":
+        redis_url = f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}"
+        self.CELERY_BROKER_URL = self.CELERY_BROKER_URL or f"{redis_url}/1"
+        self.CELERY_RESULT_BACKEND = self.CELERY_RESULT_BACKEND or f"{redis_url}/2"
+        return self
+
 settings = Settings(
     SUPABASE_URL = os.environ["SUPABASE_URL"],
     SUPABASE_KEY = os.environ["SUPABASE_KEY"],
@@ -1,54 +1,118 @@
-import uvicorn
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from strawberry.fastapi import GraphQLRouter
-from app.schema.resolvers import schema # Corrected import path
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response, WebSocket, WebSocketDisconnect
+from prometheus_client import CONTENT_TYPE_LATEST
+from schema.router import CentralGraphQLRouter
+from schema.resolvers import schema, persisted_query_store, response_cache # Same path the resolvers import each other by, so the schema is built once
 from app.auth.middleware import AuthMiddleware # Corrected import path
+from auth.jwks import get_jwks_verifier # Same module path the middleware resolves, so both share one key cache
+from app.auth.rate_limit import RateLimitMiddleware, RateLimiter
 from app.config import settings # Corrected import path
-from app.adapters.redis_adapter import RedisAdapter
-from app.adapters.mongodb_adapter import MongoDBAdapter
-from app.services.webhook_service import WebhookService
+from adapters.redis_adapter import RedisAdapter # Bare paths, as the resolvers use: app.adapters.* would load the package twice
+from adapters import get_adapter # Same module path the resolvers use
+from adapters.caching_adapter import CachingAdapter
+from app.services.webhook_service import get_webhook_service
 from app.utils.event_publisher import EventPublisher, REDIS_PUBSUB_CHANNEL # Import REDIS_PUBSUB_CHANNEL
+from app.api.exports import router as exports_router
+from app.api.profiling import router as profiling_router
+from utils.connections import get_connection_manager
+from utils.coordination import Coordinator
+from utils.metrics import exposition
+from app.utils.logger import get_logger
+from app.utils.tracing import configure_tracing
+
+logger = get_logger(__name__)
+configure_tracing() # No-op unless OTEL_EXPORTER_OTLP_ENDPOINT is set
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load signing keys before serving and keep them fresh in the background
+    jwks_verifier = get_jwks_verifier()
+    await jwks_verifier.start()
+    # Liveness pings and idle-connection cleanup for every backend in use. The Celery broker is pinged
+    # without importing Celery, which loads with the first webhook dispatch
+    if settings.CELERY_BROKER_URL.startswith("redis"):
+        connections.redis_url("celery_broker", settings.CELERY_BROKER_URL, max_connections=1)
+    await connections.start()
+    # One Redis subscription per worker: cross-worker invalidations and real-time events for every WebSocket
+    await coordinator.start()
+    webhook_service.use_coordinator(coordinator)
+    await webhook_service.load_index()
+    # Precompile known GraphQL operations so they skip parse and validate
+    persisted_query_store.use_redis(redis_adapter.client)
+    await persisted_query_store.warm(schema, settings.PERSISTED_QUERY_MANIFEST)
+    response_cache.use_redis(redis_adapter.client)
+    # Apply the declared MongoDB indexes; a failure is logged rather than blocking startup
+    try:
+        await mongodb_adapter.ensure_indexes()
+    except Exception as e:
+        logger.error(f"[Startup] Failed to ensure MongoDB indexes: {e}")
+    # Flush write-behind records to the primary store in the background, and once more on shutdown
+    storage = get_adapter()
+    write_behind = storage.write_behind if isinstance(storage, CachingAdapter) else None
+    if write_behind is not None:
+        await write_behind.start(storage.primary, settings.CACHE_WRITE_BEHIND_FLUSH_SECONDS)
+    try:
+        yield
+    finally:
+        if write_behind is not None:
+            await write_behind.stop(storage.primary)
+        await coordinator.stop()
+        await jwks_verifier.stop()
+        await connections.stop()
 
 # Initialize FastAPI app
 app = FastAPI(
-    title="Bridges Market Central app"
+    title="Bridges Market Central app",
+    lifespan=lifespan
 )
 
-# Initialize adapters and services
-redis_adapter = RedisAdapter(
-    host=settings.REDIS_HOST,
-    port=settings.REDIS_PORT,
-    db=settings.REDIS_DB
-)
-mongodb_adapter = MongoDBAdapter(
-    connection_string=settings.MONGODB_CONNECTION_STRING,
-    database_name=settings.MONGODB_DATABASE_NAME
-)
-webhook_service = WebhookService(storage_adapter=mongodb_adapter)
+# Initialize adapters and services. Neither client connects here: Redis connects on the first command,
+# and the Motor client is created when the lifespan hook ensures indexes. Under the multi-worker launcher
+# this module is imported before forking, so sockets are only ever opened by the workers.
+connections = get_connection_manager() # Shared, bounded clients for every backend
+redis_adapter = RedisAdapter(client=connections.redis())
+webhook_service = get_webhook_service() # The same instance the webhook resolvers use
+mongodb_adapter = webhook_service.storage_adapter # Instrumented MongoDBAdapter; ensure_indexes is delegated
 event_publisher = EventPublisher(webhook_service=webhook_service, redis_client=redis_adapter.client)
+coordinator = Coordinator(redis_adapter.client, fanout_channels=[REDIS_PUBSUB_CHANNEL])
+
+# Attach rate limiting first so it runs inside AuthMiddleware and can key on the user ID
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=RateLimiter(redis_adapter.client, local_reserve=settings.RATE_LIMIT_LOCAL_RESERVE),
+        trusted_proxies=settings.RATE_LIMIT_TRUSTED_PROXIES,
+        persisted_queries=persisted_query_store, # Hash-only requests are limited by the operation they resolve to
+    )
 
 # Attach Supabase JWT Middleware
 app.add_middleware(AuthMiddleware)
 
 # Mount GraphQL schema
-graphql_app = GraphQLRouter(schema)
+graphql_app = CentralGraphQLRouter(schema)
 app.include_router(graphql_app, prefix="/graphql")
 
+# Streaming bulk exports for back-office tooling
+app.include_router(exports_router)
+
+# Admin-only sampling profiler for the worker serving the request
+app.include_router(profiling_router)
+
+# Prometheus scrape endpoint (storage, cache and request metrics)
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    return Response(exposition(), media_type=CONTENT_TYPE_LATEST) # Aggregated over the workers
+
 # WebSocket endpoint for real-time events
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    pubsub = None # Initialize pubsub to None
+    # Events arrive through the worker's shared subscription rather than a Redis connection per socket
+    events = coordinator.listen(REDIS_PUBSUB_CHANNEL)
     try:
-        # Subscribe to Redis Pub/Sub channel
-        pubsub = redis_adapter.client.pubsub()
-        await pubsub.subscribe(REDIS_PUBSUB_CHANNEL) # Use the directly imported constant
-
-        # Keep connection alive and listen for messages
         while True:
-            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-            if message:
-                await websocket.send_text(message['data'].decode('utf-8'))
+            # Events are already JSON-encoded by EventPublisher; forward them without re-encoding
+            await websocket.send_text(await events.get())
             # You can also listen for messages from the client here if needed
             # data = await websocket.receive_text()
             # print(f"Received from client: {data}")
@@ -57,9 +121,9 @@ async def websocket_endpoint(websocket: WebSocket):
     except Exception as e:
         print(f"WebSocket error: {e}")
     finally:
-        if pubsub: # Check if pubsub was initialized
-            await pubsub.unsubscribe(REDIS_PUBSUB_CHANNEL) # Use the directly imported constant
+        coordinator.unlisten(REDIS_PUBSUB_CHANNEL, events)
         await websocket.close()
 
 if __name__ == "__main__":
+    import uvicorn # Only needed when run directly; servers import the app
     uvicorn.run("main:app", host="0.0.0.0", port=3000, reload=True)
@@ -0,0 +1,25 @@
+from typing import Any
+
+from strawberry.schema.config import StrawberryConfig
+
+def resolve_attribute(source: Any, name: str) -> Any:
+    """
+    Default field resolver shared by every GraphQL type.
+
+    Resolvers return Pydantic models (or raw adapter dicts) as-is instead of
+    copying them into Strawberry dataclasses, so fields are read straight off
+    the source object. A field the source does not carry is an error rather
+    than a silent null: give such fields their own resolver. Raw adapter dicts
+    are sparse by nature, so their missing keys still resolve to None.
+    """
+    if isinstance(source, dict):
+        return source.get(name)
+    try:
+        return getattr(source, name)
+    except AttributeError:
+        raise AttributeError(f"{type(source).__name__} has no field '{name}'; map it with a resolver") from None
+
+# Lets Strawberry's tracing extensions keep skipping trivial field resolution
+resolve_attribute._is_default = True # type: ignore[attr-defined]
+
+strawberry_config = StrawberryConfig(default_resolver=resolve_attribute)
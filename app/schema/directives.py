@@ -0,0 +1,18 @@
+import strawberry
+from enum import Enum
+from typing import Optional
+from strawberry.schema_directive import Location
+
+@strawberry.enum
+class CacheScope(Enum):
+    PUBLIC = "PUBLIC" # Same response for every caller
+    PRIVATE = "PRIVATE" # Response depends on the authenticated user
+
+@strawberry.schema_directive(locations=[Location.OBJECT, Location.FIELD_DEFINITION], name="cacheControl")
+class CacheControl:
+    """
+    Response cache hint. On a type it applies to every field returning that type;
+    on a field it overrides the type's hint. Unset values fall back to the type's hint.
+    """
+    max_age: Optional[int] = None
+    scope: Optional[CacheScope] = None
@@ -0,0 +1,20 @@
+from schema.extensions.query_cost import QueryCostExtension
+from schema.extensions.persisted_queries import PersistedQueryExtension, PersistedQueryStore
+from schema.extensions.response_cache import ResponseCacheExtension, ResponseCache
+from schema.extensions.tracing import TracingExtension
+from schema.extensions.slow_operations import SlowOperationExtension, SlowOperationLog
+from schema.extensions.n_plus_one import NPlusOneExtension, AdapterCallReport, NPlusOneError
+
+__all__ = [
+    "QueryCostExtension",
+    "PersistedQueryExtension",
+    "PersistedQueryStore",
+    "ResponseCacheExtension",
+    "ResponseCache",
+    "TracingExtension",
+    "SlowOperationExtension",
+    "SlowOperationLog",
+    "NPlusOneExtension",
+    "AdapterCallReport",
+    "NPlusOneError",
+]
@@ -0,0 +1,132 @@
+from collections import Counter
+from inspect import isawaitable
+from typing import Any, Callable, Dict, List, Literal, NamedTuple, Optional
+
+from graphql import GraphQLError, GraphQLResolveInfo
+from strawberry.extensions import SchemaExtension
+from strawberry.extensions.tracing.utils import should_skip_tracing
+
+from schema.extensions.slow_operations import resolver_path
+from utils.logger import get_logger
+from utils.operation_stats import OperationStats, current_operation_stats, current_resolver_path
+
+logger = get_logger(__name__)
+
+class RepeatedCall(NamedTuple):
+    path: str # Resolver path without list indices
+    call: str # "<backend>.<operation>(<model>)"
+    calls: int
+    resolver_calls: int
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.call} issued {self.calls} times over {self.resolver_calls} resolver calls"
+
+class AdapterCallReport:
+    """Storage calls made by one operation, grouped by the resolver path that issued them."""
+
+    def __init__(self, operation_name: Optional[str], calls_by_path: Dict[str, Counter], resolver_calls: Counter):
+        self.operation_name = operation_name
+        self.calls_by_path = calls_by_path
+        self.resolver_calls = resolver_calls
+
+    @property
+    def total(self) -> int:
+        return sum(sum(calls.values()) for calls in self.calls_by_path.values())
+
+    def repeated(self) -> List[RepeatedCall]:
+        """
+        Call shapes issued more than once by a resolver that ran more than once,
+        i.e. one call per list element instead of one batched call.
+        """
+        return [
+            RepeatedCall(path, call, count, self.resolver_calls[path])
+            for path, calls in sorted(self.calls_by_path.items())
+            for call, count in sorted(calls.items())
+            if count > 1 and self.resolver_calls[path] > 1
+        ]
+
+    def growth_over(self, smaller: "AdapterCallReport") -> List[str]:
+        """Calls that increased from `smaller`, a run of the same operation over fewer results."""
+        grown = []
+        for path, calls in sorted(self.calls_by_path.items()):
+            before = smaller.calls_by_path.get(path, Counter())
+            for call, count in sorted(calls.items()):
+                if count > before[call]:
+                    grown.append(f"{path or '<operation>'}: {call} {before[call]} -> {count}")
+        return grown
+
+class NPlusOneError(Exception):
+    pass
+
+class NPlusOneExtension(SchemaExtension):
+    """
+    Development and test aid: attributes every InstrumentedAdapter call to the
+    resolver path that issued it and flags call shapes repeated across
+    invocations of one path (the N+1 pattern).
+
+    mode="warn" logs findings; mode="raise" also adds an error to the result,
+    so tests asserting `result.errors is None` fail. `reports`, when given,
+    receives an AdapterCallReport per operation for growth checks across
+    result sizes (see AdapterCallReport.growth_over).
+
+    Enabled in the app schema by N_PLUS_ONE_DETECTION; never in production,
+    since it hooks every resolver.
+    """
+
+    def __init__(
+        self,
+        *,
+        execution_context: Any = None,
+        mode: Literal["warn", "raise"] = "raise",
+        reports: Optional[List[AdapterCallReport]] = None,
+    ):
+        self.mode = mode
+        self.reports = reports
+        self._resolver_calls: Counter = Counter()
+
+    def on_operation(self):
+        stats = current_operation_stats.get()
+        token = None
+        if stats is None: # Shared with SlowOperationExtension when both are installed
+            stats = OperationStats()
+            token = current_operation_stats.set(stats)
+        stats.adapter_calls_by_path = {}
+        try:
+            yield
+        finally:
+            if token is not None:
+                current_operation_stats.reset(token)
+            self._report(AdapterCallReport(self.execution_context.operation_name, stats.adapter_calls_by_path, self._resolver_calls))
+
+    def _report(self, report: AdapterCallReport) -> None:
+        if self.reports is not None:
+            self.reports.append(report)
+        repeated = report.repeated()
+        if not repeated:
+            return
+        message = f"N+1 adapter calls in {report.operation_name or '<anonymous>'}: " + "; ".join(map(str, repeated))
+        logger.warning(f"[NPlusOne] {message}")
+        result = self.execution_context.result
+        if self.mode == "raise" and result is not None:
+            result.errors = [*(result.errors or []), GraphQLError(message, original_error=NPlusOneError(message))]
+
+    def resolve(self, _next: Callable, root: Any, info: GraphQLResolveInfo, *args: Any, **kwargs: Any) -> Any:
+        if should_skip_tracing(_next, info):
+            return _next(root, info, *args, **kwargs)
+        path = resolver_path(info)
+        self._resolver_calls[path] += 1
+        token = current_resolver_path.set(path)
+        try:
+            result = _next(root, info, *args, **kwargs)
+        finally:
+            current_resolver_path.reset(token)
+        if isawaitable(result):
+            return self._within(path, result) # The coroutine body runs when awaited, so the path is set again there
+        return result
+
+    async def _within(self, path: str, result: Any) -> Any:
+        token = current_resolver_path.set(path)
+        try:
+            return await result
+        finally:
+            current_resolver_path.reset(token)
@@ -0,0 +1,168 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from graphql import DocumentNode, GraphQLError, parse, specified_rules, validate
+from strawberry.extensions import SchemaExtension
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+REDIS_KEY_PREFIX = "graphql:pq:"
+
+class PersistedDocument:
+    """A persisted operation with its parsed AST, validated at most once per process."""
+    __slots__ = ("query", "document", "validated")
+
+    def __init__(self, query: str, document: DocumentNode, validated: bool = False):
+        self.query = query
+        self.document = document
+        self.validated = validated
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+class PersistedQueryStore:
+    """
+    sha256 -> query registry for automatic persisted queries (APQ).
+
+    Query texts live in Redis so every worker sees operations registered by any
+    of them; parsed and validated ASTs are cached in-process. Operations from the
+    startup manifest are pinned, APQ-registered ones sit in a bounded LRU.
+    With `enforce=True` only manifest operations are accepted.
+    """
+
+    def __init__(self, redis_client: Any = None, enforce: bool = False, ttl_seconds: int = 7 * 86400, max_local: int = 1000):
+        self.redis_client = redis_client
+        self.enforce = enforce
+        self.ttl = ttl_seconds
+        self.max_local = max_local
+        self._pinned: Dict[str, PersistedDocument] = {}
+        self._lru: "OrderedDict[str, PersistedDocument]" = OrderedDict()
+
+    def use_redis(self, redis_client: Any) -> None:
+        self.redis_client = redis_client
+
+    def compiled(self, sha: str) -> Optional[PersistedDocument]:
+        entry = self._pinned.get(sha)
+        if entry is None:
+            entry = self._lru.get(sha)
+            if entry is not None:
+                self._lru.move_to_end(sha)
+        return entry
+
+    def _remember(self, sha: str, query: str) -> PersistedDocument:
+        entry = PersistedDocument(query, parse(query))
+        self._lru[sha] = entry
+        while len(self._lru) > self.max_local:
+            self._lru.popitem(last=False)
+        return entry
+
+    async def get(self, sha: str) -> Optional[PersistedDocument]:
+        """Returns the compiled document for a hash, loading it from Redis on a local miss."""
+        entry = self.compiled(sha)
+        if entry is not None or self.enforce or self.redis_client is None:
+            return entry
+        query = await self.redis_client.get(REDIS_KEY_PREFIX + sha)
+        if query is None:
+            return None
+        if isinstance(query, bytes):
+            query = query.decode("utf-8")
+        return self._remember(sha, query)
+
+    async def register(self, sha: str, query: str) -> PersistedDocument:
+        """Stores a client-provided query under its hash."""
+        entry = self._remember(sha, query)
+        if self.redis_client is not None:
+            try:
+                await self.redis_client.set(REDIS_KEY_PREFIX + sha, query, ex=self.ttl)
+            except Exception as e:
+                logger.error(f"[PersistedQuery] Failed to store {sha} in Redis: {e}")
+        return entry
+
+    @staticmethod
+    def load_manifest(path: str) -> Dict[str, str]:
+        """Reads `{hash: query}` or an Apollo persisted-query manifest."""
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if isinstance(manifest, dict) and "operations" in manifest:
+            return {op["id"]: op["body"] for op in manifest["operations"]}
+        return dict(manifest)
+
+    async def warm(self, schema: Any, manifest_path: Optional[str]) -> int:
+        """Parses, validates and pins every manifest operation. Returns the number loaded."""
+        if not manifest_path:
+            return 0
+        for sha, query in self.load_manifest(manifest_path).items():
+            if query_hash(query) != sha:
+                logger.error(f"[PersistedQuery] Manifest hash {sha} does not match its query, skipping")
+                continue
+            document = parse(query)
+            errors = validate(schema._schema, document, specified_rules)
+            if errors:
+                logger.error(f"[PersistedQuery] Manifest operation {sha} is invalid, skipping: {errors[0].message}")
+                continue
+            self._pinned[sha] = PersistedDocument(query, document, validated=True)
+        if self.redis_client is not None and self._pinned:
+            try:
+                await self.redis_client.mset({REDIS_KEY_PREFIX + sha: entry.query for sha, entry in self._pinned.items()})
+            except Exception as e:
+                logger.error(f"[PersistedQuery] Failed to publish manifest to Redis: {e}")
+        logger.info(f"[PersistedQuery] Warmed {len(self._pinned)} persisted operations")
+        return len(self._pinned)
+
+def _error(message: str, code: str) -> GraphQLError:
+    return GraphQLError(message, extensions={"code": code})
+
+class PersistedQueryExtension(SchemaExtension):
+    """
+    Resolves APQ hashes to documents and hands Strawberry the precompiled AST, so
+    known operations skip parsing and, once validated, validation as well.
+    Follows the Apollo protocol: `extensions.persistedQuery.sha256Hash`, with a
+    PERSISTED_QUERY_NOT_FOUND error prompting the client to resend the full query.
+    """
+
+    def __init__(self, *, store: PersistedQueryStore, execution_context: Any = None):
+        self.store = store
+        self._entry: Optional[PersistedDocument] = None
+
+    async def on_operation(self):
+        ctx = self.execution_context
+        persisted = (ctx.operation_extensions or {}).get("persistedQuery")
+        sha = persisted.get("sha256Hash") if isinstance(persisted, dict) else None
+
+        if sha is None:
+            if ctx.query:
+                sha = query_hash(ctx.query)
+                self._entry = self.store.compiled(sha)
+            if self._entry is None and self.store.enforce:
+                raise _error("Only persisted operations are accepted", "PERSISTED_QUERY_REQUIRED")
+        elif ctx.query:
+            if query_hash(ctx.query) != sha:
+                raise _error("provided sha does not match query", "PERSISTED_QUERY_HASH_MISMATCH")
+            self._entry = self.store.compiled(sha)
+            if self._entry is None:
+                if self.store.enforce:
+                    raise _error("Only persisted operations are accepted", "PERSISTED_QUERY_REQUIRED")
+                self._entry = await self.store.register(sha, ctx.query)
+        else:
+            self._entry = await self.store.get(sha)
+            if self._entry is None:
+                raise _error("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+            ctx.query = self._entry.query
+
+        if self._entry is not None:
+            ctx.graphql_document = self._entry.document
+        yield
+
+    def on_validate(self):
+        ctx = self.execution_context
+        if self._entry is not None and self._entry.validated:
+            ctx.pre_execution_errors = [] # Already validated against this schema
+            yield
+            return
+        yield
+        if self._entry is not None and not ctx.pre_execution_errors:
+            self._entry.validated = True
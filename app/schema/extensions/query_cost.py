@@ -0,0 +1,175 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLList,
+    GraphQLNamedType,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    GraphQLInterfaceType,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    IntValueNode,
+    VariableNode,
+    ExecutionResult as GraphQLExecutionResult,
+)
+from strawberry.extensions import SchemaExtension
+
+# Extra weight for fields whose resolvers hit the storage layer on their own.
+# Keys are "<GraphQL type name>.<field name>".
+DEFAULT_FIELD_WEIGHTS: Dict[str, int] = {
+    "UserType.reputation": 10,
+    "UserType.name": 10, # SellerService.get_seller_by_user_id lists every seller
+    "UserType.verified": 10,
+    "WalletType.nfts": 5,
+}
+
+# Maximum cost per operation, by role. Requests without a role use "anonymous".
+DEFAULT_ROLE_BUDGETS: Dict[str, int] = {
+    "admin": 50000,
+    "broker": 10000,
+    "user": 5000,
+    "anonymous": 1000,
+}
+
+PAGINATION_ARGS = ("first", "last", "limit", "page_size", "pageSize", "take")
+
+class QueryCostExtension(SchemaExtension):
+    """
+    Computes a static cost for each operation before it executes and rejects
+    operations whose cost or depth exceed the caller's budget.
+
+    cost(field) = weight(field) + list_size(field) * sum(cost(child))
+
+    Composite fields weigh 1 and scalars 0 unless overridden in `field_weights`;
+    root fields weigh `root_field_weight` because each one calls an adapter.
+    List sizes come from pagination arguments when present, otherwise
+    `default_list_size` is assumed since our list fields are unbounded.
+    The computed cost is returned under `extensions.cost`.
+    """
+
+    def __init__(
+        self,
+        *,
+        execution_context: Any = None,
+        field_weights: Optional[Dict[str, int]] = None,
+        role_budgets: Optional[Dict[str, int]] = None,
+        default_list_size: int = 50,
+        root_field_weight: int = 10,
+        max_depth: int = 10,
+    ):
+        self.field_weights = DEFAULT_FIELD_WEIGHTS if field_weights is None else field_weights
+        self.role_budgets = DEFAULT_ROLE_BUDGETS if role_budgets is None else role_budgets
+        self.default_list_size = default_list_size
+        self.root_field_weight = root_field_weight
+        self.max_depth = max_depth
+        self._result: Optional[Dict[str, Any]] = None
+
+    def _budget(self) -> int:
+        request = (self.execution_context.context or {}).get("request") if isinstance(self.execution_context.context, dict) else None
+        role: Union[str, List[str], None] = getattr(getattr(request, "state", None), "role", None)
+        roles = [role] if isinstance(role, str) else list(role or [])
+        budgets = [self.role_budgets[r] for r in roles if r in self.role_budgets]
+        return max(budgets) if budgets else self.role_budgets.get("anonymous", 0)
+
+    def _list_size(self, node: FieldNode, field_def: Any, variables: Dict[str, Any]) -> int:
+        provided = {arg.name.value: arg.value for arg in node.arguments or ()}
+        for name in PAGINATION_ARGS:
+            if name in provided:
+                value = provided[name]
+                if isinstance(value, IntValueNode):
+                    return int(value.value)
+                if isinstance(value, VariableNode) and isinstance(variables.get(value.name.value), int):
+                    return variables[value.name.value]
+            arg_def = field_def.args.get(name)
+            if arg_def is not None and isinstance(arg_def.default_value, int):
+                return arg_def.default_value
+        return self.default_list_size
+
+    def _selection_cost(
+        self,
+        selection_set: Optional[SelectionSetNode],
+        parent_type: GraphQLNamedType,
+        fragments: Dict[str, FragmentDefinitionNode],
+        variables: Dict[str, Any],
+        depth: int,
+    ) -> Tuple[int, int]:
+        if selection_set is None or not isinstance(parent_type, (GraphQLObjectType, GraphQLInterfaceType)):
+            return 0, depth
+
+        total, max_depth = 0, depth
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                field_def = parent_type.fields.get(selection.name.value)
+                if field_def is None: # __typename and introspection fields
+                    continue
+
+                field_type, is_list = field_def.type, False
+                while isinstance(field_type, (GraphQLNonNull, GraphQLList)):
+                    is_list = is_list or isinstance(field_type, GraphQLList)
+                    field_type = field_type.of_type
+
+                is_composite = selection.selection_set is not None
+                default_weight = (self.root_field_weight if depth == 0 else 1) if is_composite else 0
+                weight = self.field_weights.get(f"{parent_type.name}.{selection.name.value}", default_weight)
+                child_cost, child_depth = self._selection_cost(selection.selection_set, field_type, fragments, variables, depth + 1)
+                multiplier = self._list_size(selection, field_def, variables) if is_list else 1
+                total += weight + multiplier * child_cost
+                max_depth = max(max_depth, child_depth if is_composite else depth + 1)
+            else:
+                if isinstance(selection, FragmentSpreadNode):
+                    fragment = fragments.get(selection.name.value)
+                    if fragment is None:
+                        continue
+                    type_condition, sub_selection = fragment.type_condition, fragment.selection_set
+                elif isinstance(selection, InlineFragmentNode):
+                    type_condition, sub_selection = selection.type_condition, selection.selection_set
+                else:
+                    continue
+                fragment_type = (
+                    self.execution_context.schema._schema.get_type(type_condition.name.value)
+                    if type_condition else parent_type
+                )
+                fragment_cost, fragment_depth = self._selection_cost(sub_selection, fragment_type, fragments, variables, depth)
+                total += fragment_cost
+                max_depth = max(max_depth, fragment_depth)
+        return total, max_depth
+
+    def calculate(self) -> Tuple[int, int]:
+        """Returns (cost, depth) of the operation that is about to execute."""
+        document = self.execution_context.graphql_document
+        graphql_schema = self.execution_context.schema._schema
+        fragments = {d.name.value: d for d in document.definitions if isinstance(d, FragmentDefinitionNode)}
+        operations = [d for d in document.definitions if isinstance(d, OperationDefinitionNode)]
+        operation_name = self.execution_context.operation_name
+        operation = next(
+            (op for op in operations if operation_name is None or (op.name and op.name.value == operation_name)),
+            None,
+        )
+        if operation is None:
+            return 0, 0
+        root_type = graphql_schema.get_root_type(operation.operation)
+        return self._selection_cost(operation.selection_set, root_type, fragments, self.execution_context.variables or {}, 0)
+
+    def on_execute(self):
+        cost, depth = self.calculate()
+        budget = self._budget()
+        self._result = {"requestedQueryCost": cost, "maximumAvailable": budget, "depth": depth}
+
+        if depth > self.max_depth:
+            error = GraphQLError(f"Query depth {depth} exceeds the maximum of {self.max_depth}")
+        elif cost > budget:
+            error = GraphQLError(f"Query cost {cost} exceeds the budget of {budget}")
+        else:
+            error = None
+        if error is not None:
+            # A preset result makes Strawberry skip execution entirely
+            self.execution_context.result = GraphQLExecutionResult(data=None, errors=[error])
+        yield
+
+    def get_results(self) -> Dict[str, Any]:
+        return {"cost": self._result} if self._result is not None else {}
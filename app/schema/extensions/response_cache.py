@@ -0,0 +1,244 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLInterfaceType,
+    GraphQLObjectType,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    get_named_type,
+    is_composite_type,
+)
+from strawberry.extensions import SchemaExtension
+from strawberry.types import ExecutionResult
+from strawberry.types.graphql import OperationType
+
+from schema.directives import CacheControl, CacheScope
+from utils.logger import get_logger
+from utils.metrics import cache_metrics
+from utils.tracing import tracer
+from utils.serialization import json_dumps, json_loads
+
+logger = get_logger(__name__)
+
+REDIS_KEY_PREFIX = "graphql:rc:"
+
+class CachePolicy:
+    __slots__ = ("max_age", "scope")
+
+    def __init__(self, max_age: int, scope: CacheScope):
+        self.max_age = max_age
+        self.scope = scope
+
+    @property
+    def cacheable(self) -> bool:
+        return self.max_age > 0
+
+    def header(self) -> str:
+        return f"{'public' if self.scope == CacheScope.PUBLIC else 'private'}, max-age={self.max_age}"
+
+class ResponseCache:
+    """Redis-backed whole-response store, plus an in-process memo of per-document policies."""
+
+    def __init__(self, redis_client: Any = None, max_policies: int = 1000):
+        self.redis_client = redis_client
+        self.max_policies = max_policies
+        self._policies: "OrderedDict[str, CachePolicy]" = OrderedDict()
+
+    def use_redis(self, redis_client: Any) -> None:
+        self.redis_client = redis_client
+
+    def remembered_policy(self, document_key: str) -> Optional[CachePolicy]:
+        return self._policies.get(document_key)
+
+    def remember_policy(self, document_key: str, policy: CachePolicy) -> None:
+        self._policies[document_key] = policy
+        while len(self._policies) > self.max_policies:
+            self._policies.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.redis_client is None:
+            return None
+        raw = await self.redis_client.get(REDIS_KEY_PREFIX + key)
+        return json_loads(raw) if raw else None
+
+    async def set(self, key: str, entry: Dict[str, Any], max_age: int) -> None:
+        if self.redis_client is not None:
+            await self.redis_client.set(REDIS_KEY_PREFIX + key, json_dumps(entry), ex=max_age)
+
+def _sha(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+class ResponseCacheExtension(SchemaExtension):
+    """
+    Serves whole query responses from Redis according to @cacheControl hints.
+
+    The effective policy of an operation is the minimum maxAge over its fields and
+    PRIVATE if any field is PRIVATE. Root fields and fields returning object types
+    without a hint are uncacheable; scalar fields inherit from their parent.
+    Responses are keyed by document hash + variables + scope (the user ID for
+    PRIVATE), sent with Cache-Control/ETag, and a matching If-None-Match gets a 304.
+    """
+
+    def __init__(self, *, cache: ResponseCache, execution_context: Any = None):
+        self.cache = cache
+        self._policy: Optional[CachePolicy] = None
+        self._key: Optional[str] = None
+
+    def _hint(self, parent_name: str, field_name: str, return_name: str) -> Tuple[Optional[int], Optional[CacheScope]]:
+        schema = self.execution_context.schema
+        max_age: Optional[int] = None
+        scope: Optional[CacheScope] = None
+        field = schema.get_field_for_type(field_name, parent_name)
+        for directive in (field.directives if field else ()):
+            if isinstance(directive, CacheControl):
+                max_age, scope = directive.max_age, directive.scope
+        type_def = schema.get_type_by_name(return_name)
+        for directive in getattr(type_def, "directives", None) or ():
+            if isinstance(directive, CacheControl):
+                max_age = directive.max_age if max_age is None else max_age
+                scope = directive.scope if scope is None else scope
+        return max_age, scope
+
+    def _walk(
+        self,
+        selection_set: Optional[SelectionSetNode],
+        parent_type: Any,
+        fragments: Dict[str, FragmentDefinitionNode],
+        is_root: bool,
+    ) -> Tuple[Optional[int], bool]:
+        if selection_set is None or not isinstance(parent_type, (GraphQLObjectType, GraphQLInterfaceType)):
+            return None, False
+        max_age: Optional[int] = None
+        private = False
+
+        def combine(age: Optional[int], is_private: bool) -> None:
+            nonlocal max_age, private
+            if age is not None:
+                max_age = age if max_age is None else min(max_age, age)
+            private = private or is_private
+
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                field_def = parent_type.fields.get(selection.name.value)
+                if field_def is None: # __typename
+                    continue
+                named = get_named_type(field_def.type)
+                age, scope = self._hint(parent_type.name, selection.name.value, named.name)
+                composite = is_composite_type(named)
+                if age is None and (composite or is_root):
+                    age = 0
+                combine(age, scope == CacheScope.PRIVATE)
+                if composite:
+                    combine(*self._walk(selection.selection_set, named, fragments, False))
+            elif isinstance(selection, (FragmentSpreadNode, InlineFragmentNode)):
+                fragment = fragments.get(selection.name.value) if isinstance(selection, FragmentSpreadNode) else selection
+                if fragment is None:
+                    continue
+                fragment_type = (
+                    self.execution_context.schema._schema.get_type(fragment.type_condition.name.value)
+                    if fragment.type_condition else parent_type
+                )
+                combine(*self._walk(fragment.selection_set, fragment_type, fragments, is_root))
+        return max_age, private
+
+    def policy(self) -> CachePolicy:
+        """Computes (or recalls) the effective cache policy of the current operation."""
+        ctx = self.execution_context
+        document_key = f"{_sha(ctx.query or '')}:{ctx.operation_name or ''}"
+        policy = self.cache.remembered_policy(document_key)
+        if policy is not None:
+            return policy
+
+        document = ctx.graphql_document
+        fragments = {d.name.value: d for d in document.definitions if isinstance(d, FragmentDefinitionNode)}
+        operation = next(
+            (
+                d for d in document.definitions
+                if isinstance(d, OperationDefinitionNode)
+                and (ctx.operation_name is None or (d.name and d.name.value == ctx.operation_name))
+            ),
+            None,
+        )
+        max_age, private = (0, False)
+        if operation is not None:
+            root_type = ctx.schema._schema.get_root_type(operation.operation)
+            max_age, private = self._walk(operation.selection_set, root_type, fragments, True)
+        policy = CachePolicy(max_age or 0, CacheScope.PRIVATE if private else CacheScope.PUBLIC)
+        self.cache.remember_policy(document_key, policy)
+        return policy
+
+    def _request_response(self) -> Tuple[Any, Any]:
+        context = self.execution_context.context
+        if isinstance(context, dict):
+            return context.get("request"), context.get("response")
+        return getattr(context, "request", None), getattr(context, "response", None)
+
+    def _finish(self, etag: str) -> None:
+        request, response = self._request_response()
+        if response is None:
+            return
+        response.headers["Cache-Control"] = self._policy.header()
+        response.headers["ETag"] = etag
+        if self._policy.scope == CacheScope.PRIVATE:
+            response.headers["Vary"] = "Authorization"
+        if_none_match = request.headers.get("if-none-match") if request is not None else None
+        if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+            response.status_code = 304
+
+    async def on_execute(self):
+        ctx = self.execution_context
+        if ctx.result is not None or ctx.operation_type != OperationType.QUERY:
+            yield
+            return
+
+        policy = self.policy()
+        request, _ = self._request_response()
+        user_id = getattr(getattr(request, "state", None), "user_id", None)
+        if not policy.cacheable or (policy.scope == CacheScope.PRIVATE and not user_id):
+            yield
+            return
+
+        self._policy = policy
+        scope_key = f"user:{user_id}" if policy.scope == CacheScope.PRIVATE else "public"
+        variables = json.dumps(ctx.variables or {}, sort_keys=True, separators=(",", ":"), default=str)
+        self._key = f"{_sha(ctx.query or '')}:{ctx.operation_name or ''}:{_sha(variables)}:{scope_key}"
+
+        with tracer.start_as_current_span("cache.read", attributes={"cache.tier": "response"}) as span:
+            try:
+                cached = await self.cache.get(self._key)
+            except Exception as e:
+                logger.error(f"[ResponseCache] Read failed, executing normally: {e}")
+                cached = None
+            span.set_attribute("cache.hit", cached is not None)
+        hits, misses = cache_metrics("response", "graphql")
+        if cached is not None:
+            hits.inc()
+            ctx.result = ExecutionResult(data=cached["data"], errors=None)
+            self._finish(cached["etag"])
+            yield
+            return
+        misses.inc()
+
+        yield
+
+        result = ctx.result
+        if result is None or result.errors or result.data is None:
+            return
+        etag = f'"{hashlib.sha1(json_dumps(result.data, sort_keys=True)).hexdigest()}"'
+        try:
+            await self.cache.set(self._key, {"etag": etag, "data": result.data}, policy.max_age)
+        except Exception as e:
+            logger.error(f"[ResponseCache] Write failed: {e}")
+        self._finish(etag)
+
+    def get_results(self) -> Dict[str, Any]:
+        if self._policy is None:
+            return {}
+        return {"cacheControl": {"maxAge": self._policy.max_age, "scope": self._policy.scope.value}}
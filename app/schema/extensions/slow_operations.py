@@ -0,0 +1,136 @@
+import hashlib
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from inspect import isawaitable
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from graphql import GraphQLResolveInfo
+from strawberry.extensions import SchemaExtension
+from strawberry.extensions.tracing.utils import should_skip_tracing
+
+from utils.logger import get_logger
+from utils.operation_stats import OperationStats, ResolverTiming, current_operation_stats
+from utils.serialization import json_dumps
+
+logger = get_logger(__name__)
+
+MAX_RESOLVER_TIMINGS = 25 # Per captured operation, slowest first
+
+class SlowOperation(NamedTuple):
+    """A captured operation. Variables are kept as a hash only, so no user data is retained."""
+    operation_name: Optional[str]
+    operation_type: Optional[str]
+    variables_hash: Optional[str]
+    duration_ms: float
+    started_at: datetime
+    worker_pid: int
+    has_errors: bool
+    resolvers: List[Tuple[str, ResolverTiming]] # Slowest first
+    adapter_calls: Dict[str, int]
+
+class SlowOperationLog:
+    """
+    Bounded ring buffer of operations slower than `threshold_ms`; the oldest
+    entry is dropped once `capacity` is reached. Entries are per worker process.
+    """
+
+    def __init__(self, threshold_ms: float = 500.0, capacity: int = 200):
+        self.threshold_ms = threshold_ms
+        self._entries: Deque[SlowOperation] = deque(maxlen=capacity)
+
+    def record(self, entry: SlowOperation) -> None:
+        self._entries.append(entry)
+
+    def entries(self, limit: Optional[int] = None, operation_name: Optional[str] = None) -> List[SlowOperation]:
+        """Most recent first."""
+        entries = list(reversed(self._entries))
+        if operation_name is not None:
+            entries = [entry for entry in entries if entry.operation_name == operation_name]
+        return entries[:limit] if limit is not None else entries
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+def variables_hash(variables: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Stable hash of the operation variables, to group captures of the same call without storing values."""
+    if not variables:
+        return None
+    return hashlib.sha256(json_dumps(variables, sort_keys=True)).hexdigest()[:16]
+
+def resolver_path(info: GraphQLResolveInfo) -> str:
+    """Response path without list indices: every item of `listings` shares "listings.priceHistory"."""
+    keys = []
+    path = info.path
+    while path is not None:
+        if isinstance(path.key, str):
+            keys.append(path.key)
+        path = path.prev
+    return ".".join(reversed(keys))
+
+class SlowOperationExtension(SchemaExtension):
+    """
+    Times each operation and captures those over the log's threshold, with
+    per-resolver timings and the storage calls counted by InstrumentedAdapter.
+
+    Only fields with their own resolver function are timed; plain attribute
+    fields pass straight through.
+    """
+
+    def __init__(self, *, execution_context: Any = None, log: SlowOperationLog):
+        self.log = log
+
+    def on_operation(self):
+        stats = current_operation_stats.get()
+        token = None
+        if stats is None: # Shared with NPlusOneExtension when both are installed
+            stats = OperationStats()
+            token = current_operation_stats.set(stats)
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if token is not None:
+                current_operation_stats.reset(token)
+            if duration_ms >= self.log.threshold_ms:
+                self._capture(stats, duration_ms, started_at)
+
+    def _capture(self, stats: OperationStats, duration_ms: float, started_at: datetime) -> None:
+        ctx = self.execution_context
+        try:
+            operation_type = ctx.operation_type.value
+        except Exception:
+            operation_type = None # Parsing failed
+        result = ctx.result
+        self.log.record(SlowOperation(
+            operation_name=ctx.operation_name,
+            operation_type=operation_type,
+            variables_hash=variables_hash(ctx.variables),
+            duration_ms=round(duration_ms, 3),
+            started_at=started_at,
+            worker_pid=os.getpid(),
+            has_errors=bool(result is not None and result.errors),
+            resolvers=stats.slowest_resolvers(MAX_RESOLVER_TIMINGS),
+            adapter_calls=dict(stats.adapter_calls),
+        ))
+        logger.warning(f"[SlowOperation] {ctx.operation_name or '<anonymous>'} took {duration_ms:.0f}ms")
+
+    def resolve(self, _next: Callable, root: Any, info: GraphQLResolveInfo, *args: Any, **kwargs: Any) -> Any:
+        stats = current_operation_stats.get()
+        if stats is None or should_skip_tracing(_next, info):
+            return _next(root, info, *args, **kwargs)
+        started = time.perf_counter()
+        result = _next(root, info, *args, **kwargs)
+        if isawaitable(result):
+            return self._timed(result, stats, info, started)
+        stats.add_resolver_time(resolver_path(info), (time.perf_counter() - started) * 1000)
+        return result
+
+    async def _timed(self, result: Any, stats: OperationStats, info: GraphQLResolveInfo, started: float) -> Any:
+        try:
+            return await result
+        finally:
+            stats.add_resolver_time(resolver_path(info), (time.perf_counter() - started) * 1000)
@@ -0,0 +1,68 @@
+from typing import Any, Dict, Generator, Optional
+
+from graphql import GraphQLResolveInfo
+from opentelemetry import context as otel_context, trace
+from opentelemetry.trace import Span, SpanKind
+from strawberry.extensions.tracing import OpenTelemetryExtension
+from strawberry.extensions.tracing.opentelemetry import LifecycleStep
+
+from utils.tracing import TRACER_NAME, extract_context
+
+REDACTED_ARGS = {"secret", "password", "token"}
+
+def scalar_args(args: Dict[str, Any], info: GraphQLResolveInfo) -> Dict[str, Any]:
+    """Resolver arguments recorded on spans: scalars only, so input objects (webhook secrets etc.) never reach the collector."""
+    return {
+        name: value
+        for name, value in args.items()
+        if name not in REDACTED_ARGS and isinstance(value, (str, int, float, bool))
+    }
+
+class TracingExtension(OpenTelemetryExtension):
+    """
+    Spans for each GraphQL operation and each resolver with its own resolver
+    function (plain attribute fields are skipped).
+
+    Unlike Strawberry's extension, the operation span continues the caller's
+    trace from the `traceparent` header and is made current, so adapter,
+    cache and event spans started anywhere in the request nest under it.
+    """
+
+    def __init__(self, *, execution_context: Any = None):
+        super().__init__(execution_context=execution_context, arg_filter=scalar_args)
+        self._tracer = trace.get_tracer(TRACER_NAME)
+
+    def _parent_context(self) -> Optional[otel_context.Context]:
+        context = self.execution_context.context
+        request = context.get("request") if isinstance(context, dict) else getattr(context, "request", None)
+        headers = getattr(request, "headers", None)
+        return extract_context(headers) if headers is not None else None
+
+    def on_operation(self) -> Generator[None, None, None]:
+        name = self.execution_context.operation_name
+        span = self._tracer.start_span(
+            f"GraphQL Operation: {name}" if name else "GraphQL Operation",
+            kind=SpanKind.SERVER,
+            context=self._parent_context(),
+        )
+        span.set_attribute("component", "graphql")
+        self._span_holder[LifecycleStep.OPERATION] = span
+        token = otel_context.attach(trace.set_span_in_context(span))
+        try:
+            yield
+        finally:
+            # The operation name and type are only known for sure after parsing
+            ctx = self.execution_context
+            if not name and ctx.operation_name:
+                span.update_name(f"GraphQL Operation: {ctx.operation_name}")
+            if span.is_recording():
+                try:
+                    span.set_attribute("graphql.operation.type", ctx.operation_type.value)
+                except Exception:
+                    pass # Parsing failed
+            span.end()
+            otel_context.detach(token)
+
+    def add_tags(self, span: Span, info: GraphQLResolveInfo, kwargs: Any) -> None:
+        if span.is_recording(): # Unsampled requests skip argument conversion entirely
+            super().add_tags(span, info, kwargs)
@@ -0,0 +1,38 @@
+from typing import Any, Dict, List, Optional, Type
+
+from pydantic import BaseModel
+from strawberry.dataloader import DataLoader
+from strawberry.types import Info
+
+from adapters import get_adapter
+
+CONTEXT_KEY = "dataloaders"
+
+def _loaders(context: Any) -> Dict[Type[BaseModel], DataLoader]:
+    """Returns the per-request loader registry, creating it on first use."""
+    if isinstance(context, dict):
+        return context.setdefault(CONTEXT_KEY, {})
+    loaders = getattr(context, CONTEXT_KEY, None)
+    if loaders is None:
+        loaders = {}
+        setattr(context, CONTEXT_KEY, loaders)
+    return loaders
+
+def get_loader(info: Info, model_type: Type[BaseModel]) -> DataLoader:
+    """
+    Per-request DataLoader fetching `model_type` records by ID.
+
+    All `load()` calls made in the same tick (e.g. every representation of one
+    typename in a federation `_entities` query) are coalesced into a single
+    `read_many` on the request's adapter, which checks the cache first.
+    """
+    loaders = _loaders(info.context)
+    loader = loaders.get(model_type)
+    if loader is None:
+        adapter = get_adapter() # One adapter per request and model type, not per entity
+
+        async def load(ids: List[str]) -> List[Optional[BaseModel]]:
+            return await adapter.read_many(model_type, list(ids))
+
+        loader = loaders[model_type] = DataLoader(load_fn=load)
+    return loader
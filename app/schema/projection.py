@@ -0,0 +1,35 @@
+from typing import Dict, Iterable, List, Optional, Type
+
+from pydantic import BaseModel
+from strawberry.types import Info
+from strawberry.types.nodes import FragmentSpread, InlineFragment, SelectedField, Selection
+from strawberry.utils.str_converters import to_camel_case
+
+def _names(selections: Iterable[Selection]) -> Iterable[str]:
+    """Field names selected directly on the current type, with fragments flattened."""
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            yield selection.name
+        elif isinstance(selection, (FragmentSpread, InlineFragment)):
+            yield from _names(selection.selections)
+
+def selected_fields(info: Info, model_type: Type[BaseModel]) -> Optional[List[str]]:
+    """
+    Model fields the current GraphQL field selects on its result, for adapter projections.
+
+    Returns None (fetch everything) when a selected field does not map to a
+    stored field, e.g. a computed field whose resolver may need other data.
+    """
+    stored: Dict[str, str] = {}
+    for name in model_type.model_fields:
+        stored[name] = name
+        stored[to_camel_case(name)] = name
+    fields = {"id"} if "id" in model_type.model_fields else set()
+    for selected in info.selected_fields:
+        for name in _names(selected.selections):
+            if name == "__typename":
+                continue
+            if name not in stored:
+                return None
+            fields.add(stored[name])
+    return sorted(fields)
@@ -1,5 +1,5 @@
 from schema.resolvers.user_resolver import Query as UserQuery, Mutation as UserMutation
-from schema.resolvers.trade_resolver import Query as TradeQuery
+from schema.resolvers.trade_resolver import Query as TradeQuery, Mutation as TradeMutation
 from schema.resolvers.auction_resolver import Query as AuctionQuery
 from schema.resolvers.snft_resolver import Query as SNFTQuery
 from schema.resolvers.property_resolver import Query as PropertyQuery
@@ -8,6 +8,11 @@ from schema.resolvers.wallet_resolver import Query as WalletQuery
 from schema.resolvers.transaction_resolver import Query as TransactionQuery
 from schema.resolvers.seller_resolver import Query as SellerQuery
 from schema.resolvers.webhook_resolver import WebhookQuery, WebhookMutation # Import WebhookQuery and WebhookMutation
+from schema.resolvers.admin_resolver import Query as AdminQuery, slow_operation_log
+from schema.conversion import strawberry_config
+from schema.extensions import QueryCostExtension, PersistedQueryExtension, PersistedQueryStore, ResponseCacheExtension, ResponseCache, TracingExtension, SlowOperationExtension, NPlusOneExtension
+from config import settings
+from functools import partial
 
 import strawberry
 import strawberry.federation as federation # Import strawberry.federation
@@ -24,16 +29,36 @@ class Query(
     TransactionQuery,
     SellerQuery,
     WebhookQuery, # Add WebhookQuery
+    AdminQuery,
 ):
     pass
 
 @strawberry.type
 class Mutation(
     UserMutation,
+    TradeMutation,
     WebhookMutation, # Add WebhookMutation
 ):
     pass
 
+# Shared by all requests; main.py attaches Redis and warms it from the manifest at startup
+persisted_query_store = PersistedQueryStore(enforce=settings.PERSISTED_QUERIES_ONLY)
+response_cache = ResponseCache()
+
 # Enable Federation in the schema
 # Enable Federation in the schema
-schema = federation.Schema(query=Query, mutation=Mutation) # Use federation.Schema
\ No newline at end of file
+schema = federation.Schema(
+    query=Query,
+    mutation=Mutation,
+    config=strawberry_config, # Fields resolve directly off the Pydantic models resolvers return
+    extensions=[
+        # First, so the operation span encloses the other extensions; off (no per-resolver hooks) unless traces are exported
+        *([TracingExtension] if settings.OTEL_EXPORTER_OTLP_ENDPOINT else []),
+        partial(SlowOperationExtension, log=slow_operation_log), # Encloses cache lookups and cost checks, so their time counts
+        # Development and tests only: flags resolvers issuing one adapter call per list element
+        *([partial(NPlusOneExtension, mode=settings.N_PLUS_ONE_DETECTION)] if settings.N_PLUS_ONE_DETECTION != "off" else []),
+        partial(PersistedQueryExtension, store=persisted_query_store), # Known operations skip parse/validate
+        QueryCostExtension, # Reject operations over the caller's cost budget before they execute
+        partial(ResponseCacheExtension, cache=response_cache), # Serve @cacheControl-hinted queries from Redis
+    ],
+) # Use federation.Schema
\ No newline at end of file
@@ -0,0 +1,49 @@
+import strawberry
+from typing import List, Optional
+from fastapi import HTTPException
+from strawberry.types import Info
+from config import settings
+from schema.extensions.slow_operations import SlowOperation, SlowOperationLog
+from schema.types.admin_type import AdapterCallCountType, ResolverTimingType, SlowOperationType
+
+ADMIN_ROLES = {"admin"}
+
+# Filled by SlowOperationExtension (see schema.resolvers); one buffer per worker process
+slow_operation_log = SlowOperationLog(
+    threshold_ms=settings.SLOW_OPERATION_THRESHOLD_MS,
+    capacity=settings.SLOW_OPERATION_BUFFER_SIZE,
+)
+
+def require_admin(info: Info) -> None:
+    request = info.context["request"]
+    role = getattr(request.state, "role", None)
+    roles = set(role) if isinstance(role, list) else {role}
+    if not roles & ADMIN_ROLES:
+        raise HTTPException(status_code=403, detail="Only admins can access this.")
+
+def to_type(entry: SlowOperation) -> SlowOperationType:
+    return SlowOperationType(
+        operation_name=entry.operation_name,
+        operation_type=entry.operation_type,
+        variables_hash=entry.variables_hash,
+        duration_ms=entry.duration_ms,
+        started_at=entry.started_at,
+        worker_pid=entry.worker_pid,
+        has_errors=entry.has_errors,
+        resolvers=[
+            ResolverTimingType(path=path, calls=timing.calls, total_ms=round(timing.total_ms, 3), max_ms=round(timing.max_ms, 3))
+            for path, timing in entry.resolvers
+        ],
+        adapter_calls=[
+            AdapterCallCountType(call=call, count=count)
+            for call, count in sorted(entry.adapter_calls.items(), key=lambda item: item[1], reverse=True)
+        ],
+    )
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def slow_operations(self, info: Info, limit: int = 50, operation_name: Optional[str] = None) -> List[SlowOperationType]:
+        """Recent operations over SLOW_OPERATION_THRESHOLD_MS on the worker serving the request, newest first (admin only)."""
+        require_admin(info)
+        return [to_type(entry) for entry in slow_operation_log.entries(limit, operation_name)]
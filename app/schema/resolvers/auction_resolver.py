@@ -1,4 +1,5 @@
 import strawberry
+from typing import cast
 from schema.types.auction_type import BidHistoryEntryType
 from services.auction_service import AuctionService # Import the AuctionService
 from adapters import get_adapter # Import get_adapter
@@ -18,5 +19,5 @@ class Query:
         auction_service = AuctionService(adapter) # Instantiate the service
         # Pass the authenticated_user_id to the service method
         bid_history_entries = await auction_service.get_bid_history(authenticated_user_id) # Call the service method
-        # Map the list of BidHistoryEntry models to BidHistoryEntryType
-        return [BidHistoryEntryType.from_pydantic(entry) for entry in bid_history_entries]
\ No newline at end of file
+        # BidHistoryEntry models are returned as-is; BidHistoryEntryType fields resolve straight off them
+        return cast(list[BidHistoryEntryType], bid_history_entries)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import strawberry
+from typing import cast
 from schema.types.property_type import PropertyMarketplaceItemType, CollectionItemType, PropertyMarketplaceItemInput # Import PropertyMarketplaceItemInput
 from services.property_service import PropertyService # Import the PropertyService
 from adapters import get_adapter # Import get_adapter
@@ -19,9 +20,8 @@ class Query:
         property_service = PropertyService(adapter) # Instantiate the service
         # Pass the authenticated_user_id to the service method
         marketplace_items = await property_service.get_marketplace_items(authenticated_user_id) # Call the service method
-        # Map the list of PropertyMarketplaceItem models to PropertyMarketplaceItemType
-        # Manually map the list of PropertyMarketplaceItem models to PropertyMarketplaceItemType
-        return [PropertyMarketplaceItemType(**item.model_dump()) for item in marketplace_items]
+        # PropertyMarketplaceItem models are returned as-is; fields resolve straight off them
+        return cast(list[PropertyMarketplaceItemType], marketplace_items)
 
     @strawberry.field
     # Access context via info argument
@@ -34,9 +34,8 @@ class Query:
         property_service = PropertyService(adapter) # Instantiate the service
         # Pass the authenticated_user_id to the service method
         collections = await property_service.get_collections(authenticated_user_id) # Call the service method
-        # Map the list of CollectionItem models to CollectionItemType
-        # Manually map the list of CollectionItem models to CollectionItemType
-        return [CollectionItemType(**collection.model_dump()) for collection in collections]
+        # CollectionItem models are returned as-is; CollectionItemType fields resolve straight off them
+        return cast(list[CollectionItemType], collections)
 
 @strawberry.type
 class Mutation:
@@ -57,6 +56,5 @@ class Mutation:
         # Call the service method to create the item
         created_item = await property_service.create_marketplace_item(authenticated_user_id, item_model)
 
-        # Return the created item mapped to the GraphQL type
-        # Manually map the created item to the GraphQL type
-        return PropertyMarketplaceItemType(**created_item.model_dump())
\ No newline at end of file
+        # Return the created item as the GraphQL type
+        return cast(PropertyMarketplaceItemType, created_item)
\ No newline at end of file
@@ -1,10 +1,11 @@
 import strawberry
-from typing import Optional # Import Optional
+from typing import Optional, cast # Import Optional
 from schema.types.reputation_type import ReputationType
 from services.reputation_service import ReputationService # Import the ReputationService
 from adapters import get_adapter # Import get_adapter
 from fastapi import Request, HTTPException # Import Request and HTTPException from fastapi
 from strawberry.types import Info # Import Info
+from schema.directives import CacheControl, CacheScope
 
 @strawberry.type
 class Query:
@@ -13,10 +14,10 @@ class Query:
         adapter = get_adapter() # Get the adapter
         reputation_service = ReputationService(adapter) # Instantiate the service
         reputations = await reputation_service.get_reputations() # Call the service method
-        # Map the list of Reputation models to ReputationType
-        return [ReputationType.from_pydantic(reputation) for reputation in reputations]
+        # Reputation models are returned as-is; ReputationType fields resolve straight off them
+        return cast(list[ReputationType], reputations)
 
-    @strawberry.field
+    @strawberry.field(directives=[CacheControl(scope=CacheScope.PRIVATE)]) # Authorized per user, never shared
     # Access context via info argument
     async def user_reputation(self, id: strawberry.ID, info: Info) -> Optional[ReputationType]:
         request: Request = info.context["request"]
@@ -29,4 +30,4 @@ class Query:
         reputation = await reputation_service.get_user_reputation(authenticated_user_id, str(id)) # Call the service method
         if reputation is None:
             return None # Return None if reputation is not found (or not authorized, handled by service)
-        return ReputationType.from_pydantic(reputation)
\ No newline at end of file
+        return cast(ReputationType, reputation)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import strawberry
+from typing import cast
 from schema.types.auction_type import SellerType, SellerInput # Import SellerInput
 from services.seller_service import SellerService # Import the SellerService
 from adapters import get_adapter # Import get_adapter
@@ -13,8 +14,8 @@ class Query:
         adapter = get_adapter() # Get the adapter
         seller_service = SellerService(adapter) # Instantiate the service
         sellers = await seller_service.get_sellers() # Call the service method
-        # Map the list of Seller models to SellerType
-        return [SellerType.from_pydantic(seller) for seller in sellers]
+        # Seller models are returned as-is; SellerType fields resolve straight off them
+        return cast(list[SellerType], sellers)
 
 @strawberry.type
 class Mutation:
@@ -34,5 +35,5 @@ class Mutation:
         # Call the service method to create the seller
         created_seller = await seller_service.create_seller(authenticated_user_id, seller_model)
 
-        # Return the created seller mapped to the GraphQL type
-        return SellerType.from_pydantic(created_seller)
\ No newline at end of file
+        # Return the created seller as the GraphQL type
+        return cast(SellerType, created_seller)
\ No newline at end of file
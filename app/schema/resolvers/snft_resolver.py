@@ -1,4 +1,5 @@
 import strawberry
+from typing import cast
 from schema.types.snft_type import SNFTType
 from services.snft_service import SnftService # Import the SnftService
 from adapters import get_adapter # Import get_adapter
@@ -18,6 +19,5 @@ class Query:
         snft_service = SnftService(adapter) # Instantiate the service
         # Pass the authenticated_user_id to the service method
         snfts = await snft_service.get_snfts(authenticated_user_id) # Call the service method
-        # Map the list of SNFT models to SNFTType
-        # Manually map the list of SNFT models to SNFTType
-        return [SNFTType(**snft.model_dump()) for snft in snfts]
\ No newline at end of file
+        # SNFT models are returned as-is; SNFTType fields resolve straight off them
+        return cast(list[SNFTType], snfts)
\ No newline at end of file
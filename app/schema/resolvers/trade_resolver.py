@@ -1,4 +1,5 @@
 import strawberry
+from typing import cast
 from schema.types.trade_type import PropertyListingType, PropertyListingInput, PropertyListingUpdateInput # Import input types
 
 from services.trade_service import TradeService # Import the TradeService
@@ -6,7 +7,12 @@ from adapters import get_adapter # Import get_adapter
 from fastapi import Request, HTTPException # Import Request and HTTPException from fastapi
 from models.trade import PropertyListing # Import the model for validation
 from strawberry.types import Info # Import Info
-from app.main import event_publisher # Import the event_publisher instance
+from adapters.ids import id_codec
+
+def get_event_publisher():
+    # Imported on first use: app.main imports this schema, so a module-level import is circular
+    from app.main import event_publisher
+    return event_publisher
 
 @strawberry.type
 class Query:
@@ -18,12 +24,11 @@ class Query:
         authenticated_user_id = request.state.user_id
 
         adapter = get_adapter() # Get the adapter
-        trade_service = TradeService(adapter, event_publisher) # Instantiate the service with event_publisher
+        trade_service = TradeService(adapter, get_event_publisher()) # Instantiate the service with event_publisher
         # Pass the authenticated_user_id to the service method
         listings = await trade_service.get_listings(authenticated_user_id) # Call the service method
-        # Map the list of PropertyListing models to PropertyListingType
-        # Manually map the list of PropertyListing models to PropertyListingType
-        return [PropertyListingType(**listing.model_dump()) for listing in listings]
+        # PropertyListing models are returned as-is; PropertyListingType fields resolve straight off them
+        return cast(list[PropertyListingType], listings)
 
 @strawberry.type
 class Mutation:
@@ -35,19 +40,20 @@ class Mutation:
         authenticated_user_id = request.state.user_id
 
         adapter = get_adapter() # Get the adapter
-        trade_service = TradeService(adapter, event_publisher) # Instantiate the service with event_publisher
+        trade_service = TradeService(adapter, get_event_publisher()) # Instantiate the service with event_publisher
 
-        # Convert input data to the Pydantic model
-        # Note: Fields like id, user_id, created_at, etc. will be set by the service/adapter
-        listing_model = PropertyListing.model_validate(listing_data.__dict__)
-        listing_model.user_id = authenticated_user_id # Set user_id from authenticated user
+        # Convert input data to the Pydantic model, with a new ID and the authenticated user as owner
+        listing_model = PropertyListing.model_validate({
+            **listing_data.__dict__,
+            "id": id_codec(PropertyListing).generate(),
+            "user_id": authenticated_user_id,
+        })
 
         # Call the service method to create the listing
         created_listing = await trade_service.create_listing(authenticated_user_id, listing_model)
 
-        # Return the created listing mapped to the GraphQL type
-        # Manually map the created listing to the GraphQL type
-        return PropertyListingType(**created_listing.model_dump())
+        # Return the created listing as the GraphQL type
+        return cast(PropertyListingType, created_listing)
 
     @strawberry.mutation
     # Access context via info argument
@@ -57,18 +63,24 @@ class Mutation:
         authenticated_user_id = request.state.user_id
 
         adapter = get_adapter() # Get the adapter
-        trade_service = TradeService(adapter, event_publisher) # Instantiate the service with event_publisher
-
-        # Convert input data to the Pydantic model
-        # Assuming PropertyListingUpdateInput includes the ID for the listing to update
-        listing_model = PropertyListing.model_validate(listing_data.__dict__)
+        trade_service = TradeService(adapter, get_event_publisher()) # Instantiate the service with event_publisher
+
+        # Apply the provided fields to the stored listing; its owner is kept for the service's authorization check
+        existing_listing = await adapter.read(PropertyListing, str(listing_data.id))
+        if existing_listing is None or existing_listing.user_id != authenticated_user_id:
+            # Same error either way, so listing IDs cannot be probed by non-owners
+            raise HTTPException(status_code=404, detail="Listing not found")
+        changes = {
+            name: value for name, value in listing_data.__dict__.items()
+            if value is not None and name in PropertyListing.model_fields and name != "id"
+        }
+        listing_model = PropertyListing.model_validate({**existing_listing.model_dump(), **changes})
 
         # Call the service method to update the listing
         updated_listing = await trade_service.update_listing(authenticated_user_id, listing_model)
 
-        # Return the updated listing mapped to the GraphQL type
-        # Manually map the updated listing to the GraphQL type
-        return PropertyListingType(**updated_listing.model_dump())
+        # Return the updated listing as the GraphQL type
+        return cast(PropertyListingType, updated_listing)
 
     @strawberry.mutation
     # Access context via info argument
@@ -78,7 +90,7 @@ class Mutation:
         authenticated_user_id = request.state.user_id
 
         adapter = get_adapter() # Get the adapter
-        trade_service = TradeService(adapter, event_publisher) # Instantiate the service with event_publisher
+        trade_service = TradeService(adapter, get_event_publisher()) # Instantiate the service with event_publisher
 
         # Call the service method to delete the listing
         await trade_service.delete_listing(authenticated_user_id, str(id))
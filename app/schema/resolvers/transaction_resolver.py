@@ -1,5 +1,5 @@
 import strawberry
-from typing import List # Import List
+from typing import List, cast # Import List
 from schema.types.transaction_type import TransactionType
 from services.transaction_service import TransactionService # Import the TransactionService
 from adapters import get_adapter # Import get_adapter
@@ -19,6 +19,5 @@ class Query:
         transaction_service = TransactionService(adapter) # Instantiate the service
         # Pass both authenticated_user_id and requested_user_id to the service method
         user_transactions = await transaction_service.get_user_transactions(authenticated_user_id, str(id)) # Call the service method
-        # Map the list of Transaction models to TransactionType
-        # Manually map the list of Transaction models to TransactionType
-        return [TransactionType(**transaction.model_dump()) for transaction in user_transactions]
\ No newline at end of file
+        # Transaction models are returned as-is; TransactionType fields resolve straight off them
+        return cast(List[TransactionType], user_transactions)
\ No newline at end of file
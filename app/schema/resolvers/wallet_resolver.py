@@ -1,4 +1,5 @@
 import strawberry
+from typing import cast
 from schema.types.wallet_type import WalletType
 from services.wallet_service import WalletService # Import the WalletService
 from adapters import get_adapter # Import get_adapter
@@ -18,6 +19,5 @@ class Query:
         wallet_service = WalletService(adapter) # Instantiate the service
         # Pass the authenticated_user_id to the service method
         wallets = await wallet_service.get_wallets(authenticated_user_id) # Call the service method
-        # Map the list of Wallet models to WalletType
-        # Manually map the list of Wallet models to WalletType
-        return [WalletType(**wallet.model_dump()) for wallet in wallets]
\ No newline at end of file
+        # Wallet models are returned as-is; WalletType fields resolve straight off them
+        return cast(list[WalletType], wallets)
\ No newline at end of file
@@ -1,18 +1,9 @@
 import strawberry
-from typing import List, Optional
+from typing import List, Optional, cast
 from datetime import datetime # Import datetime
 from app.models.webhook import Webhook
-from app.services.webhook_service import WebhookService
-from app.adapters.mongodb_adapter import MongoDBAdapter # Assuming MongoDB is the chosen adapter
-from app.config import settings # Assuming settings contains DB connection info
-
-# Initialize the storage adapter and service
-# In a real application, this would likely be handled by a dependency injection system
-mongodb_adapter = MongoDBAdapter(
-    connection_string=settings.MONGODB_CONNECTION_STRING,
-    database_name=settings.MONGODB_DATABASE_NAME
-)
-webhook_service = WebhookService(storage_adapter=mongodb_adapter)
+from app.services.webhook_service import get_webhook_service # Shared with the event publisher; built on first use
+from schema.projection import selected_fields
 
 @strawberry.type
 class WebhookType:
@@ -47,18 +38,20 @@ class WebhookQuery:
     @strawberry.field
     async def webhook(self, id: str) -> Optional[WebhookType]:
         """Retrieve a single webhook by ID."""
-        webhook = await webhook_service.get_webhook(id)
-        return WebhookType(**webhook.model_dump()) if webhook else None
+        webhook = await get_webhook_service().get_webhook(id)
+        return cast(Optional[WebhookType], webhook)
 
     @strawberry.field
     async def webhooks(
         self,
+        info: strawberry.Info,
         event_type: Optional[str] = None,
         owner_id: Optional[str] = None
     ) -> List[WebhookType]:
         """List all webhooks, with optional filtering."""
-        webhooks = await webhook_service.list_webhooks(event_type, owner_id)
-        return [WebhookType(**wh.model_dump()) for wh in webhooks]
+        # Only the requested fields are read from storage
+        webhooks = await get_webhook_service().list_webhooks(event_type, owner_id, fields=selected_fields(info, Webhook))
+        return cast(List[WebhookType], webhooks)
 
 @strawberry.type
 class WebhookMutation:
@@ -75,34 +68,41 @@ class WebhookMutation:
             is_active=input.is_active,
             headers=None # Explicitly pass None for headers
         )
-        created_webhook = await webhook_service.create_webhook(new_webhook)
-        return WebhookType(**created_webhook.model_dump())
+        created_webhook = await get_webhook_service().create_webhook(new_webhook)
+        return cast(WebhookType, created_webhook)
 
     @strawberry.mutation
     async def update_webhook(self, input: UpdateWebhookInput) -> WebhookType:
         """Update an existing webhook subscription."""
         # Fetch existing webhook to apply partial updates
-        existing_webhook = await webhook_service.get_webhook(input.id)
+        existing_webhook = await get_webhook_service().get_webhook(input.id)
         if not existing_webhook:
             raise ValueError(f"Webhook with ID {input.id} not found.")
         
-        # Apply updates from input to the existing webhook model
-        if input.target_url is not None:
-            existing_webhook.target_url = input.target_url
-        if input.event_type is not None:
-            existing_webhook.event_type = input.event_type
-        if input.secret is not None:
-            existing_webhook.secret = input.secret
-        if input.owner_id is not None:
-            existing_webhook.owner_id = input.owner_id
-        if input.is_active is not None:
-            existing_webhook.is_active = input.is_active
-            
-        updated_webhook = await webhook_service.update_webhook(existing_webhook)
-        return WebhookType(**updated_webhook.model_dump())
+        # Collect the fields the input sets
+        changes = {
+            name: value
+            for name, value in (
+                ("target_url", input.target_url),
+                ("event_type", input.event_type),
+                ("secret", input.secret),
+                ("owner_id", input.owner_id),
+                ("is_active", input.is_active),
+            )
+            if value is not None
+        }
+        changes["updated_at"] = datetime.utcnow()
+        # Only the changed fields are marked as set, so the adapter writes just those ($set in MongoDB)
+        existing_webhook = Webhook.model_construct(
+            _fields_set={"id", *changes},
+            **{**existing_webhook.model_dump(), **changes},
+        )
+
+        updated_webhook = await get_webhook_service().update_webhook(existing_webhook)
+        return cast(WebhookType, updated_webhook)
 
     @strawberry.mutation
     async def delete_webhook(self, id: str) -> bool:
         """Delete a webhook subscription."""
-        await webhook_service.delete_webhook(id)
+        await get_webhook_service().delete_webhook(id)
         return True
\ No newline at end of file
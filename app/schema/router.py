@@ -0,0 +1,21 @@
+from fastapi import Response, status
+from strawberry.fastapi import GraphQLRouter
+
+from utils.serialization import json_dumps
+
+class CentralGraphQLRouter(GraphQLRouter):
+    """
+    GraphQLRouter that encodes responses with orjson and honours status codes
+    set by schema extensions on the sub-response.
+    """
+
+    def encode_json(self, data: object) -> bytes:
+        return json_dumps(data)
+
+    def create_response(self, response_data, sub_response: Response) -> Response:
+        if sub_response.status_code == status.HTTP_304_NOT_MODIFIED:
+            # Conditional request matched the ETag set by ResponseCacheExtension; send headers only
+            response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+            response.headers.raw.extend(sub_response.headers.raw)
+            return response
+        return super().create_response(response_data, sub_response)
@@ -0,0 +1,27 @@
+import strawberry
+from datetime import datetime
+from typing import List, Optional
+
+@strawberry.type
+class ResolverTimingType:
+    path: str # Response path without list indices, e.g. "listings.priceHistory"
+    calls: int
+    total_ms: float
+    max_ms: float
+
+@strawberry.type
+class AdapterCallCountType:
+    call: str # "<backend>.<operation>(<model>)", e.g. "mongodb.read(User)"
+    count: int
+
+@strawberry.type
+class SlowOperationType:
+    operation_name: Optional[str]
+    operation_type: Optional[str]
+    variables_hash: Optional[str] # Variables themselves are never kept
+    duration_ms: float
+    started_at: datetime
+    worker_pid: int
+    has_errors: bool
+    resolvers: List[ResolverTimingType]
+    adapter_calls: List[AdapterCallCountType]
@@ -1,7 +1,9 @@
 import strawberry
 from models.auction import Seller, ReputationSummary, BidHistoryEntry, PropertyDetails
+from schema.directives import CacheControl, CacheScope
 
-@strawberry.experimental.pydantic.type(model=Seller, all_fields=True)
+# Seller directory entries change rarely and are the same for every caller
+@strawberry.experimental.pydantic.type(model=Seller, all_fields=True, directives=[CacheControl(max_age=300, scope=CacheScope.PUBLIC)])
 class SellerType:
     pass
 
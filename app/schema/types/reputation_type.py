@@ -1,6 +1,8 @@
 import strawberry
 from models.reputation import Reputation # Import Reputation from the correct model file
+from schema.directives import CacheControl, CacheScope
 
-@strawberry.experimental.pydantic.type(model=Reputation, all_fields=True)
+# Leaderboard data is recalculated by a daily job; fields exposing a single user's entry override the scope to PRIVATE
+@strawberry.experimental.pydantic.type(model=Reputation, all_fields=True, directives=[CacheControl(max_age=60, scope=CacheScope.PUBLIC)])
 class ReputationType:
     pass
\ No newline at end of file
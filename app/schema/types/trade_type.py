@@ -3,6 +3,8 @@ from models.trade import PriceHistoryEntry, PropertyListing, OrderFormState, Can
 from typing import Optional # Import Optional
 from datetime import datetime # Import datetime
 import strawberry.federation as federation # Import strawberry.federation
+from strawberry.types import Info
+from schema.loaders import get_loader
 
 @strawberry.experimental.pydantic.type(model=PriceHistoryEntry, all_fields=True)
 class PriceHistoryEntryType:
@@ -26,25 +28,12 @@ class PropertyListingType:
     status: str
     price_history: Optional[list[PriceHistoryEntryType]]
 
-    # Add a placeholder resolve_reference class method
+    # Called by the gateway for each `_entities` representation; loads are batched per request
     @classmethod
-    def resolve_reference(cls, id: strawberry.ID):
-        # TODO: Implement logic to fetch a PropertyListing by ID
-        # This method is called by the gateway to resolve entity references
-        # For now, return a placeholder instance with required fields
-        return PropertyListing(
-            id=id,
-            user_id="placeholder_user_id", # Placeholder user_id
-            name="Placeholder Listing", # Placeholder name
-            address="Placeholder Address", # Placeholder address
-            image_url="placeholder.jpg", # Placeholder image_url
-            token_symbol="PLCH", # Placeholder token_symbol
-            current_price=0.0, # Placeholder current_price
-            price_unit="USD", # Placeholder price_unit
-            valuation=0.0, # Placeholder valuation
-            status="For Sale" # Placeholder status
-            # Add other required fields from PropertyListing if necessary with placeholder values
-        )
+    async def resolve_reference(cls, info: Info, id: strawberry.ID) -> Optional["PropertyListingType"]:
+        listing = await get_loader(info, PropertyListing).load(str(id))
+        # Marked rather than copied, so the _Entity union knows which type the model stands for
+        return strawberry.cast(cls, listing)
 
 
 @strawberry.experimental.pydantic.input(model=OrderFormState, all_fields=True)
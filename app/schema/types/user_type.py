@@ -1,36 +1,84 @@
 import strawberry
 from models.user import User
 import strawberry.federation as federation # Import strawberry.federation
-from typing import Optional # Import Optional
-from datetime import datetime # Import datetime for placeholder
+from typing import Optional, cast # Import Optional
+from strawberry.scalars import JSON
+from strawberry.types import Info
 from schema.types.reputation_type import ReputationType # Import ReputationType
+from schema.loaders import get_loader
+from adapters import get_adapter
+from services.reputation_service import ReputationService # Import ReputationService
+from services.seller_service import SellerService # Import SellerService
+from fastapi import Request, HTTPException # Import Request and HTTPException from fastapi
 
 @strawberry.experimental.pydantic.input(model=User, all_fields=True)
 class UserInput:
-    pass
+    # GraphQL cannot express these model annotations: a str | PhoneNumber union and a bare `object`
+    phone: str
+    user_metadata: JSON
+
+# Resolver for the 'reputation' field on UserType
+@strawberry.field
+async def resolve_reputation(self: "UserType", info: Info) -> Optional[ReputationType]:
+    request: Request = info.context["request"]
+    # Access the user ID from the UserType instance (self)
+    user_id = self.id
+
+    # Get the adapter and instantiate the ReputationService
+    adapter = get_adapter()
+    reputation_service = ReputationService(adapter)
+
+    # Fetch the user's reputation
+    # Assuming get_user_reputation in ReputationService takes authenticated_user_id and target_user_id
+    # For a field resolver, we might only need the target_user_id (self.id)
+    # Let's assume get_user_reputation can work with just the target_user_id if auth is handled elsewhere
+    # If authentication is needed here, we would use request.state.user_id
+    # Pass the authenticated user ID and the target user ID to the service method
+    authenticated_user_id = getattr(request.state, 'user_id', None) # Get authenticated user ID from request state
+    if authenticated_user_id is None:
+        raise HTTPException(status_code=403, detail="Authentication required to access reputation data")
+
+    reputation = await reputation_service.get_user_reputation(authenticated_user_id, str(user_id))
+
+    # The Reputation model is returned as-is; ReputationType fields resolve straight off it
+    return cast(Optional[ReputationType], reputation)
+
+# Resolver for the 'name' field on UserType (Seller name)
+@strawberry.field
+async def resolve_name(self: "UserType", info: Info) -> Optional[str]:
+    request: Request = info.context["request"]
+    user_id = self.id
+    adapter = get_adapter()
+    seller_service = SellerService(adapter)
+    # Assuming get_seller_by_user_id exists and returns a Seller model
+    seller = await seller_service.get_seller_by_user_id(str(user_id))
+    return seller.name if seller else None
+
+# Resolver for the 'verified' field on UserType (Seller verification status)
+@strawberry.field
+async def resolve_verified(self: "UserType", info: Info) -> Optional[bool]:
+    request: Request = info.context["request"]
+    user_id = self.id
+    adapter = get_adapter()
+    seller_service = SellerService(adapter)
+    # Assuming get_seller_by_user_id exists and returns a Seller model
+    seller = await seller_service.get_seller_by_user_id(str(user_id))
+    return seller.verified if seller else None
 
 @federation.type(keys=["id"]) # Use the federation.type decorator with keys
 class UserType:
     id: strawberry.ID # Explicitly define the ID field for direct access
 
-    # Add a placeholder resolve_reference class method
+    # Called by the gateway for each `_entities` representation; loads are batched per request
     @classmethod
-    def resolve_reference(cls, id: strawberry.ID):
-        # TODO: Implement logic to fetch a User by ID using the adapter
-        # This method is called by the gateway to resolve entity references
-        # For now, return a placeholder User instance with required fields
-        from models.user import User # Import User model
-
-        return User(
-            id=id,
-            user_id=id, # Assuming user_id is the same as id for simplicity in placeholder
-            role="user", # Placeholder role
-            created_at=datetime.now() # Placeholder creation time
-            # Add other required fields from Profile if necessary with placeholder values
-        )
-
-    reputation: Optional[ReputationType] # Add the reputation field
+    async def resolve_reference(cls, info: Info, id: strawberry.ID) -> Optional["UserType"]:
+        user = await get_loader(info, User).load(str(id))
+        if user is None:
+            return None
+        return cls(id=strawberry.ID(str(user.id))) # type: ignore
+
+    reputation: Optional[ReputationType] = resolve_reputation # Add the reputation field
 
     # Add Seller fields as extensions to UserType
-    name: Optional[str] # Seller name
-    verified: Optional[bool] # Seller verification status
\ No newline at end of file
+    name: Optional[str] = resolve_name # Seller name
+    verified: Optional[bool] = resolve_verified # Seller verification status
\ No newline at end of file
@@ -12,15 +12,10 @@ class AuctionService:
         Retrieves a list of bid history entries for the authenticated user using the configured adapter.
         """
         # Add any business logic related to fetching bid history here
-        # Use the generic list method to get all bid history entries (or a filtered list if adapter supports it)
-        all_bid_history = await self.adapter.list(BidHistoryEntry) # Call the adapter method with the model type
-        # Explicitly cast the result to the expected type for the type checker
-        all_bid_history = cast(List[BidHistoryEntry], all_bid_history)
-
-        # Filter bid history entries to only include those belonging to the authenticated user
+        # Stream only the authenticated user's entries; backends push the filter down where they can
         user_bid_history = [
-            entry for entry in all_bid_history
-            if entry.bidder == authenticated_user_id # Assuming bidder field matches user ID
+            cast(BidHistoryEntry, entry)
+            async for entry in self.adapter.iter(BidHistoryEntry, {"bidder": authenticated_user_id}) # Assuming bidder field matches user ID
         ]
 
         return user_bid_history
\ No newline at end of file
@@ -0,0 +1,81 @@
+import csv
+import io
+import zlib
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
+
+from pydantic import BaseModel
+
+from adapters.base import AbstractStorageAdapter
+from models.auction import BidHistoryEntry
+from models.snft import Transaction
+from models.trade import PropertyListing
+from utils.serialization import json_dumps
+
+# Dataset name in the URL -> stored model
+EXPORT_DATASETS: Dict[str, Type[BaseModel]] = {
+    "listings": PropertyListing,
+    "transactions": Transaction,
+    "bid_history": BidHistoryEntry,
+}
+
+DEFAULT_BATCH_SIZE = 500
+CHUNK_BYTES = 64 * 1024 # Rows are coalesced into chunks of about this size before being sent
+
+class ExportService:
+    """
+    Streams whole tables out of the storage adapters in constant memory.
+
+    Records come from `adapter.iter`, which fetches them in batches (a Mongo
+    cursor, Firestore pages, keyset pages over PostgREST, Redis SCAN), and are
+    encoded one at a time; nothing is materialized as lists or GraphQL types.
+    CachingAdapter.iter reads the primary store, so exports never fill the cache.
+    """
+
+    def __init__(self, adapter: AbstractStorageAdapter, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.adapter = adapter
+        self.batch_size = batch_size
+
+    async def rows(self, model_type: Type[BaseModel], filters: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yields every stored record of `model_type` (optionally matching `filters`) as a dict of its fields."""
+        async for record in self.adapter.iter(model_type, filters, self.batch_size):
+            yield record.model_dump()
+
+async def encode_ndjson(rows: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    async for row in rows:
+        yield json_dumps(row) + b"\n"
+
+async def encode_csv(rows: AsyncIterator[Dict[str, Any]], fields: List[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    async for row in rows:
+        # Nested values (e.g. price_history) are written as JSON inside the cell
+        writer.writerow([
+            json_dumps(value).decode("utf-8") if isinstance(value, (list, dict)) else value
+            for value in (row.get(name) for name in fields)
+        ])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+async def coalesce(chunks: AsyncIterator[bytes], size: int = CHUNK_BYTES) -> AsyncIterator[bytes]:
+    """Groups small per-row chunks into larger writes."""
+    pending: List[bytes] = []
+    pending_size = 0
+    async for chunk in chunks:
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= size:
+            yield b"".join(pending)
+            pending, pending_size = [], 0
+    if pending:
+        yield b"".join(pending)
+
+async def gzip_stream(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """Compresses a byte stream incrementally into a single gzip member."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31) # wbits=31 -> gzip container
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
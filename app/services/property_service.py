@@ -12,15 +12,10 @@ class PropertyService:
         Retrieves a list of property marketplace items for the authenticated user using the configured adapter.
         """
         # Add any business logic related to fetching marketplace items here
-        # Use the generic list method to get all marketplace items (or a filtered list if adapter supports it)
-        all_marketplace_items = await self.adapter.list(PropertyMarketplaceItem) # Call the adapter method with the model type
-        # Explicitly cast the result to the expected type for the type checker
-        all_marketplace_items = cast(List[PropertyMarketplaceItem], all_marketplace_items)
-
-        # Filter marketplace items to only include those belonging to the authenticated user
+        # Stream only the authenticated user's items; backends push the filter down where they can
         user_marketplace_items = [
-            item for item in all_marketplace_items
-            if item.user_id == authenticated_user_id # Filter by user_id
+            cast(PropertyMarketplaceItem, item)
+            async for item in self.adapter.iter(PropertyMarketplaceItem, {"user_id": authenticated_user_id})
         ]
 
         return user_marketplace_items
@@ -30,15 +25,10 @@ class PropertyService:
         Retrieves a list of property collections for the authenticated user using the configured adapter.
         """
         # Add any business logic related to fetching collections here
-        # Use the generic list method to get all collections (or a filtered list if adapter supports it)
-        all_collections = await self.adapter.list(CollectionItem) # Call the adapter method with the model type
-        # Explicitly cast the result to the expected type for the type checker
-        all_collections = cast(List[CollectionItem], all_collections)
-
-        # Filter collections to only include those belonging to the authenticated user
+        # Stream only the authenticated user's collections; backends push the filter down where they can
         user_collections = [
-            collection for collection in all_collections
-            if collection.user_id == authenticated_user_id # Filter by user_id
+            cast(CollectionItem, collection)
+            async for collection in self.adapter.iter(CollectionItem, {"user_id": authenticated_user_id})
         ]
 
         return user_collections
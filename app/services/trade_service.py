@@ -14,15 +14,10 @@ class TradeService:
         Retrieves a list of property listings for the authenticated user using the configured adapter.
         """
         # Add any business logic related to fetching listings here
-        # Use the generic list method to get all listings (or a filtered list if adapter supports it)
-        all_listings = await self.adapter.list(PropertyListing) # Call the adapter method with the model type
-        # Explicitly cast the result to the expected type for the type checker
-        all_listings = cast(List[PropertyListing], all_listings)
-
-        # Filter listings to only include those belonging to the authenticated user
+        # Stream only the authenticated user's listings; backends push the filter down where they can
         user_listings = [
-            listing for listing in all_listings
-            if listing.user_id == authenticated_user_id # Filter by user_id
+            cast(PropertyListing, listing)
+            async for listing in self.adapter.iter(PropertyListing, {"user_id": authenticated_user_id})
         ]
 
         return user_listings
@@ -1,10 +1,45 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, cast
 from app.models.webhook import Webhook
-from app.adapters.base import AbstractStorageAdapter # Assuming base adapter is used
+from adapters.base import AbstractStorageAdapter # Bare path: app.adapters.* would load the adapters package a second time
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+WEBHOOKS_TOPIC = "webhooks" # Coordinator topic broadcast after every webhook write
 
 class WebhookService:
     def __init__(self, storage_adapter: AbstractStorageAdapter):
         self.storage_adapter = storage_adapter
+        # Active webhooks by event type, answering the event publisher's lookups without a query per event.
+        # None until load_index() succeeds, and after a failed reload: lookups then query the store.
+        self._index: Optional[Dict[str, List[Webhook]]] = None
+        self._coordinator: Any = None
+
+    def use_coordinator(self, coordinator: Any) -> None:
+        """Reloads the index when any worker writes a webhook, and tells the other workers about writes here."""
+        coordinator.on(WEBHOOKS_TOPIC, self._on_webhooks_changed)
+        self._coordinator = coordinator
+
+    async def load_index(self) -> None:
+        """Loads every active webhook into the per-event-type index."""
+        index: Dict[str, List[Webhook]] = {}
+        try:
+            async for webhook in self.storage_adapter.iter(Webhook, {"is_active": True}):
+                index.setdefault(webhook.event_type, []).append(cast(Webhook, webhook))
+        except Exception as e:
+            self._index = None
+            logger.error(f"[Webhooks] Failed to load the webhook index, querying per event until the next reload: {e}")
+            return
+        self._index = index
+
+    async def _on_webhooks_changed(self, _payload: Any) -> None:
+        await self.load_index()
+
+    async def _changed(self) -> None:
+        if self._coordinator is not None:
+            await self._coordinator.broadcast(WEBHOOKS_TOPIC)
+        elif self._index is not None:
+            await self.load_index()
 
     async def create_webhook(
         self,
@@ -15,6 +50,7 @@ class WebhookService:
         # For now, assuming the webhook object passed already has an ID (e.g., UUID)
         # and a securely generated secret.
         created_webhook = await self.storage_adapter.create(webhook)
+        await self._changed()
         return Webhook.model_validate(created_webhook.model_dump())
 
     async def get_webhook(self, webhook_id: str) -> Optional[Webhook]:
@@ -25,21 +61,30 @@ class WebhookService:
     async def list_webhooks(
         self,
         event_type: Optional[str] = None,
-        owner_id: Optional[str] = None
+        owner_id: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        fields: Optional[List[str]] = None
     ) -> List[Webhook]:
-        """Lists webhooks, optionally filtered by event type or owner ID."""
-        # This method would need to be enhanced in the adapter to support filtering
-        # For now, it lists all and filters in memory (not efficient for large datasets)
-        all_webhooks_base = await self.storage_adapter.list(Webhook)
-        all_webhooks = [Webhook.model_validate(wh.model_dump()) for wh in all_webhooks_base]
-        
-        filtered_webhooks = []
-        for webhook in all_webhooks:
-            match_event = (event_type is None) or (webhook.event_type == event_type)
-            match_owner = (owner_id is None) or (webhook.owner_id == owner_id)
-            if match_event and match_owner:
-                filtered_webhooks.append(webhook)
-        return filtered_webhooks
+        """
+        Lists webhooks, optionally filtered by event type, owner ID or active flag.
+        Filters are pushed down to the adapter (and its indexes); with `fields`, only
+        those fields are fetched and the webhooks returned are partial. The event
+        publisher's lookup (active webhooks for one event type) is served from the
+        index once loaded.
+        """
+        if self._index is not None and event_type is not None and is_active is True and owner_id is None and fields is None:
+            return list(self._index.get(event_type, []))
+        filters: Dict[str, Any] = {}
+        if event_type is not None:
+            filters["event_type"] = event_type
+        if owner_id is not None:
+            filters["owner_id"] = owner_id
+        if is_active is not None:
+            filters["is_active"] = is_active
+        return [
+            cast(Webhook, webhook)
+            async for webhook in self.storage_adapter.iter(Webhook, filters, fields=fields)
+        ]
 
     async def update_webhook(self, webhook: Webhook) -> Webhook:
         """Updates an existing webhook subscription."""
@@ -48,8 +93,32 @@ class WebhookService:
         if not existing_webhook:
             raise ValueError(f"Webhook with ID {webhook.id} not found.")
         updated_webhook = await self.storage_adapter.update(webhook)
+        await self._changed()
         return Webhook.model_validate(updated_webhook.model_dump())
 
     async def delete_webhook(self, webhook_id: str) -> None:
         """Deletes a webhook subscription by its ID."""
-        await self.storage_adapter.delete(Webhook, webhook_id)
\ No newline at end of file
+        await self.storage_adapter.delete(Webhook, webhook_id)
+        await self._changed()
+
+_webhook_service: Optional[WebhookService] = None
+
+def get_webhook_service() -> WebhookService:
+    """
+    The process-wide service over the MongoDB webhook store, shared by the
+    webhook resolvers and the event publisher. Built on first call.
+    """
+    global _webhook_service
+    if _webhook_service is None:
+        from adapters.instrumented import InstrumentedAdapter
+        from adapters.mongodb_adapter import MongoDBAdapter
+        from app.config import settings
+        from utils.connections import get_connection_manager
+
+        mongodb_adapter = MongoDBAdapter(
+            connection_string=settings.MONGODB_CONNECTION_STRING,
+            database_name=settings.MONGODB_DATABASE_NAME,
+            connections=get_connection_manager(), # Shares the storage adapter's client when both use MongoDB
+        )
+        _webhook_service = WebhookService(storage_adapter=InstrumentedAdapter(mongodb_adapter, "mongodb"))
+    return _webhook_service
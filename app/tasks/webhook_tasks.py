@@ -1,19 +1,46 @@
 import httpx # Using httpx for synchronous HTTP requests in Celery task
 import hmac
 import hashlib
-import json
 from celery import Celery
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+from opentelemetry.trace import SpanKind
+from app.config import settings
+from app.utils.serialization import json_dumps
+from app.utils.tracing import configure_tracing, extract_context, inject_context, tracer
+from app.utils.workers import pool_share
 
-# Initialize Celery app
-# This should ideally use configuration from app/config.py
-# For simplicity, hardcoding a Redis broker URL for now.
-# In a real setup, you'd pass the broker URL from settings.
+# Broker and result backend come from settings (by default databases 1 and 2 of the app's Redis server).
+# Each process publishing tasks keeps at most its share of the broker connection budget.
+_broker_connections = pool_share(settings.CELERY_BROKER_MAX_CONNECTIONS, settings.WORKERS or 1)
 celery_app = Celery(
     'webhook_tasks',
-    broker='redis://localhost:6379/1', # Use a different DB than the main app's Redis if possible
-    backend='redis://localhost:6379/2' # Use a different DB for results
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
 )
+celery_app.conf.update(
+    broker_pool_limit=_broker_connections,
+    broker_transport_options={
+        "max_connections": _broker_connections,
+        "health_check_interval": settings.CONNECTION_PING_SECONDS, # PING connections idle this long before reuse
+    },
+    redis_max_connections=_broker_connections, # Result backend
+    redis_backend_health_check_interval=settings.CONNECTION_PING_SECONDS,
+)
+configure_tracing() # Worker processes export their own spans
+
+def sign_payload(payload: Dict[str, Any], secret: str) -> Tuple[bytes, str]:
+    """Encodes `payload` once and signs exactly those bytes, so receivers can verify the raw body."""
+    body = json_dumps(payload, sort_keys=True)
+    return body, hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+
+def _trace_parent(request: Any) -> Any:
+    """Publisher's trace context, sent as message headers by EventPublisher."""
+    carrier = dict(getattr(request, "headers", None) or {})
+    for key in ("traceparent", "tracestate"):
+        value = getattr(request, key, None) # Celery exposes custom headers as request attributes
+        if value:
+            carrier[key] = value
+    return extract_context(carrier)
 
 @celery_app.task(bind=True, max_retries=5, default_retry_delay=60)
 def send_webhook_task(self, target_url: str, payload: Dict[str, Any], secret: str, headers: Optional[Dict[str, Any]] = None):
@@ -21,45 +48,48 @@ def send_webhook_task(self, target_url: str, payload: Dict[str, Any], secret: st
     Celery task to send a webhook payload to the target URL.
     Includes retry logic.
     """
-    try:
-        # Sign the payload
-        signature = hmac.new(
-            secret.encode('utf-8'),
-            json.dumps(payload, sort_keys=True).encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
+    with tracer.start_as_current_span(
+        "webhook.deliver",
+        context=_trace_parent(self.request),
+        kind=SpanKind.CLIENT,
+        attributes={"http.url": target_url, "event.type": str(payload.get("event_type"))},
+    ) as span:
+        try:
+            body, signature = sign_payload(payload, secret)
 
-        if headers is None:
-            headers = {}
-        headers['X-Webhook-Signature'] = signature
-        headers['Content-Type'] = 'application/json'
+            if headers is None:
+                headers = {}
+            headers['X-Webhook-Signature'] = signature
+            headers['Content-Type'] = 'application/json'
 
-        # Use httpx for making the HTTP request
-        response = httpx.post(target_url, json=payload, headers=headers, timeout=10)
-        response.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
-        print(f"Celery: Webhook successfully sent to {target_url}. Status: {response.status_code}")
+            # Use httpx for making the HTTP request
+            inject_context(headers) # Lets the receiver continue the trace
+            response = httpx.post(target_url, content=body, headers=headers, timeout=10)
+            span.set_attribute("http.status_code", response.status_code)
+            response.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
+            print(f"Celery: Webhook successfully sent to {target_url}. Status: {response.status_code}")
 
-    except httpx.RequestError as exc:
-        print(f"Celery: Request error while sending webhook to {target_url}: {exc}")
-        try:
-            self.retry(exc=exc)
-        except Exception as retry_exc:
-            print(f"Celery: Max retries exceeded for {target_url}. Final error: {retry_exc}")
-    except httpx.HTTPStatusError as exc:
-        print(f"Celery: HTTP error {exc.response.status_code} while sending webhook to {target_url}: {exc}")
-        if 400 <= exc.response.status_code < 500:
-            # Client error, usually no point in retrying (e.g., bad URL)
-            print(f"Celery: Not retrying client error for {target_url}.")
-        else:
-            # Server error, retry
+        except httpx.RequestError as exc:
+            print(f"Celery: Request error while sending webhook to {target_url}: {exc}")
             try:
                 self.retry(exc=exc)
             except Exception as retry_exc:
                 print(f"Celery: Max retries exceeded for {target_url}. Final error: {retry_exc}")
-    except Exception as e:
-        print(f"Celery: An unexpected error occurred while sending webhook to {target_url}: {e}")
-        # For unexpected errors, also consider retrying
-        try:
-            self.retry(exc=e)
-        except Exception as retry_exc:
-            print(f"Celery: Max retries exceeded for {target_url}. Final error: {retry_exc}")
\ No newline at end of file
+        except httpx.HTTPStatusError as exc:
+            print(f"Celery: HTTP error {exc.response.status_code} while sending webhook to {target_url}: {exc}")
+            if 400 <= exc.response.status_code < 500:
+                # Client error, usually no point in retrying (e.g., bad URL)
+                print(f"Celery: Not retrying client error for {target_url}.")
+            else:
+                # Server error, retry
+                try:
+                    self.retry(exc=exc)
+                except Exception as retry_exc:
+                    print(f"Celery: Max retries exceeded for {target_url}. Final error: {retry_exc}")
+        except Exception as e:
+            print(f"Celery: An unexpected error occurred while sending webhook to {target_url}: {e}")
+            # For unexpected errors, also consider retrying
+            try:
+                self.retry(exc=e)
+            except Exception as retry_exc:
+                print(f"Celery: Max retries exceeded for {target_url}. Final error: {retry_exc}")
\ No newline at end of file
@@ -0,0 +1,331 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import redis.asyncio as redis
+from pymongo import monitoring
+from redis.asyncio.connection import BlockingConnectionPool, parse_url
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from utils.logger import get_logger
+from utils.metrics import BACKEND_PING, BACKEND_UP, POOL_IN_USE, POOL_MAX, POOL_TIMEOUTS, POOL_WAIT, POOL_WAITING
+
+logger = get_logger(__name__)
+
+Ping = Callable[[], Awaitable[Any]]
+
+class MeteredRedisPool(BlockingConnectionPool):
+    """
+    Once `max_connections` are checked out, callers wait up to `timeout` seconds
+    for one to be released (then fail with ConnectionError) instead of opening
+    more sockets. Reports saturation under the pool's `name` and remembers when
+    each connection went idle, for close_idle().
+    """
+
+    def __init__(self, name: str, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.name = name
+        self._in_use = POOL_IN_USE.labels(name)
+        self._waiting = POOL_WAITING.labels(name)
+        self._wait = POOL_WAIT.labels(name)
+        POOL_MAX.labels(name).set(self.max_connections)
+
+    async def get_connection(self, *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        self._waiting.inc()
+        try:
+            connection = await super().get_connection(*args, **kwargs)
+        except RedisConnectionError as e:
+            if isinstance(e.__cause__, asyncio.TimeoutError): # Timed out waiting, as opposed to failing to connect
+                POOL_TIMEOUTS.labels(self.name).inc()
+            raise
+        finally:
+            self._waiting.dec()
+        self._wait.observe(time.perf_counter() - started)
+        self._in_use.set(len(self._in_use_connections))
+        return connection
+
+    async def release(self, connection: Any) -> None:
+        connection.idle_since = time.monotonic()
+        await super().release(connection)
+        self._in_use.set(len(self._in_use_connections))
+
+    async def close_idle(self, max_idle: float) -> int:
+        """Disconnects pooled connections idle for over `max_idle` seconds; they reconnect on their next use."""
+        cutoff = time.monotonic() - max_idle
+        closed = 0
+        async with self._condition: # No connection is handed out while we disconnect
+            for connection in list(self._available_connections):
+                if connection.is_connected and getattr(connection, "idle_since", cutoff) < cutoff:
+                    await connection.disconnect()
+                    closed += 1
+        return closed
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """Reports a Motor client's pool saturation from pymongo's connection pool events (called on pymongo's threads)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_use = POOL_IN_USE.labels(name)
+        self._waiting = POOL_WAITING.labels(name)
+        self._wait = POOL_WAIT.labels(name)
+
+    def connection_check_out_started(self, event: Any) -> None:
+        self._waiting.inc()
+
+    def connection_checked_out(self, event: Any) -> None:
+        self._waiting.dec()
+        self._in_use.inc()
+        if getattr(event, "duration", None) is not None:
+            self._wait.observe(event.duration)
+
+    def connection_check_out_failed(self, event: Any) -> None:
+        self._waiting.dec()
+        if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+            POOL_TIMEOUTS.labels(self.name).inc()
+
+    def connection_checked_in(self, event: Any) -> None:
+        self._in_use.dec()
+
+    def pool_cleared(self, event: Any) -> None:
+        pass
+
+    def pool_created(self, event: Any) -> None:
+        pass
+
+    def pool_ready(self, event: Any) -> None:
+        pass
+
+    def pool_closed(self, event: Any) -> None:
+        pass
+
+    def connection_created(self, event: Any) -> None:
+        pass
+
+    def connection_ready(self, event: Any) -> None:
+        pass
+
+    def connection_closed(self, event: Any) -> None:
+        pass
+
+class ConnectionManager:
+    """
+    Owns this process's backend clients, so adapters, services and tasks share
+    one bounded pool per backend rather than building clients (and sockets) of
+    their own. Clients are built on first request, never at import, so nothing
+    is connected before the multi-worker launcher forks.
+
+    Pools are capped per process; when one is exhausted, callers queue for up to
+    the backend's pool timeout instead of opening more connections. While
+    started, a background loop pings every backend in use (backend_up and
+    backend_ping_seconds metrics) and closes Redis connections idle for longer
+    than the idle timeout (Mongo and Supabase close their own).
+    """
+
+    def __init__(
+        self,
+        redis_host: str = "localhost",
+        redis_port: int = 6379,
+        redis_db: int = 0,
+        redis_max_connections: int = 64,
+        redis_pool_timeout: float = 2.0,
+        redis_idle_timeout: float = 300.0,
+        redis_socket_timeout: Optional[float] = 2.0, # Per command; a hung server fails the call instead of stalling it
+        redis_connect_timeout: Optional[float] = 2.0,
+        mongodb_max_pool_size: int = 50,
+        mongodb_pool_timeout: float = 2.0,
+        mongodb_idle_timeout: float = 300.0,
+        supabase_url: Optional[str] = None,
+        supabase_key: Optional[str] = None,
+        supabase_max_connections: int = 20,
+        supabase_pool_timeout: float = 2.0,
+        supabase_idle_timeout: float = 60.0,
+        ping_interval: float = 15.0,
+        ping_timeout: float = 2.0,
+    ):
+        self.redis_host = redis_host
+        self.redis_port = redis_port
+        self.redis_db = redis_db
+        self.redis_max_connections = redis_max_connections
+        self.redis_pool_timeout = redis_pool_timeout
+        self.redis_idle_timeout = redis_idle_timeout
+        self.redis_socket_timeout = redis_socket_timeout
+        self.redis_connect_timeout = redis_connect_timeout
+        self.mongodb_max_pool_size = mongodb_max_pool_size
+        self.mongodb_pool_timeout = mongodb_pool_timeout
+        self.mongodb_idle_timeout = mongodb_idle_timeout
+        self.supabase_url = supabase_url
+        self.supabase_key = supabase_key
+        self.supabase_max_connections = supabase_max_connections
+        self.supabase_pool_timeout = supabase_pool_timeout
+        self.supabase_idle_timeout = supabase_idle_timeout
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+
+        self._redis: Dict[Tuple[str, int], Any] = {} # (url or host:port, db) -> client
+        self._redis_pools: Dict[str, MeteredRedisPool] = {}
+        self._mongo: Dict[str, Any] = {} # connection string -> Motor client
+        self._supabase: Any = None
+        self._firestore: Any = None
+        self._pings: Dict[str, Ping] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def redis(self, db: Optional[int] = None) -> Any:
+        """The shared client for `db` (default: the configured REDIS_DB) on the configured server."""
+        db = self.redis_db if db is None else db
+        key = (f"{self.redis_host}:{self.redis_port}", db)
+        if key not in self._redis:
+            name = "redis" if db == self.redis_db else f"redis/{db}"
+            pool = self._redis_pool(name, host=self.redis_host, port=self.redis_port, db=db)
+            self._redis[key] = redis.Redis(host=self.redis_host, port=self.redis_port, db=db, decode_responses=True, connection_pool=pool)
+            self.watch(name, self._redis[key].ping)
+        return self._redis[key]
+
+    def redis_url(self, name: str, url: str, max_connections: int = 2) -> Any:
+        """A small shared client for another Redis server (e.g. the Celery broker), reported as `name`."""
+        key = (url, -1)
+        if key not in self._redis:
+            pool = self._redis_pool(name, max_connections=max_connections, **parse_url(url))
+            self._redis[key] = redis.Redis(connection_pool=pool, decode_responses=True)
+            self.watch(name, self._redis[key].ping)
+        return self._redis[key]
+
+    def _redis_pool(self, name: str, max_connections: Optional[int] = None, **connection_kwargs: Any) -> MeteredRedisPool:
+        pool = MeteredRedisPool(
+            name,
+            max_connections=max_connections or self.redis_max_connections,
+            timeout=self.redis_pool_timeout,
+            socket_timeout=self.redis_socket_timeout,
+            socket_connect_timeout=self.redis_connect_timeout,
+            decode_responses=True,
+            **connection_kwargs,
+        )
+        self._redis_pools[name] = pool
+        return pool
+
+    def mongo(self, connection_string: str) -> Any:
+        """The shared Motor client for `connection_string`."""
+        client = self._mongo.get(connection_string)
+        if client is None:
+            import motor.motor_asyncio
+
+            client = self._mongo[connection_string] = motor.motor_asyncio.AsyncIOMotorClient(
+                connection_string,
+                maxPoolSize=self.mongodb_max_pool_size,
+                maxIdleTimeMS=int(self.mongodb_idle_timeout * 1000),
+                waitQueueTimeoutMS=int(self.mongodb_pool_timeout * 1000), # Queued check-outs fail after this
+                event_listeners=[MongoPoolMetrics("mongodb")],
+            )
+            POOL_MAX.labels("mongodb").set(self.mongodb_max_pool_size)
+            self.watch("mongodb", lambda: client.admin.command("ping"))
+        return client
+
+    def supabase(self) -> Any:
+        """The shared Supabase client, over one bounded HTTP connection pool."""
+        if self._supabase is None:
+            import httpx
+            from supabase import ClientOptions, create_client
+
+            http = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=self.supabase_max_connections,
+                    max_keepalive_connections=self.supabase_max_connections,
+                    keepalive_expiry=self.supabase_idle_timeout,
+                ),
+                timeout=httpx.Timeout(120.0, pool=self.supabase_pool_timeout), # Raises PoolTimeout after queueing this long
+            )
+            self._supabase = create_client(self.supabase_url, self.supabase_key, options=ClientOptions(httpx_client=http))
+            POOL_MAX.labels("supabase").set(self.supabase_max_connections)
+            headers = {"apikey": self.supabase_key or ""}
+            self.watch("supabase", lambda: asyncio.to_thread(lambda: http.get(f"{self.supabase_url}/auth/v1/health", headers=headers).raise_for_status()))
+        return self._supabase
+
+    def firestore(self) -> Any:
+        """The shared Firestore client (one gRPC channel). Project and credentials come from the environment."""
+        if self._firestore is None:
+            from google.cloud.firestore_v1 import AsyncClient
+
+            self._firestore = AsyncClient()
+        return self._firestore
+
+    def watch(self, backend: str, ping: Ping) -> None:
+        """Adds `ping` to the liveness checks, reported as `backend`."""
+        self._pings[backend] = ping
+
+    async def check(self) -> Dict[str, bool]:
+        """Pings every backend in use and closes idle Redis connections. Returns {backend: up}."""
+        results = dict(zip(self._pings, await asyncio.gather(*(self._ping(name, ping) for name, ping in self._pings.items()))))
+        for pool in self._redis_pools.values():
+            closed = await pool.close_idle(self.redis_idle_timeout)
+            if closed:
+                logger.debug(f"[Connections] Closed {closed} idle connections in {pool.name}")
+        return results
+
+    async def _ping(self, backend: str, ping: Ping) -> bool:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(ping(), self.ping_timeout)
+        except Exception as e:
+            BACKEND_UP.labels(backend).set(0)
+            logger.warning(f"[Connections] {backend} liveness ping failed: {e!r}")
+            return False
+        BACKEND_UP.labels(backend).set(1)
+        BACKEND_PING.labels(backend).set(time.perf_counter() - started)
+        return True
+
+    async def _check_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"[Connections] Health check failed: {e}")
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._check_loop())
+
+    async def stop(self) -> None:
+        """Stops the checks and closes every pooled connection."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for pool in self._redis_pools.values():
+            await pool.disconnect()
+        for client in self._mongo.values():
+            client.close()
+
+_connection_manager: Optional[ConnectionManager] = None
+
+def get_connection_manager() -> ConnectionManager:
+    """The process-wide manager, configured from settings with each pool's share of the deployment budget."""
+    global _connection_manager
+    if _connection_manager is None:
+        from config import settings
+        from utils.workers import pool_share
+
+        workers = settings.WORKERS or 1 # Resolved and exported by the launcher
+        _connection_manager = ConnectionManager(
+            redis_host=settings.REDIS_HOST,
+            redis_port=settings.REDIS_PORT,
+            redis_db=settings.REDIS_DB,
+            redis_max_connections=pool_share(settings.REDIS_MAX_CONNECTIONS, workers),
+            redis_pool_timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+            redis_idle_timeout=settings.REDIS_IDLE_TIMEOUT_SECONDS,
+            redis_socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            redis_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+            mongodb_max_pool_size=pool_share(settings.MONGODB_MAX_POOL_SIZE, workers),
+            mongodb_pool_timeout=settings.MONGODB_POOL_TIMEOUT_SECONDS,
+            mongodb_idle_timeout=settings.MONGODB_IDLE_TIMEOUT_SECONDS,
+            supabase_url=settings.SUPABASE_URL,
+            supabase_key=settings.SUPABASE_KEY,
+            supabase_max_connections=pool_share(settings.SUPABASE_MAX_CONNECTIONS, workers),
+            supabase_pool_timeout=settings.SUPABASE_POOL_TIMEOUT_SECONDS,
+            supabase_idle_timeout=settings.SUPABASE_IDLE_TIMEOUT_SECONDS,
+            ping_interval=settings.CONNECTION_PING_SECONDS,
+        )
+    return _connection_manager
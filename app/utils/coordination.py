@@ -0,0 +1,143 @@
+import asyncio
+import os
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from utils.logger import get_logger
+from utils.serialization import json_dumps, json_loads
+
+logger = get_logger(__name__)
+
+COORDINATION_CHANNEL = "coordination"
+
+# Called with the broadcast payload, or None after a reconnect (messages may have been missed: reload everything)
+Handler = Callable[[Optional[Any]], Awaitable[None]]
+
+class Coordinator:
+    """
+    Cross-worker messaging over Redis pub/sub, with one subscription (one
+    connection) per worker however many WebSockets or local caches it serves.
+
+    `broadcast(topic, payload)` runs the topic's handlers in this worker, then
+    in every other one: process-local state derived from the database (e.g. the
+    webhook index) registers a handler with `on` and is broadcast after writes.
+    `listen(channel)` returns a queue receiving every message published on one
+    of the `fanout_channels`, e.g. real-time events for a WebSocket.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        fanout_channels: Iterable[str] = (),
+        channel: str = COORDINATION_CHANNEL,
+        reconnect_delay: float = 1.0,
+        ready_timeout: float = 5.0,
+    ):
+        self.redis_client = redis_client
+        self.channel = channel
+        self.fanout_channels = tuple(fanout_channels)
+        self.reconnect_delay = reconnect_delay
+        self.ready_timeout = ready_timeout
+        self.origin = "" # Set per worker on start; instances created before a fork would otherwise share it
+
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._listeners: Dict[str, Set[asyncio.Queue]] = {channel: set() for channel in self.fanout_channels}
+        self._subscribed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def on(self, topic: str, handler: Handler) -> None:
+        self._handlers.setdefault(topic, []).append(handler)
+
+    async def broadcast(self, topic: str, payload: Any = None) -> None:
+        """Runs the handlers for `topic` here, then publishes so the other workers run theirs."""
+        await self._run(topic, payload)
+        try:
+            await self.redis_client.publish(self.channel, json_dumps({"topic": topic, "payload": payload, "origin": self.origin}))
+        except Exception as e:
+            logger.error(f"[Coordinator] Failed to broadcast '{topic}': {e}")
+
+    def listen(self, channel: str, max_queued: int = 100) -> asyncio.Queue:
+        """A queue of the messages published on `channel`. The oldest are dropped when a consumer falls `max_queued` behind."""
+        if channel not in self._listeners:
+            raise ValueError(f"'{channel}' is not a fan-out channel of this coordinator")
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self._listeners[channel].add(queue)
+        return queue
+
+    def unlisten(self, channel: str, queue: asyncio.Queue) -> None:
+        self._listeners.get(channel, set()).discard(queue)
+
+    async def _run(self, topic: str, payload: Any) -> None:
+        for handler in self._handlers.get(topic, []):
+            try:
+                await handler(payload)
+            except Exception as e:
+                logger.error(f"[Coordinator] Handler for '{topic}' failed: {e}")
+
+    def _fan_out(self, channel: str, data: str) -> None:
+        for queue in self._listeners.get(channel, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(data)
+
+    async def _dispatch(self, channel: Any, data: Any) -> None:
+        channel = channel.decode("utf-8") if isinstance(channel, bytes) else channel
+        if channel != self.channel:
+            self._fan_out(channel, data.decode("utf-8") if isinstance(data, bytes) else data)
+            return
+        message = json_loads(data)
+        if message.get("origin") != self.origin: # Our own broadcasts already ran their handlers
+            await self._run(message["topic"], message.get("payload"))
+
+    async def _listen(self) -> None:
+        missed = False # Whether broadcasts may have been published while we were not subscribed
+        while not self._stopping:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel, *self.fanout_channels)
+                self._subscribed.set()
+                if missed:
+                    logger.info("[Coordinator] Resubscribed; reloading coordinated state")
+                    for topic in list(self._handlers):
+                        await self._run(topic, None)
+                    missed = False
+                while not self._stopping: # Also checked because get_message can swallow a cancel that races a message
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None:
+                        await self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._subscribed.clear()
+                missed = True
+                logger.error(f"[Coordinator] Subscription lost, retrying in {self.reconnect_delay}s: {e}")
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def start(self) -> None:
+        """Subscribes in the background. Waits up to `ready_timeout` for the subscription, but never fails startup."""
+        if self._task is not None:
+            return
+        self.origin = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stopping = False
+        self._task = asyncio.create_task(self._listen())
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), self.ready_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("[Coordinator] Not subscribed yet; cross-worker updates are delayed until Redis is reachable")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._stopping = True
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._subscribed.clear()
@@ -1,11 +1,11 @@
-import json
 import hmac
 import hashlib
 import asyncio
 from datetime import datetime
 from typing import Any, Dict, Optional
-from app.tasks.webhook_tasks import celery_app # Import the Celery app instance
 from app.config import settings # Import settings for Celery broker/backend
+from app.utils.serialization import json_dumps
+from app.utils.tracing import TRACE_CARRIER_KEY, inject_context, tracer
 
 # Assuming these will be configured globally or passed via dependency injection
 WEBHOOK_SECRET_KEY = "your_super_secret_webhook_key" # This should be a strong, securely generated key
@@ -22,28 +22,37 @@ class EventPublisher:
         If is_realtime is True, publishes to WebSocket (Redis Pub/Sub).
         Always dispatches to HTTP webhooks if subscribed.
         """
-        event_data = {
-            "event_type": event_type,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "data": payload
-        }
+        with tracer.start_as_current_span("event.publish", attributes={"event.type": event_type}):
+            event_data = {
+                "event_type": event_type,
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "data": payload
+            }
+            # Consumers continue this trace: Celery tasks read it from the message headers (the signed
+            # webhook body is left unchanged), real-time subscribers from the message itself
+            trace_context = inject_context()
 
-        # 1. Dispatch to HTTP Webhooks (via Celery)
-        subscribed_webhooks = await self.webhook_service.list_webhooks(event_type=event_type, is_active=True)
-        for webhook in subscribed_webhooks:
-            celery_app.send_task(
-                'app.tasks.webhook_tasks.send_webhook_task', # Full path to the task
-                args=[webhook.target_url, event_data, webhook.secret, webhook.headers]
-            )
-            print(f"Dispatched HTTP webhook for event '{event_type}' to {webhook.target_url} via Celery")
+            # 1. Dispatch to HTTP Webhooks (via Celery)
+            subscribed_webhooks = await self.webhook_service.list_webhooks(event_type=event_type, is_active=True)
+            if subscribed_webhooks:
+                # Celery (and kombu) are imported with the first event that has HTTP subscribers, not at startup
+                from app.tasks.webhook_tasks import celery_app
+            for webhook in subscribed_webhooks:
+                celery_app.send_task(
+                    'app.tasks.webhook_tasks.send_webhook_task', # Full path to the task
+                    args=[webhook.target_url, event_data, webhook.secret, webhook.headers],
+                    headers=trace_context,
+                )
+                print(f"Dispatched HTTP webhook for event '{event_type}' to {webhook.target_url} via Celery")
 
-        # 2. Publish to Real-time WebSocket (Redis Pub/Sub)
-        if is_realtime and self.redis_client:
-            try:
-                await self.redis_client.publish(REDIS_PUBSUB_CHANNEL, json.dumps(event_data))
-                print(f"Published real-time event '{event_type}' to Redis Pub/Sub channel '{REDIS_PUBSUB_CHANNEL}'")
-            except Exception as e:
-                print(f"Failed to publish real-time event to Redis: {e}")
+            # 2. Publish to Real-time WebSocket (Redis Pub/Sub)
+            if is_realtime and self.redis_client:
+                try:
+                    message = {**event_data, TRACE_CARRIER_KEY: trace_context} if trace_context else event_data
+                    await self.redis_client.publish(REDIS_PUBSUB_CHANNEL, json_dumps(message))
+                    print(f"Published real-time event '{event_type}' to Redis Pub/Sub channel '{REDIS_PUBSUB_CHANNEL}'")
+                except Exception as e:
+                    print(f"Failed to publish real-time event to Redis: {e}")
 
 # Example usage (for testing/demonstration, not for production initialization)
 # from app.adapters.redis_adapter import RedisAdapter
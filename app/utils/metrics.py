@@ -0,0 +1,93 @@
+import os
+from functools import lru_cache
+from typing import Iterable, NamedTuple
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+
+# Under the multi-worker launcher (gunicorn.conf.py) every worker writes its samples to files in this
+# directory, and the worker serving a scrape aggregates all of them. Gauges say how: "live*" modes drop
+# workers that have exited.
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Storage operations, labelled by backend ("redis", "mongodb", ...), model class name and adapter method
+STORAGE_LATENCY = Histogram(
+    "storage_operation_seconds",
+    "Storage adapter operation latency",
+    ["backend", "model", "operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+STORAGE_ERRORS = Counter("storage_operation_errors_total", "Storage adapter operations that raised", ["backend", "model", "operation"])
+STORAGE_ROWS = Counter("storage_rows_total", "Records read or written by storage adapters", ["backend", "model", "operation"])
+STORAGE_BYTES = Counter("storage_payload_bytes_total", "Approximate JSON size of records read or written", ["backend", "model", "operation"])
+
+# Cache lookups by tier ("redis" for CachingAdapter, "response" for the GraphQL response cache).
+# Results are "hit", "miss" and "bypass" (not attempted while the tier is unhealthy).
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by tier and result", ["tier", "model", "result"])
+CACHE_HEALTHY = Gauge("cache_healthy", "0 while the cache tier is bypassed as unhealthy", ["tier"], multiprocess_mode="livemin") # 0 if any worker bypasses
+CACHE_PENDING_INVALIDATIONS = Gauge("cache_pending_invalidations", "Invalidations waiting for the cache tier to recover", ["tier"], multiprocess_mode="livesum")
+
+# Connection pools by backend ("redis", "mongodb", "supabase", ...), summed over the workers. Saturation is
+# in_use / max; waiting > 0 means callers are queued for a connection, and timeouts count the ones that gave up.
+POOL_MAX = Gauge("connection_pool_max", "Configured connection pool size", ["backend"], multiprocess_mode="livesum")
+POOL_IN_USE = Gauge("connection_pool_in_use", "Connections checked out of the pool", ["backend"], multiprocess_mode="livesum")
+POOL_WAITING = Gauge("connection_pool_waiting", "Callers waiting for a connection", ["backend"], multiprocess_mode="livesum")
+POOL_WAIT = Histogram(
+    "connection_pool_wait_seconds",
+    "Time to obtain a connection from the pool",
+    ["backend"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+POOL_TIMEOUTS = Counter("connection_pool_timeouts_total", "Callers that gave up waiting for a connection", ["backend"])
+BACKEND_UP = Gauge("backend_up", "1 if the last liveness ping succeeded, else 0", ["backend"], multiprocess_mode="livemin")
+BACKEND_PING = Gauge("backend_ping_seconds", "Latency of the last liveness ping", ["backend"], multiprocess_mode="livemax")
+
+def exposition() -> bytes:
+    """The /metrics payload: every worker's samples under the multi-worker launcher, else this process's."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+STORAGE_OPERATIONS = ("create", "create_many", "read", "read_many", "update", "update_many", "delete", "list", "iter")
+
+class OperationMetrics(NamedTuple):
+    """Metric children bound to one (backend, model, operation) label set."""
+    latency: "Histogram"
+    errors: "Counter"
+    rows: "Counter"
+    bytes: "Counter"
+
+@lru_cache(maxsize=None)
+def operation_metrics(backend: str, model: str, operation: str) -> OperationMetrics:
+    """
+    Bound children for a label set. `labels()` hashes and locks on every call,
+    so children are resolved once per label set and reused by every operation.
+    """
+    labels = (backend, model, operation)
+    return OperationMetrics(
+        STORAGE_LATENCY.labels(*labels),
+        STORAGE_ERRORS.labels(*labels),
+        STORAGE_ROWS.labels(*labels),
+        STORAGE_BYTES.labels(*labels),
+    )
+
+@lru_cache(maxsize=None)
+def cache_metrics(tier: str, model: str) -> "tuple[Counter, Counter]":
+    """(hit, miss) counters for one cache tier and model."""
+    return CACHE_REQUESTS.labels(tier, model, "hit"), CACHE_REQUESTS.labels(tier, model, "miss")
+
+@lru_cache(maxsize=None)
+def cache_bypasses(tier: str, model: str) -> Counter:
+    return CACHE_REQUESTS.labels(tier, model, "bypass")
+
+def preregister(backends: Iterable[str], models: Iterable[str]) -> None:
+    """Creates every label set up front, so series exist (at zero) from the first scrape and the hot path never allocates."""
+    models = list(models)
+    for backend in backends:
+        for model in models:
+            for operation in STORAGE_OPERATIONS:
+                operation_metrics(backend, model, operation)
+    for model in models:
+        cache_metrics("redis", model)
+    cache_metrics("response", "graphql")
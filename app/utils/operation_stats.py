@@ -0,0 +1,56 @@
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+class ResolverTiming:
+    """Calls and wall time of one resolver path ("listings.priceHistory") within an operation."""
+    __slots__ = ("calls", "total_ms", "max_ms")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, elapsed_ms: float) -> None:
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+class OperationStats:
+    """
+    Per-operation counters, shared by every resolver of one GraphQL operation
+    through `current_operation_stats` (tasks started by the executor copy the
+    context, so they all see the same instance).
+    """
+
+    def __init__(self) -> None:
+        self.adapter_calls: Counter = Counter() # "mongodb.read(User)" -> calls
+        self.resolvers: Dict[str, ResolverTiming] = {}
+        # Set by NPlusOneExtension: resolver path -> Counter of adapter calls made while resolving it
+        self.adapter_calls_by_path: Optional[Dict[str, Counter]] = None
+
+    def add_resolver_time(self, path: str, elapsed_ms: float) -> None:
+        timing = self.resolvers.get(path)
+        if timing is None:
+            timing = self.resolvers[path] = ResolverTiming()
+        timing.add(elapsed_ms)
+
+    def slowest_resolvers(self, limit: int) -> List[Tuple[str, ResolverTiming]]:
+        return sorted(self.resolvers.items(), key=lambda item: item[1].total_ms, reverse=True)[:limit]
+
+current_operation_stats: ContextVar[Optional[OperationStats]] = ContextVar("current_operation_stats", default=None)
+current_resolver_path: ContextVar[str] = ContextVar("current_resolver_path", default="") # "" outside any resolver
+
+def count_adapter_call(backend: str, operation: str, model: str) -> None:
+    """Counts a storage call against the running GraphQL operation, if any."""
+    stats = current_operation_stats.get()
+    if stats is not None:
+        call = f"{backend}.{operation}({model})"
+        stats.adapter_calls[call] += 1
+        if stats.adapter_calls_by_path is not None:
+            path = current_resolver_path.get()
+            by_path = stats.adapter_calls_by_path.get(path)
+            if by_path is None:
+                by_path = stats.adapter_calls_by_path[path] = Counter()
+            by_path[call] += 1
@@ -0,0 +1,25 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+
+def _default(obj: Any) -> Any:
+    """Fallback for types orjson does not encode natively (it already handles datetime, UUID, enums, dataclasses)."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def json_dumps(data: Any, sort_keys: bool = False) -> bytes:
+    """Encodes `data` as compact UTF-8 JSON bytes. Used for GraphQL responses, events and webhook bodies."""
+    option = orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    return orjson.dumps(data, default=_default, option=option)
+
+def json_loads(data: Any) -> Any:
+    return orjson.loads(data)
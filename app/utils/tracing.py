@@ -0,0 +1,58 @@
+from typing import Any, Dict, Mapping, Optional
+
+from opentelemetry import propagate, trace
+from opentelemetry.context import Context
+
+# app.-prefixed: the Celery worker imports this with only the repository root on sys.path
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TRACER_NAME = "api-central"
+TRACE_CARRIER_KEY = "trace" # Key holding W3C trace context inside published event payloads
+
+tracer = trace.get_tracer(TRACER_NAME)
+
+def configure_tracing(exporter: Any = None) -> bool:
+    """
+    Installs the SDK tracer provider for this process (API server or Celery worker).
+
+    Spans are exported to OTEL_EXPORTER_OTLP_ENDPOINT, or to `exporter` (tests pass an
+    in-memory one). Without either, the OpenTelemetry API stays a no-op. Root spans are
+    sampled at OTEL_TRACES_SAMPLE_RATIO and children follow their parent's decision, so
+    unsampled requests only pay for non-recording spans.
+    """
+    if exporter is None and not settings.OTEL_EXPORTER_OTLP_ENDPOINT:
+        return False
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    if isinstance(trace.get_tracer_provider(), TracerProvider):
+        return True # Already configured, e.g. the module was imported under both app. and bare paths
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.OTEL_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.OTEL_TRACES_SAMPLE_RATIO)),
+    )
+    if exporter is not None:
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+    else:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT)))
+    trace.set_tracer_provider(provider)
+    logger.info(f"[Tracing] Exporting spans, sampling {settings.OTEL_TRACES_SAMPLE_RATIO:.2%} of root traces")
+    return True
+
+def inject_context(carrier: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Current trace context as W3C headers (`traceparent`, `tracestate`), for Celery headers and event payloads."""
+    carrier = {} if carrier is None else carrier
+    propagate.inject(carrier)
+    return carrier
+
+def extract_context(carrier: Optional[Mapping[str, Any]]) -> Optional[Context]:
+    """Parent context from W3C headers, or None if `carrier` has none."""
+    if not carrier:
+        return None
+    return propagate.extract({key: value for key, value in carrier.items() if isinstance(value, str)})
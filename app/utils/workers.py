@@ -0,0 +1,38 @@
+import math
+import os
+from typing import Optional
+
+CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max" # cgroup v2 quota, e.g. "200000 100000" for 2 CPUs or "max 100000"
+
+def available_cpus(cgroup_cpu_max: str = CGROUP_CPU_MAX) -> int:
+    """
+    CPUs this process may actually use: the affinity mask, capped by the
+    container's CPU quota. os.cpu_count() reports the host's cores, which
+    oversizes the worker pool in a CPU-limited container.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError: # Not available on macOS
+        cpus = os.cpu_count() or 1
+    try:
+        with open(cgroup_cpu_max, "r", encoding="utf-8") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+def worker_count(configured: Optional[int] = None) -> int:
+    """Worker processes to run: `configured` when positive, otherwise one per available CPU."""
+    if configured and configured > 0:
+        return configured
+    return available_cpus()
+
+def pool_share(budget: int, workers: int, minimum: int = 2) -> int:
+    """
+    Per-worker share of a connection budget for the whole deployment, so N
+    workers together open at most `budget` sockets to a backend (never fewer
+    than `minimum` per worker, which can exceed a budget smaller than N * minimum).
+    """
+    return max(minimum, budget // max(1, workers))
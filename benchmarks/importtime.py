@@ -0,0 +1,131 @@
+"""
+Cold-start guard: imports app.main in a fresh interpreter under `python -X importtime`
+and reports the total import time, module count and the heaviest imports.
+
+The run fails (exit 1) when a module that should be deferred until first use
+(another engine's SDK, Celery) is imported at startup, when the total exceeds
+--budget-ms, or when it regresses beyond --threshold against a saved --baseline.
+
+    PYTHONPATH=app:. python benchmarks/importtime.py --engine MONGODB
+    PYTHONPATH=app:. python benchmarks/importtime.py --out baseline.json
+    PYTHONPATH=app:. python benchmarks/importtime.py --baseline baseline.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGET = "app.main"
+
+# Never needed to serve the first request: storage SDKs load with the configured engine on first use,
+# Celery with the first event that has webhook subscribers
+DEFERRED_MODULES = ["google.cloud.firestore_v1", "supabase", "celery", "kombu", "uvicorn"]
+
+class ImportEntry(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int # 0 for the imported target, +1 per nesting level
+
+def parse_importtime(stderr: str) -> List[ImportEntry]:
+    """Entries from `-X importtime` output, in the order the interpreter reports them."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        stripped = name.lstrip(" ")
+        entries.append(ImportEntry(stripped.strip(), int(self_us), int(cumulative_us), (len(name) - len(stripped) - 1) // 2))
+    return entries
+
+def startup_environment(engine: Optional[str] = None) -> Dict[str, str]:
+    """The caller's environment, with self-contained defaults for required settings."""
+    from benchmarks.loadtest.harness import FAKE_ENVIRONMENT
+
+    env = {**FAKE_ENVIRONMENT, **os.environ}
+    if engine:
+        env["STORAGE_ENGINE"] = engine
+    paths = [os.path.join(REPO_ROOT, "app"), REPO_ROOT]
+    env["PYTHONPATH"] = os.pathsep.join(paths + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+    return env
+
+def import_target(env: Dict[str, str], target: str = TARGET) -> List[ImportEntry]:
+    """Imports `target` in a new interpreter, so nothing is cached from this process."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        env=env, capture_output=True, text=True, check=False,
+    )
+    entries = parse_importtime(completed.stderr)
+    if completed.returncode != 0:
+        raise RuntimeError(f"importing {target} failed:\n{completed.stderr[-2000:]}")
+    return entries
+
+def deferred_imports(entries: List[ImportEntry], deferred: List[str] = DEFERRED_MODULES) -> List[str]:
+    """Names from `deferred` that were imported, themselves or through a submodule."""
+    imported = {entry.module for entry in entries}
+    return [name for name in deferred if any(module == name or module.startswith(name + ".") for module in imported)]
+
+def summarize(runs: List[List[ImportEntry]], target: str = TARGET, top: int = 15) -> Dict[str, object]:
+    """Median total over the runs; module breakdowns come from the fastest run."""
+    totals = [next(e.cumulative_us for e in entries if e.module == target) for entries in runs]
+    fastest = runs[totals.index(min(totals))]
+    return {
+        "target": target,
+        "runs": len(runs),
+        "total_ms": round(statistics.median(totals) / 1000, 1),
+        "min_ms": round(min(totals) / 1000, 1),
+        "modules": len(fastest),
+        "top_cumulative": [
+            {"module": e.module, "ms": round(e.cumulative_us / 1000, 1)}
+            for e in sorted((e for e in fastest if e.depth == 1), key=lambda e: e.cumulative_us, reverse=True)[:top]
+        ],
+        "top_self": [
+            {"module": e.module, "ms": round(e.self_us / 1000, 1)}
+            for e in sorted(fastest, key=lambda e: e.self_us, reverse=True)[:top]
+        ],
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engine", help="STORAGE_ENGINE to start with (default: the environment's)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, help="fail when the median total exceeds this")
+    parser.add_argument("--baseline", help="report saved with --out to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression against --baseline")
+    parser.add_argument("--out", help="write the report as JSON")
+    args = parser.parse_args()
+
+    env = startup_environment(args.engine)
+    runs = [import_target(env) for _ in range(args.runs)]
+    report = summarize(runs, top=args.top)
+    report["engine"] = env.get("STORAGE_ENGINE")
+    report["deferred_imported"] = deferred_imports(runs[0])
+
+    print(f"{TARGET} ({report['engine']}): {report['total_ms']} ms median over {args.runs} runs, {report['modules']} modules")
+    for row in report["top_cumulative"]:
+        print(f"  {row['ms']:8.1f} ms  {row['module']}")
+
+    failures = [f"imported at startup: {module}" for module in report["deferred_imported"]]
+    if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+        failures.append(f"total {report['total_ms']} ms exceeds budget {args.budget_ms} ms")
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        limit = baseline["total_ms"] * (1 + args.threshold)
+        if report["total_ms"] > limit:
+            failures.append(f"total {report['total_ms']} ms regressed beyond {limit:.1f} ms (baseline {baseline['total_ms']} ms)")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Compares Strawberry's default stdlib encoder with the orjson encoder used by
+CentralGraphQLRouter, on a 1,000-listing GraphQL response body.
+
+    PYTHONPATH=app python benchmarks/json_encoding.py
+"""
+import json
+import time
+
+from utils.serialization import json_dumps
+
+LISTINGS = 1000
+HISTORY_POINTS = 30
+ROUNDS = 20
+
+def make_response() -> dict:
+    return {
+        "data": {
+            "listings": [
+                {
+                    "id": str(i), "name": f"Listing {i}", "currentPrice": 100.0 + i / 7, "valuation": 1_000_000.0,
+                    "status": "For Sale", "dateListed": "2024-01-01T00:00:00",
+                    "priceHistory": [{"date": f"2024-01-{d % 28 + 1:02d}", "price": 100.0 + d / 3} for d in range(HISTORY_POINTS)],
+                }
+                for i in range(LISTINGS)
+            ]
+        }
+    }
+
+def stdlib(data: dict) -> bytes:
+    # What strawberry.http.base.BaseView.encode_json does
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+def main() -> None:
+    data = make_response()
+    assert json.loads(stdlib(data)) == json.loads(json_dumps(data))
+    for label, encode in (("stdlib json", stdlib), ("orjson", json_dumps)):
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            body = encode(data)
+        elapsed_ms = (time.perf_counter() - started) * 1000 / ROUNDS
+        print(f"{label:<12} {elapsed_ms:7.2f} ms/response   {len(body) / 1024:7.1f} KiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Load test for the GraphQL API.
+
+Seeds users, listings and marketplace items, replays an operation mix from
+operations.json at fixed concurrency and reports throughput and p50/p95/p99
+per operation. With --baseline the run fails (exit 1) when it regresses
+beyond --threshold.
+
+    # Self-contained: in-process app, fake Redis as the storage engine
+    PYTHONPATH=app:data python -m benchmarks.loadtest run --mix mixed --concurrency 32 --duration 30 --out current.json
+
+    # Against local containers (see docker-compose.yml), configured via the usual environment
+    STORAGE_ENGINE=MONGODB REDIS_HOST=localhost ... PYTHONPATH=app:data python -m benchmarks.loadtest run --no-fakes
+
+    # Compare two saved reports
+    PYTHONPATH=app:data python -m benchmarks.loadtest compare baseline.json current.json --threshold 0.1
+"""
+import argparse
+import asyncio
+import json
+import sys
+from typing import Any, Dict, Optional
+
+from benchmarks.loadtest import harness
+from benchmarks.loadtest.runner import Replay, compare, format_report, load_operations, OPERATIONS_FILE
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+
+    operations = load_operations(args.operations)
+    mix = operations["mixes"][args.mix]
+
+    async def replay(client: Any) -> Dict[str, Any]:
+        dataset = await harness.seed(args.users, args.listings_per_user, args.items_per_user, seed=args.seed)
+        report = await Replay(client, dataset, mix, operations["operations"], seed=args.seed).run(
+            args.concurrency, args.duration, args.warmup
+        )
+        report.update({
+            "mix": args.mix,
+            "backend": "fakes" if args.fakes else "configured",
+            "seeded": {"users": args.users, "listings_per_user": args.listings_per_user, "items_per_user": args.items_per_user},
+        })
+        return report
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+            return await replay(client)
+    async with harness.running_app(args.fakes) as app:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout) as client:
+            return await replay(client)
+
+def read_report(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def check(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> int:
+    regressions = compare(baseline, current, threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"No regressions beyond {threshold:.0%}")
+    return 1 if regressions else 0
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Seed, replay a mix and report")
+    run_parser.add_argument("--mix", default="mixed")
+    run_parser.add_argument("--operations", default=str(OPERATIONS_FILE), help="Operations and mixes JSON")
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds")
+    run_parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before measuring")
+    run_parser.add_argument("--users", type=int, default=100)
+    run_parser.add_argument("--listings-per-user", type=int, default=20)
+    run_parser.add_argument("--items-per-user", type=int, default=20)
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--timeout", type=float, default=30.0)
+    run_parser.add_argument("--no-fakes", dest="fakes", action="store_false", help="Use the configured Redis/Mongo/Supabase")
+    run_parser.add_argument("--url", help="Load a running server instead of an in-process app (implies --no-fakes)")
+    run_parser.add_argument("--rate-limit", action="store_true", help="Keep rate limiting on (off by default)")
+    run_parser.add_argument("--out", help="Write the JSON report here")
+    run_parser.add_argument("--baseline", help="Fail if this run regresses against this report")
+    run_parser.add_argument("--threshold", type=float, default=0.10)
+
+    compare_parser = commands.add_parser("compare", help="Compare two saved reports")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        return check(read_report(args.baseline), read_report(args.current), args.threshold)
+
+    args.fakes = args.fakes and not args.url
+    harness.prepare_environment(args.fakes, args.rate_limit)
+    if args.fakes:
+        harness.install_fakes()
+    report = asyncio.run(run(args))
+    print(format_report(report))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        return check(read_report(args.baseline), report, args.threshold)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Boots the API in-process and seeds it for load tests.
+
+With `fakes=True` Redis is an in-process fakeredis server and the storage
+engine is REDIS, so a run needs nothing but this repository. Otherwise the
+app uses whatever the environment configures (STORAGE_ENGINE, REDIS_HOST,
+MONGODB_CONNECTION_STRING, SUPABASE_URL, ...), e.g. local containers.
+"""
+import os
+import random
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List
+
+# Settings are read when the app is first imported, so defaults for a self-contained run are applied first
+FAKE_ENVIRONMENT = {
+    "STORAGE_ENGINE": "REDIS",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "REDIS_DB": "0",
+    "MONGODB_CONNECTION_STRING": "mongodb://localhost:27017",
+    "MONGODB_DATABASE_NAME": "loadtest",
+    "SUPABASE_URL": "http://localhost:54321",
+    "SUPABASE_KEY": "loadtest",
+    "SUPABASE_SERVICE_ROLE_KEY": "loadtest",
+    "SUPABASE_JWT_SECRET": "loadtest-secret",
+}
+
+def prepare_environment(fakes: bool, rate_limit: bool) -> None:
+    """Applies environment defaults; call before anything imports the app."""
+    if fakes:
+        for name, value in FAKE_ENVIRONMENT.items():
+            os.environ.setdefault(name, value)
+    os.environ["DEBUG"] = "" # Requests go through real token verification
+    os.environ["RATE_LIMIT_ENABLED"] = "true" if rate_limit else "false"
+
+def install_fakes() -> None:
+    """Points every redis.asyncio client the app creates at one in-process server."""
+    import fakeredis
+    import redis.asyncio
+
+    server = fakeredis.FakeServer()
+
+    def fake_redis(*args: Any, **kwargs: Any) -> Any:
+        for name in ("host", "port", "connection_pool"): # The connection manager's pools would dial the real server
+            kwargs.pop(name, None)
+        return fakeredis.FakeAsyncRedis(server=server, **kwargs)
+
+    redis.asyncio.Redis = fake_redis # type: ignore[misc]
+
+@asynccontextmanager
+async def running_app(fakes: bool) -> AsyncIterator[Any]:
+    """Imports app.main, runs its lifespan and yields the ASGI app."""
+    import app.main as main
+
+    if fakes:
+        from adapters import get_adapter
+
+        # Webhook subscriptions live in MongoDB; with fakes they are read from the fake Redis instead
+        main.webhook_service.storage_adapter = get_adapter()
+        main.mongodb_adapter.ensure_indexes = _no_indexes
+    async with main.lifespan(main.app):
+        yield main.app
+
+async def _no_indexes() -> None:
+    return None
+
+def token_for(user_id: str, email: str, ttl_seconds: int = 3600) -> str:
+    """HS256 access token for `user_id`, accepted through SUPABASE_JWT_SECRET."""
+    import jwt
+    from config import settings
+
+    claims: Dict[str, Any] = {"sub": user_id, "email": email, "role": "user", "exp": int(time.time()) + ttl_seconds}
+    if settings.SUPABASE_JWT_AUDIENCE:
+        claims["aud"] = settings.SUPABASE_JWT_AUDIENCE
+    return jwt.encode(claims, settings.SUPABASE_JWT_SECRET, algorithm="HS256")
+
+class Dataset:
+    """IDs of the seeded records, used to fill operation variables."""
+
+    def __init__(self) -> None:
+        self.user_ids: List[str] = []
+        self.listings_by_user: Dict[str, List[str]] = {}
+        self.tokens: Dict[str, str] = {}
+
+def _price_history(price: float, points: int, rng: random.Random) -> List[Dict[str, Any]]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {"date": (start + timedelta(days=day)).date().isoformat(), "price": round(price * rng.uniform(0.9, 1.1), 2)}
+        for day in range(points)
+    ]
+
+def build_records(users: int, listings_per_user: int, items_per_user: int, seed: int) -> Dict[str, List[Any]]:
+    """
+    Users, listings and marketplace items built from data/data_generators
+    (which need `data/` on PYTHONPATH and the faker package).
+    """
+    from faker import Faker
+    from data_generators.properties_generator import generate_fake_properties
+    from data_generators.users_generator import generate_fake_users
+
+    from adapters.ids import id_codec
+    from models.property import PropertyMarketplaceItem
+    from models.trade import PropertyListing
+    from models.user import User
+
+    Faker.seed(seed)
+    rng = random.Random(seed)
+    records: Dict[str, List[Any]] = {"users": [], "listings": [], "items": []}
+    for index, generated in enumerate(generate_fake_users(users)):
+        user_id = id_codec(User).generate()
+        records["users"].append(User(
+            id=user_id,
+            display_name=generated.user_metadata.full_name,
+            email=generated.email,
+            phone=f"+1202555{index % 10000:04d}",
+            user_metadata=generated.user_metadata.model_dump(),
+        ))
+        for number, prop in enumerate(generate_fake_properties([user_id], listings_per_user + items_per_user)):
+            valuation = float(prop.valuation)
+            total_tokens = rng.choice([1_000, 10_000, 100_000])
+            price = round(valuation / total_tokens, 2)
+            if number < listings_per_user:
+                records["listings"].append(PropertyListing(
+                    id=id_codec(PropertyListing).generate(), user_id=user_id, name=prop.name, address=prop.address,
+                    image_url=prop.image_url, token_symbol=f"PRP{number}", current_price=price, price_unit="USDC",
+                    apy=round(rng.uniform(2, 12), 2), valuation=valuation, tokens_offered=total_tokens // 4,
+                    total_tokens=total_tokens, is_favorite=False, status=prop.status,
+                    price_history=_price_history(price, 30, rng),
+                ))
+            else:
+                listed = datetime.fromisoformat(prop.date_listed)
+                records["items"].append(PropertyMarketplaceItem(
+                    id=id_codec(PropertyMarketplaceItem).generate(), user_id=user_id, title=prop.name,
+                    location=prop.address, price=f"${valuation:,.0f}", numeric_price=valuation, token_price=f"${price}",
+                    total_tokens=total_tokens, available_tokens=total_tokens // 2, image=prop.image_url,
+                    type=prop.property_type, roi=f"{rng.uniform(2, 12):.1f}%", date_listed=listed, created_at=listed,
+                    status=prop.status,
+                ))
+    return records
+
+async def seed(users: int, listings_per_user: int, items_per_user: int, seed: int = 42, batch_size: int = 500) -> Dataset:
+    """Writes the generated records through the configured adapter, in create_many batches."""
+    from adapters import get_adapter
+
+    records = build_records(users, listings_per_user, items_per_user, seed)
+    adapter = get_adapter()
+    for batch in (records["users"], records["listings"], records["items"]):
+        for start in range(0, len(batch), batch_size):
+            await adapter.create_many(batch[start:start + batch_size])
+
+    dataset = Dataset()
+    for user in records["users"]:
+        dataset.user_ids.append(str(user.id))
+        dataset.tokens[str(user.id)] = token_for(str(user.id), user.email)
+    for listing in records["listings"]:
+        dataset.listings_by_user.setdefault(listing.user_id, []).append(str(listing.id))
+    return dataset
+
+def new_listing(rng: random.Random) -> Dict[str, Any]:
+    """Variables for createListing."""
+    valuation = round(rng.uniform(100_000, 5_000_000), 2)
+    return {
+        "name": f"Load Test Property {uuid.uuid4().hex[:8]}", "address": "1 Benchmark Way", "imageUrl": "images/property-1.jpg",
+        "tokenSymbol": "LTP", "currentPrice": round(valuation / 10_000, 2), "priceUnit": "USDC", "apy": 5.0,
+        "valuation": valuation, "tokensOffered": 2_500, "totalTokens": 10_000, "isFavorite": False, "status": "For Sale",
+        "dateListed": datetime.now(timezone.utc).isoformat(),
+    }
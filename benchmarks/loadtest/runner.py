@@ -0,0 +1,150 @@
+"""Replays a weighted GraphQL operation mix at fixed concurrency and compares reports."""
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.loadtest.harness import Dataset, new_listing
+
+OPERATIONS_FILE = Path(__file__).with_name("operations.json")
+PERCENTILES = (50, 95, 99)
+
+def load_operations(path: Path = OPERATIONS_FILE) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    summary: Dict[str, Any] = {
+        "requests": len(ordered) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = round(percentile(ordered, pct) * 1000, 3)
+    return summary
+
+class Replay:
+    """
+    Runs `concurrency` workers that each send one request at a time, choosing
+    operations by weight, for `duration` seconds after a `warmup`.
+    Requests are authenticated as a random seeded user.
+    """
+
+    def __init__(self, client: Any, dataset: Dataset, mix: Dict[str, int], operations: Dict[str, Any], seed: int = 42):
+        self.client = client
+        self.dataset = dataset
+        self.operations = operations
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.rng = random.Random(seed)
+        self.latencies: Dict[str, List[float]] = {name: [] for name in self.names}
+        self.errors: Dict[str, int] = {name: 0 for name in self.names}
+        self.sample_errors: List[str] = []
+        self._recording = False
+
+    def _variables(self, name: str, user_id: str) -> Dict[str, Any]:
+        variables: Dict[str, Any] = {}
+        for key, placeholder in self.operations[name].get("variables", {}).items():
+            if placeholder == "$user_id":
+                variables[key] = user_id
+            elif placeholder == "$new_listing":
+                variables[key] = new_listing(self.rng)
+            elif placeholder == "$listing_update":
+                listing_id = self.rng.choice(self.dataset.listings_by_user.get(user_id) or [""])
+                variables[key] = {"id": listing_id, "currentPrice": round(self.rng.uniform(10, 500), 2)}
+            else:
+                variables[key] = placeholder
+        return variables
+
+    async def _request(self, name: str) -> Tuple[bool, Optional[str]]:
+        user_id = self.rng.choice(self.dataset.user_ids)
+        response = await self.client.post(
+            "/graphql",
+            json={"query": self.operations[name]["query"], "operationName": name, "variables": self._variables(name, user_id)},
+            headers={"Authorization": f"Bearer {self.dataset.tokens[user_id]}"},
+        )
+        if response.status_code != 200:
+            return False, f"HTTP {response.status_code}: {response.text[:200]}"
+        body = response.json()
+        if body.get("errors"):
+            return False, json.dumps(body["errors"])[:200]
+        return True, None
+
+    async def _worker(self, stop_at: float) -> None:
+        while time.perf_counter() < stop_at:
+            name = self.rng.choices(self.names, self.weights)[0]
+            started = time.perf_counter()
+            try:
+                ok, error = await self._request(name)
+            except Exception as e:
+                ok, error = False, repr(e)
+            if not self._recording:
+                continue
+            if ok:
+                self.latencies[name].append(time.perf_counter() - started)
+            else:
+                self.errors[name] += 1
+                if len(self.sample_errors) < 5:
+                    self.sample_errors.append(f"{name}: {error}")
+
+    async def run(self, concurrency: int, duration: float, warmup: float = 2.0) -> Dict[str, Any]:
+        stop_at = time.perf_counter() + warmup + duration
+        workers = [asyncio.create_task(self._worker(stop_at)) for _ in range(concurrency)]
+        await asyncio.sleep(warmup)
+        self._recording = True
+        started = time.perf_counter()
+        await asyncio.gather(*workers)
+        elapsed = time.perf_counter() - started
+
+        all_latencies = [latency for values in self.latencies.values() for latency in values]
+        return {
+            "concurrency": concurrency,
+            "duration_s": round(elapsed, 3),
+            "overall": summarize(all_latencies, sum(self.errors.values()), elapsed),
+            "operations": {name: summarize(self.latencies[name], self.errors[name], elapsed) for name in self.names},
+            "sample_errors": self.sample_errors,
+        }
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Regressions of `current` against `baseline`: throughput down, or a latency
+    percentile up, by more than `threshold` (0.1 = 10%), overall or per operation.
+    """
+    regressions = []
+    scopes = [("overall", baseline["overall"], current["overall"])]
+    scopes += [
+        (name, baseline["operations"][name], stats)
+        for name, stats in current["operations"].items()
+        if name in baseline["operations"]
+    ]
+    for scope, before, after in scopes:
+        if before["throughput_rps"] and after["throughput_rps"] < before["throughput_rps"] * (1 - threshold):
+            regressions.append(f"{scope}: throughput {before['throughput_rps']} -> {after['throughput_rps']} req/s")
+        for pct in PERCENTILES:
+            key = f"p{pct}_ms"
+            if before[key] and after[key] > before[key] * (1 + threshold):
+                regressions.append(f"{scope}: {key} {before[key]} -> {after[key]}")
+        if after["errors"] > before["errors"]:
+            regressions.append(f"{scope}: errors {before['errors']} -> {after['errors']}")
+    return regressions
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"{'operation':<22}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"]
+    rows = [("overall", report["overall"])] + sorted(report["operations"].items())
+    for name, stats in rows:
+        lines.append(
+            f"{name:<22}{stats['requests']:>10}{stats['errors']:>8}{stats['throughput_rps']:>10}"
+            f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}"
+        )
+    lines.extend(f"  ! {error}" for error in report.get("sample_errors", []))
+    return "\n".join(lines)
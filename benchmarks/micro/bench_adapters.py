@@ -0,0 +1,64 @@
+"""Row decoding and validation in the storage adapters."""
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from adapters.mongodb_adapter import MongoDBAdapter
+from adapters.redis_adapter import RedisAdapter
+from models.trade import PropertyListing
+from support import make_listings, measure, run_sync
+
+class StaticRedis:
+    """Serves pre-encoded values, so only RedisAdapter's decode and validation are timed."""
+
+    def __init__(self, values: Dict[str, str]):
+        self.values = values
+
+    async def get(self, key: str) -> Optional[str]:
+        return self.values.get(key)
+
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        return [self.values.get(key) for key in keys]
+
+class StaticCollection:
+    """Yields copies of stored documents, as Motor yields fresh dicts per fetch."""
+
+    def __init__(self, documents: List[Dict[str, Any]]):
+        self.documents = documents
+
+    def find(self, *args: Any, **kwargs: Any) -> Any:
+        return self._cursor()
+
+    async def _cursor(self) -> Any:
+        for document in self.documents:
+            yield dict(document)
+
+def redis_adapter(listings: List[PropertyListing], trusted: bool) -> RedisAdapter:
+    adapter = RedisAdapter(trusted_reads=trusted)
+    adapter.client = StaticRedis({adapter._get_key(PropertyListing, l.id): l.model_dump_json() for l in listings})
+    return adapter
+
+@pytest.mark.parametrize("trusted", [False, True], ids=["validated", "trusted"])
+def bench_redis_read(benchmark: Any, rows: int, trusted: bool) -> None:
+    listings = make_listings(rows)
+    adapter = redis_adapter(listings, trusted)
+    if rows == 1:
+        fn = lambda: run_sync(adapter.read(PropertyListing, listings[0].id))
+    else:
+        ids = [listing.id for listing in listings]
+        fn = lambda: run_sync(adapter.read_many(PropertyListing, ids))
+    result = measure(benchmark, fn, rows)
+    assert (result.id if rows == 1 else result[-1].id) == listings[-1].id
+
+@pytest.mark.parametrize("trusted", [False, True], ids=["validated", "trusted"])
+def bench_mongodb_list(benchmark: Any, rows: int, trusted: bool) -> None:
+    documents = []
+    for listing in make_listings(rows):
+        document = listing.model_dump()
+        document["_id"] = document.pop("id")
+        documents.append(document)
+    adapter = MongoDBAdapter.__new__(MongoDBAdapter) # No Motor client: the collection below stands in for it
+    adapter.db = {"propertylisting": StaticCollection(documents)}
+    adapter.trusted_reads = trusted
+    result = measure(benchmark, lambda: run_sync(adapter.list(PropertyListing)), rows)
+    assert len(result) == rows
@@ -0,0 +1,59 @@
+"""GraphQL type conversion, event serialization and webhook signing."""
+from typing import Any, List
+
+from app.tasks.webhook_tasks import sign_payload
+from app.utils.event_publisher import EventPublisher
+from schema.types.trade_type import PriceHistoryEntryType, PropertyListingType
+from support import make_items, make_listings, measure, run_sync
+
+class NoWebhooks:
+    async def list_webhooks(self, **kwargs: Any) -> List[Any]:
+        return []
+
+class PubSub:
+    """Keeps published messages, so publish() pays for serialization only."""
+
+    def __init__(self) -> None:
+        self.messages: List[bytes] = []
+
+    async def publish(self, channel: str, message: bytes) -> int:
+        self.messages.append(message)
+        return 1
+
+def bench_type_conversion(benchmark: Any, rows: int) -> None:
+    """The copy resolvers made before returning models directly: Type(**model.model_dump())."""
+    listings = make_listings(rows)
+
+    def convert() -> List[PropertyListingType]:
+        return [
+            PropertyListingType(**{
+                **listing.model_dump(),
+                "price_history": [PriceHistoryEntryType.from_pydantic(e) for e in listing.price_history or []],
+            })
+            for listing in listings
+        ]
+
+    assert len(measure(benchmark, convert, rows)) == rows
+
+def bench_event_publish(benchmark: Any, rows: int) -> None:
+    """One real-time event per record, as TradeService publishes them: model_dump() plus the JSON encode."""
+    items = make_items(rows)
+    pubsub = PubSub()
+    publisher = EventPublisher(webhook_service=NoWebhooks(), redis_client=pubsub)
+
+    def publish_all() -> None:
+        pubsub.messages.clear()
+        for item in items:
+            run_sync(publisher.publish("marketplace.item_listed", item.model_dump(), is_realtime=True))
+
+    measure(benchmark, publish_all, rows)
+    assert len(pubsub.messages) == rows
+
+def bench_webhook_signing(benchmark: Any, rows: int) -> None:
+    """Encoding and HMAC-signing one delivery body per event, as send_webhook_task does."""
+    payloads = [
+        {"event_type": "trade.submitted", "timestamp": "2024-01-01T00:00:00Z", "data": listing.model_dump()}
+        for listing in make_listings(rows)
+    ]
+    signed = measure(benchmark, lambda: [sign_payload(payload, "whsec_benchmark") for payload in payloads], rows)
+    assert len(signed) == rows
@@ -0,0 +1,22 @@
+"""
+Per-row micro-benchmarks for adapter and serialization hot paths (pytest-benchmark).
+
+Each benchmark runs at 1, 100 and 10,000 rows and records, next to the timing
+stats, the time and traced allocation peak per row. Runs are saved as JSON
+under benchmarks/micro/history, so a later run can be compared against them:
+
+    PYTHONPATH=app:. pytest benchmarks/micro
+    PYTHONPATH=app:. pytest benchmarks/micro --benchmark-compare --benchmark-compare-fail=mean:10%
+
+Fakes stand in for the Redis and Mongo clients and never suspend, so the
+coroutines are driven without an event loop and only Python-side work is timed.
+"""
+from typing import Any
+
+import pytest
+
+from support import SIZES
+
+@pytest.fixture(params=SIZES, ids=lambda rows: f"rows={rows}")
+def rows(request: Any) -> int:
+    return request.param
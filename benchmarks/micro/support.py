@@ -0,0 +1,57 @@
+"""Helpers shared by the micro-benchmarks."""
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Coroutine, List
+
+SIZES = [1, 100, 10_000]
+
+def run_sync(coro: Coroutine) -> Any:
+    """Runs a coroutine that completes without suspending."""
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    coro.close()
+    raise RuntimeError("Benchmarked coroutine awaited real I/O")
+
+def make_listings(count: int) -> List[Any]:
+    from models.trade import PropertyListing
+
+    return [
+        PropertyListing(
+            id=f"listing-{i}", user_id=f"user-{i % 50}", name=f"Listing {i}", address=f"{i} Main St",
+            image_url="images/property-1.jpg", token_symbol="BRDG", current_price=100.0 + i / 7, price_unit="USDC",
+            apy=5.5, valuation=1_000_000.0, tokens_offered=2_500, total_tokens=10_000, is_favorite=False, status="For Sale",
+            price_history=[{"date": f"2024-01-{d % 28 + 1:02d}", "price": 100.0 + d / 3} for d in range(30)],
+        )
+        for i in range(count)
+    ]
+
+def make_items(count: int) -> List[Any]:
+    from models.property import PropertyMarketplaceItem
+
+    listed = datetime(2024, 1, 1)
+    return [
+        PropertyMarketplaceItem(
+            id=f"item-{i}", user_id=f"user-{i % 50}", title=f"Item {i}", location=f"{i} Ocean Dr", price="$1,000,000",
+            numeric_price=1_000_000.0, token_price="$100", total_tokens=10_000, available_tokens=5_000,
+            image="images/property-2.jpg", type="SFR", roi="6.1%", date_listed=listed, created_at=listed, status="For Sale",
+        )
+        for i in range(count)
+    ]
+
+def measure(benchmark: Any, fn: Callable[[], Any], rows: int) -> Any:
+    """Benchmarks `fn`, then runs it once under tracemalloc; per-row figures go into the saved JSON."""
+    result = benchmark(fn)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["rows"] = rows
+    benchmark.extra_info["alloc_peak_bytes"] = peak
+    benchmark.extra_info["alloc_peak_bytes_per_row"] = round(peak / rows, 1)
+    if benchmark.stats is not None: # None under --benchmark-disable
+        benchmark.extra_info["mean_ns_per_row"] = round(benchmark.stats.stats.mean * 1e9 / rows, 1)
+    return result
@@ -0,0 +1,37 @@
+"""
+Compares full validation with the trusted-read fast path for 10,000 stored rows.
+
+    PYTHONPATH=app python benchmarks/trusted_reads.py
+"""
+import time
+
+from adapters.validation import load_model
+from models.user import User, Wallet
+
+ROWS = 10_000
+
+def rows_for(model_type):
+    if model_type is User:
+        return [
+            {"id": str(i), "display_name": f"User {i}", "email": f"user{i}@example.com", "phone": "+12025550123", "user_metadata": {}}
+            for i in range(ROWS)
+        ]
+    return [
+        {"id": str(i), "user_id": "u1", "address": f"0x{i:040x}", "balance": 1.5, "created_at": "2024-01-01T00:00:00",
+         "nfts": [{"id": f"n{i}", "token_id": str(i)}]}
+        for i in range(ROWS)
+    ]
+
+def main() -> None:
+    for model_type in (User, Wallet):
+        rows = rows_for(model_type)
+        for trusted in (False, True):
+            started = time.perf_counter()
+            for row in rows:
+                load_model(model_type, row, trusted)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            label = "trusted" if trusted else "validated"
+            print(f"{model_type.__name__:<7} {label:<10} {elapsed_ms:8.1f} ms for {ROWS} rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compares the old copy-into-dataclass conversion with returning Pydantic models
+directly, for a 1,000-listing `listings` response.
+
+    PYTHONPATH=app python benchmarks/type_conversion.py
+"""
+import asyncio
+import time
+import tracemalloc
+from typing import cast
+
+import strawberry
+import strawberry.federation as federation
+
+from models.trade import PropertyListing
+from schema.conversion import strawberry_config
+from schema.types.trade_type import PriceHistoryEntryType, PropertyListingType
+
+LISTINGS = 1000
+HISTORY_POINTS = 30
+QUERY = "{ listings { id name currentPrice valuation status priceHistory { date price } } }"
+
+def make_listings() -> list[PropertyListing]:
+    return [
+        PropertyListing(
+            id=str(i), user_id="owner", name=f"Listing {i}", address=f"{i} Main St", image_url="listing.jpg",
+            token_symbol="BRDG", current_price=100.0 + i, price_unit="USDC", valuation=1_000_000.0, status="For Sale",
+            price_history=[{"date": f"2024-01-{d % 28 + 1:02d}", "price": 100.0 + d} for d in range(HISTORY_POINTS)],
+        )
+        for i in range(LISTINGS)
+    ]
+
+def build_schema(listings: list[PropertyListing], copy: bool) -> federation.Schema:
+    @strawberry.type
+    class Query:
+        @strawberry.field
+        def listings(self) -> list[PropertyListingType]:
+            if copy: # What resolvers used to do for every row
+                return [
+                    PropertyListingType(**{
+                        **listing.model_dump(),
+                        "price_history": [PriceHistoryEntryType.from_pydantic(e) for e in listing.price_history or []],
+                    })
+                    for listing in listings
+                ]
+            return cast(list[PropertyListingType], listings)
+
+    return federation.Schema(query=Query, config=strawberry_config)
+
+async def measure(schema: federation.Schema, rounds: int = 5) -> tuple[float, int]:
+    await schema.execute(QUERY) # Warm up schema caches
+    started = time.perf_counter()
+    for _ in range(rounds):
+        result = await schema.execute(QUERY)
+        assert result.errors is None, result.errors
+    elapsed_ms = (time.perf_counter() - started) * 1000 / rounds
+
+    tracemalloc.start()
+    await schema.execute(QUERY)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak
+
+async def main() -> None:
+    listings = make_listings()
+    for label, copy in (("model_dump copy", True), ("direct models", False)):
+        elapsed_ms, peak = await measure(build_schema(listings, copy))
+        print(f"{label:<16} {elapsed_ms:8.1f} ms/request   peak {peak / 1024 / 1024:6.2f} MiB")
+
+if __name__ == "__main__":
+    asyncio.run(main())
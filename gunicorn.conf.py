@@ -0,0 +1,54 @@
+"""
+Production launcher: one gunicorn master, one uvicorn worker per available CPU.
+
+    gunicorn -c gunicorn.conf.py
+
+WORKERS (0: one per CPU, capped by the container's quota) and BIND override the
+defaults. The app is imported once in the master (preload_app) so the schema,
+settings and models are built before forking and shared copy-on-write; clients
+that hold sockets (Redis pools, the Motor client) are created lazily, in each
+worker. Pools are sized per worker from deployment-wide budgets, and workers
+coordinate over Redis (see app/utils/coordination.py). Prometheus metrics are
+written per worker to PROMETHEUS_MULTIPROC_DIR and aggregated by /metrics.
+"""
+import gc
+import glob
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(ROOT, "app"), ROOT] # app.main imports by bare module paths
+
+from utils.workers import worker_count
+
+workers = worker_count(int(os.environ.get("WORKERS", "0")))
+os.environ["WORKERS"] = str(workers) # The app sizes its connection pools for this many workers
+
+# Set before the app (and prometheus_client) is preloaded, so every metric is file-backed. Files left by
+# a previous run would be counted again, so the directory is emptied on start.
+metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "api-central-metrics"))
+os.makedirs(metrics_dir, exist_ok=True)
+for stale in glob.glob(os.path.join(metrics_dir, "*.db")):
+    os.remove(stale)
+
+wsgi_app = "app.main:app"
+worker_class = "uvicorn_worker.UvicornWorker"
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+preload_app = True
+timeout = 60
+graceful_timeout = 30 # Workers drain, flush write-behind records and close sockets on shutdown
+keepalive = 5
+
+def when_ready(server):
+    # Runs in the master after the app is preloaded and before workers fork. Moving the loaded objects
+    # out of the collector's generations keeps collections in the workers from writing to (and so
+    # copying) the shared pages.
+    gc.freeze()
+    server.log.info(f"[Launcher] Preloaded app, starting {workers} workers")
+
+def child_exit(server, worker):
+    # Drops the exited worker's live gauges (pool usage, backend health) from the aggregate; its counters
+    # and histograms are kept so totals never go backwards
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,5 +1,9 @@
+import os
 import pytest
 
+# Read when config is first imported: GraphQL operations in tests fail on N+1 adapter calls
+os.environ.setdefault("N_PLUS_ONE_DETECTION", "raise")
+
 @pytest.fixture(scope="session")
 def anyio_backend():
     return "asyncio"
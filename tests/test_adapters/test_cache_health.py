@@ -0,0 +1,189 @@
+import asyncio
+
+import pytest
+import fakeredis
+from pydantic import BaseModel
+from adapters.base import AbstractStorageAdapter
+from adapters.cache_health import CLOSED, OPEN, CacheHealth
+from adapters.caching_adapter import CachingAdapter
+from adapters.redis_adapter import RedisAdapter
+
+class Listing(BaseModel):
+    id: str
+    price: float
+
+class MemoryAdapter(AbstractStorageAdapter):
+    """Primary store that counts its reads."""
+
+    def __init__(self):
+        self.records = {}
+        self.reads = 0
+
+    async def create(self, model_instance):
+        self.records[model_instance.id] = model_instance
+        return model_instance
+
+    async def read(self, model_type, id):
+        self.reads += 1
+        return self.records.get(id)
+
+    async def read_many(self, model_type, ids):
+        self.reads += len(ids)
+        return [self.records.get(id) for id in ids]
+
+    async def update(self, model_instance):
+        self.records[model_instance.id] = model_instance
+        return model_instance
+
+    async def delete(self, model_type, id):
+        self.records.pop(id, None)
+
+    async def list(self, model_type):
+        return list(self.records.values())
+
+class SlowCache(RedisAdapter):
+    """Redis cache whose reads take `delay` seconds."""
+
+    delay = 0.0
+
+    async def read(self, model_type, id):
+        await asyncio.sleep(self.delay)
+        return await super().read(model_type, id)
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+@pytest.fixture
+def redis_client(server):
+    return fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+@pytest.fixture
+def health(clock):
+    return CacheHealth(error_rate=0.5, slow_call_seconds=0.02, window=4, min_calls=4, probe_interval=5.0, clock=clock)
+
+@pytest.fixture
+def primary():
+    return MemoryAdapter()
+
+@pytest.fixture
+def cache(redis_client):
+    return SlowCache(client=redis_client)
+
+@pytest.fixture
+def adapter(cache, primary, health):
+    return CachingAdapter(cache=cache, primary=primary, health=health, read_timeout=0.05, invalidate_timeout=0.05)
+
+async def settle(health):
+    if health.replay_task is not None:
+        await health.replay_task
+
+def test_breaker_opens_on_errors_and_probes_to_recover(health, clock):
+    for succeeded in (True, False, True, False):
+        assert health.allow()
+        health.record(succeeded, 0.001)
+    assert health.state == OPEN
+    assert not health.allow()
+
+    clock.now += 5.0
+    assert health.allow() # The probe
+    assert not health.allow() # Only one at a time
+    health.record(False, 0.001)
+    assert not health.allow() # Failed: wait for the next interval
+
+    clock.now += 5.0
+    assert health.allow()
+    health.record(True, 0.001)
+    assert health.state == CLOSED
+
+def test_breaker_opens_on_latency(health):
+    for _ in range(4):
+        health.record(True, 0.03)
+    assert health.state == OPEN
+
+def test_pending_ledger_drops_oldest(clock):
+    health = CacheHealth(max_pending=2, clock=clock)
+    for id in ("a", "b", "a", "c"):
+        health.defer_invalidation(Listing, id)
+    assert [id for _, id, _ in health.pending()] == ["a", "c"]
+
+    (_, _, sequence), _ = health.pending()
+    health.defer_invalidation(Listing, "a") # Deferred again after the snapshot
+    health.invalidated(Listing, "a", sequence)
+    assert health.is_pending(Listing, "a")
+
+@pytest.mark.asyncio
+async def test_reads_bypass_a_failing_cache(adapter, primary, health, server):
+    await primary.create(Listing(id="l1", price=1.0))
+    server.connected = False
+    for _ in range(4):
+        assert (await adapter.read(Listing, "l1")).price == 1.0
+    assert health.state == OPEN
+
+    # Open: the primary serves reads without waiting on the cache
+    assert (await adapter.read(Listing, "l1")).price == 1.0
+    assert await adapter.read_many(Listing, ["l1", "missing"]) == [Listing(id="l1", price=1.0), None]
+
+@pytest.mark.asyncio
+async def test_slow_reads_time_out_and_bypass(adapter, cache, primary, health):
+    await primary.create(Listing(id="l1", price=1.0))
+    cache.delay = 1.0
+    for _ in range(4):
+        assert (await asyncio.wait_for(adapter.read(Listing, "l1"), 0.5)).price == 1.0
+    assert health.state == OPEN
+
+@pytest.mark.asyncio
+async def test_invalidations_during_an_outage_are_replayed(adapter, primary, health, clock, server, redis_client):
+    await primary.create(Listing(id="l1", price=1.0))
+    await adapter.read(Listing, "l1") # Cached
+    assert await redis_client.dbsize() == 1
+
+    server.connected = False
+    await adapter.update(Listing(id="l1", price=2.0)) # Invalidation fails and is deferred
+    assert health.is_pending(Listing, "l1")
+    server.connected = True
+
+    # The stale entry is still in Redis, but reads of the record skip it until the invalidation is replayed
+    assert (await adapter.read(Listing, "l1")).price == 2.0
+    assert await adapter.read_many(Listing, ["l1"]) == [Listing(id="l1", price=2.0)]
+
+    # Any successful cache call replays the ledger
+    await primary.create(Listing(id="l2", price=1.0))
+    await adapter.read(Listing, "l2")
+    await settle(health)
+    assert not health.has_pending
+    assert await redis_client.exists("listing:l1") == 0
+    assert (await adapter.read(Listing, "l1")).price == 2.0 # Refilled from the primary
+
+@pytest.mark.asyncio
+async def test_probe_recovers_and_replays(adapter, primary, health, clock, server, redis_client):
+    await primary.create(Listing(id="l1", price=1.0))
+    await adapter.read(Listing, "l1")
+    server.connected = False
+    for _ in range(4):
+        await adapter.read(Listing, "missing")
+    assert health.state == OPEN
+
+    server.connected = True
+    await adapter.delete(Listing, "l1") # Open: deferred without calling the cache
+    assert health.is_pending(Listing, "l1")
+    assert await redis_client.exists("listing:l1") == 1
+
+    clock.now += 5.0
+    await adapter.read(Listing, "missing") # The probe
+    assert health.state == CLOSED
+    await settle(health)
+    assert not health.has_pending
+    assert await redis_client.exists("listing:l1") == 0
+    assert await adapter.read(Listing, "l1") is None
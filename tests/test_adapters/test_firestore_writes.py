@@ -0,0 +1,87 @@
+import itertools
+import pytest
+from adapters.firestore_adapter import FIRESTORE_BATCH_LIMIT, FirestoreAdapter
+from models.auction import BidHistoryEntry
+
+_ids = itertools.count()
+
+class FakeWriteResult:
+    update_time = "2024-01-01T00:00:00Z"
+
+class FakeRef:
+    def __init__(self, store, id=None):
+        self.store = store
+        self.id = id or f"gen{next(_ids)}"
+
+    async def get(self):
+        raise AssertionError("writes must not read the document back")
+
+    async def create(self, data):
+        assert self.id not in self.store
+        self.store[self.id] = dict(data)
+        return FakeWriteResult()
+
+    async def set(self, data, merge=False):
+        self.store.setdefault(self.id, {}).update(data)
+        return FakeWriteResult()
+
+class FakeBatch:
+    def __init__(self, client):
+        self.client = client
+        self.writes = []
+
+    def create(self, ref, data):
+        self.writes.append((ref, data))
+
+    def set(self, ref, data, merge=False):
+        self.writes.append((ref, data))
+
+    async def commit(self):
+        self.client.commits.append(len(self.writes))
+        for ref, data in self.writes:
+            ref.store.setdefault(ref.id, {}).update(data)
+        return [FakeWriteResult() for _ in self.writes]
+
+class FakeClient:
+    def __init__(self):
+        self.store = {}
+        self.commits = []
+
+    def collection(self, _):
+        return self
+
+    def document(self, id=None):
+        return FakeRef(self.store, id)
+
+    def batch(self):
+        return FakeBatch(self)
+
+def bid(i: int) -> BidHistoryEntry:
+    return BidHistoryEntry(id="", bidder="alice", amount=str(i), time="now", timestamp=i)
+
+@pytest.fixture
+def adapter():
+    adapter = FirestoreAdapter.__new__(FirestoreAdapter)
+    adapter.client = FakeClient()
+    adapter.trusted_reads = False
+    return adapter
+
+@pytest.mark.asyncio
+async def test_create_and_update_return_written_state_without_reading_back(adapter):
+    created = await adapter.create(bid(1))
+    assert created.id in adapter.client.store and created.amount == "1"
+
+    updated = await adapter.update(created.model_copy(update={"amount": "2"}))
+    assert updated.amount == "2" and adapter.client.store[created.id]["amount"] == "2"
+
+@pytest.mark.asyncio
+async def test_create_many_commits_in_batches(adapter):
+    created = await adapter.create_many([bid(i) for i in range(FIRESTORE_BATCH_LIMIT + 10)])
+
+    assert adapter.client.commits == [FIRESTORE_BATCH_LIMIT, 10]
+    assert [entry.timestamp for entry in created] == list(range(FIRESTORE_BATCH_LIMIT + 10))
+    assert len({entry.id for entry in created}) == len(created)
+
+    updated = await adapter.update_many([entry.model_copy(update={"bidder": "bob"}) for entry in created[:3]])
+    assert adapter.client.commits[-1] == 3
+    assert all(adapter.client.store[entry.id]["bidder"] == "bob" for entry in updated)
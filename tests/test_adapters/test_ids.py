@@ -0,0 +1,86 @@
+import uuid
+import pytest
+import fakeredis
+from bson.objectid import ObjectId
+from pydantic import BaseModel
+from adapters.caching_adapter import CachingAdapter
+from adapters.ids import InvalidIdError, id_codec, normalize_id
+from adapters.mongodb_adapter import MongoDBAdapter
+from adapters.redis_adapter import RedisAdapter
+from config import settings
+from models.webhook import Webhook
+
+class Account(BaseModel):
+    id: str
+    name: str
+
+class Order(BaseModel):
+    id: str
+    total: int
+
+@pytest.fixture(autouse=True)
+def codecs(monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_ID_CODECS", {"Webhook": "string", "Account": "uuid", "Order": "objectid"})
+
+def test_codecs_normalize_to_one_canonical_form():
+    value = uuid.uuid4()
+    assert id_codec(Account).normalize(str(value).upper()) == str(value)
+    assert id_codec(Account).normalize(value.hex) == str(value)
+    object_id = ObjectId()
+    assert id_codec(Order).normalize(str(object_id).upper()) == str(object_id)
+    assert id_codec(Order).to_native(str(object_id)) == object_id
+    assert id_codec(Webhook).to_native("hook-1") == "hook-1"
+    with pytest.raises(InvalidIdError):
+        id_codec(Order).normalize("hook-1")
+    assert normalize_id(Account, "not-a-uuid") is None
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+        self.queries = []
+
+    async def find_one(self, query, projection=None):
+        self.queries.append(query)
+        document = self.documents.get(query["_id"])
+        return dict(document, _id=query["_id"]) if document else None
+
+@pytest.fixture
+def mongodb_adapter():
+    adapter = MongoDBAdapter.__new__(MongoDBAdapter)
+    adapter.trusted_reads = False
+    adapter.db = {}
+    return adapter
+
+@pytest.mark.asyncio
+async def test_mongodb_reads_string_keyed_webhooks(mongodb_adapter):
+    hook = {"target_url": "https://example.com", "event_type": "trade.completed", "secret": "s"}
+    mongodb_adapter.db["webhook"] = FakeCollection({"hook-1": hook})
+
+    found = await mongodb_adapter.read(Webhook, "hook-1")
+
+    assert found is not None and found.id == "hook-1"
+
+@pytest.mark.asyncio
+async def test_mongodb_skips_lookups_for_invalid_ids(mongodb_adapter):
+    object_id = ObjectId()
+    mongodb_adapter.db["order"] = FakeCollection({object_id: {"total": 3}})
+
+    assert (await mongodb_adapter.read(Order, str(object_id))).total == 3
+    assert await mongodb_adapter.read(Order, "not-an-object-id") is None
+    assert mongodb_adapter.db["order"].queries == [{"_id": object_id}] # The invalid ID never reached the server
+
+@pytest.mark.asyncio
+async def test_caching_adapter_uses_canonical_keys():
+    cache = RedisAdapter()
+    cache.client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    primary = RedisAdapter()
+    primary.client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    account_id = str(uuid.uuid4())
+    await primary.create(Account(id=account_id, name="Ann"))
+    adapter = CachingAdapter(cache=cache, primary=primary)
+
+    assert (await adapter.read(Account, account_id.upper())).name == "Ann" # Miss, filled under the canonical key
+    assert await cache.client.exists(f"account:{account_id}")
+    [cached] = await adapter.read_many(Account, [uuid.UUID(account_id).hex])
+    assert cached.name == "Ann"
+    assert await adapter.read(Account, "not-a-uuid") is None
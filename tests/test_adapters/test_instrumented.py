@@ -0,0 +1,62 @@
+import pytest
+import fakeredis
+from prometheus_client import REGISTRY
+from pydantic import BaseModel
+from adapters.caching_adapter import CachingAdapter
+from adapters.instrumented import InstrumentedAdapter
+from adapters.redis_adapter import RedisAdapter
+from utils.metrics import preregister
+
+class Gauge(BaseModel):
+    id: str
+    value: int
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+@pytest.fixture
+def redis_adapter():
+    adapter = RedisAdapter()
+    adapter.client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    return adapter
+
+@pytest.mark.asyncio
+async def test_records_latency_rows_bytes_and_errors(redis_adapter):
+    adapter = InstrumentedAdapter(redis_adapter, "test")
+    labels = {"backend": "test", "model": "Gauge"}
+
+    await adapter.create(Gauge(id="g1", value=1))
+    await adapter.create(Gauge(id="g2", value=2))
+    assert await adapter.read(Gauge, "g1") is not None
+    assert len([g async for g in adapter.iter(Gauge)]) == 2
+    with pytest.raises(RuntimeError):
+        await adapter.create(Gauge(id="g1", value=3)) # Already exists
+
+    assert sample("storage_operation_seconds_count", operation="create", **labels) == 3
+    assert sample("storage_operation_errors_total", operation="create", **labels) == 1
+    assert sample("storage_rows_total", operation="read", **labels) == 1
+    assert sample("storage_rows_total", operation="iter", **labels) == 2
+    assert sample("storage_payload_bytes_total", operation="read", **labels) == len(Gauge(id="g1", value=1).model_dump_json())
+    assert adapter.client is redis_adapter.client # Other attributes reach the wrapped adapter
+
+@pytest.mark.asyncio
+async def test_caching_adapter_counts_hits_and_misses(redis_adapter):
+    primary = RedisAdapter()
+    primary.client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    await primary.create(Gauge(id="g1", value=1))
+    adapter = CachingAdapter(cache=redis_adapter, primary=primary)
+    before_hits = sample("cache_requests_total", tier="redis", model="Gauge", result="hit")
+    before_misses = sample("cache_requests_total", tier="redis", model="Gauge", result="miss")
+
+    await adapter.read(Gauge, "g1") # Miss, then filled
+    await adapter.read(Gauge, "g1")
+    await adapter.read_many(Gauge, ["g1", "g2"])
+
+    assert sample("cache_requests_total", tier="redis", model="Gauge", result="hit") - before_hits == 2
+    assert sample("cache_requests_total", tier="redis", model="Gauge", result="miss") - before_misses == 2
+
+def test_preregistered_series_are_exported_at_zero():
+    preregister(["prereg"], ["Gauge"])
+    assert REGISTRY.get_sample_value(
+        "storage_operation_seconds_count", {"backend": "prereg", "model": "Gauge", "operation": "read_many"}
+    ) == 0.0
@@ -0,0 +1,56 @@
+import pytest
+import fakeredis
+from adapters.base import AbstractStorageAdapter
+from adapters.caching_adapter import CachingAdapter
+from adapters.redis_adapter import RedisAdapter
+from models.auction import BidHistoryEntry
+
+def bid(i: int, bidder: str) -> BidHistoryEntry:
+    return BidHistoryEntry(id=f"b{i}", bidder=bidder, amount=str(i), time="now", timestamp=i)
+
+class ListOnlyAdapter(AbstractStorageAdapter):
+    """Adapter without a streaming implementation, exercising the base fallback."""
+
+    def __init__(self, records):
+        self.records = records
+
+    async def create(self, model_instance): return model_instance
+    async def read(self, model_type, id): return None
+    async def update(self, model_instance): return model_instance
+    async def delete(self, model_type, id): pass
+    async def list(self, model_type): return list(self.records)
+
+@pytest.fixture
+def redis_adapter():
+    adapter = RedisAdapter()
+    adapter.client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    return adapter
+
+@pytest.mark.asyncio
+async def test_redis_iter_scans_in_batches_and_filters(redis_adapter):
+    for i in range(25):
+        await redis_adapter.create(bid(i, "alice" if i % 5 == 0 else "bob"))
+    mgets = []
+    original_mget = redis_adapter.client.mget
+    async def counting_mget(keys):
+        mgets.append(len(keys))
+        return await original_mget(keys)
+    redis_adapter.client.mget = counting_mget
+
+    found = [entry async for entry in redis_adapter.iter(BidHistoryEntry, {"bidder": "alice"}, batch_size=10)]
+
+    assert sorted(entry.timestamp for entry in found) == [0, 5, 10, 15, 20]
+    assert max(mgets) <= 10 and sum(mgets) == 25
+
+@pytest.mark.asyncio
+async def test_base_fallback_filters_in_memory():
+    adapter = ListOnlyAdapter([bid(1, "alice"), bid(2, "bob")])
+    assert [e.id async for e in adapter.iter(BidHistoryEntry, {"bidder": "bob"})] == ["b2"]
+    assert len([e async for e in adapter.iter(BidHistoryEntry)]) == 2
+
+@pytest.mark.asyncio
+async def test_caching_adapter_streams_from_primary(redis_adapter):
+    primary = ListOnlyAdapter([bid(1, "alice")])
+    adapter = CachingAdapter(cache=redis_adapter, primary=primary)
+    assert [e.id async for e in adapter.iter(BidHistoryEntry)] == ["b1"]
+    assert await redis_adapter.client.dbsize() == 0 # Scans never fill the cache
@@ -41,7 +41,9 @@ async def test_create(mongodb_adapter):
     created_instance = await mongodb_adapter.create(test_instance)
 
     mongodb_adapter.db["testmodel"].insert_one.assert_called_once()
-    assert created_instance.id == "test_id"
+    # The ID comes from the model's ID codec, so it is known before the insert and stored as '_id'
+    inserted = mongodb_adapter.db["testmodel"].insert_one.call_args.args[0]
+    assert created_instance.id and inserted["_id"] == created_instance.id
     assert created_instance.name == "Test Item"
     assert created_instance.value == 123
 
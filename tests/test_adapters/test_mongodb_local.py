@@ -0,0 +1,65 @@
+"""
+Runs against a real mongod (MONGODB_TEST_URL, default localhost) and is skipped when none is reachable.
+"""
+import os
+import uuid
+import pytest
+import pytest_asyncio
+from bson.objectid import ObjectId
+from pydantic import BaseModel
+from pymongo import ASCENDING, IndexModel
+from adapters.mongodb_adapter import MONGODB_INDEXES, MongoDBAdapter
+
+MONGODB_TEST_URL = os.environ.get("MONGODB_TEST_URL", "mongodb://localhost:27017/?serverSelectionTimeoutMS=500")
+
+class Hook(BaseModel):
+    id: str
+    target_url: str
+    event_type: str
+    is_active: bool = True
+
+@pytest_asyncio.fixture
+async def adapter():
+    adapter = MongoDBAdapter(MONGODB_TEST_URL, f"test_{uuid.uuid4().hex[:8]}")
+    try:
+        await adapter.client.admin.command("ping")
+    except Exception:
+        pytest.skip("no local mongod")
+    yield adapter
+    await adapter.client.drop_database(adapter.db.name)
+
+async def insert(adapter, **fields) -> str:
+    result = await adapter.db["hook"].insert_one({"_id": ObjectId(), "target_url": "https://a", "event_type": "x", **fields})
+    return str(result.inserted_id)
+
+@pytest.mark.asyncio
+async def test_iter_projects_requested_fields(adapter):
+    await insert(adapter, event_type="trade.completed", is_active=True)
+    [hook] = [h async for h in adapter.iter(Hook, {"event_type": "trade.completed"}, fields=["id", "event_type"])]
+    assert hook.event_type == "trade.completed"
+    assert "target_url" not in hook.model_fields_set
+
+@pytest.mark.asyncio
+async def test_update_sets_only_explicitly_set_fields(adapter):
+    id = await insert(adapter, event_type="trade.completed", is_active=True)
+    await adapter.db["hook"].update_one({"_id": ObjectId(id)}, {"$set": {"target_url": "https://changed-elsewhere"}})
+
+    await adapter.update(Hook.model_construct(_fields_set={"id", "is_active"}, id=id, is_active=False))
+
+    document = await adapter.db["hook"].find_one({"_id": ObjectId(id)})
+    assert document["is_active"] is False
+    assert document["target_url"] == "https://changed-elsewhere" # Not overwritten with a stale value
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_is_idempotent(adapter):
+    spec = {Hook: [IndexModel([("event_type", ASCENDING), ("is_active", ASCENDING)], name="event_type_is_active")]}
+    await adapter.ensure_indexes(spec)
+    await adapter.ensure_indexes(spec)
+    assert "event_type_is_active" in await adapter.db["hook"].index_information()
+
+    plan = await adapter.db["hook"].find({"event_type": "x", "is_active": True}).explain()
+    assert "IXSCAN" in str(plan["queryPlanner"]["winningPlan"])
+
+def test_webhook_index_spec_covers_event_publisher_filter():
+    [webhook_indexes] = [indexes for model, indexes in MONGODB_INDEXES.items() if model.__name__ == "Webhook"]
+    assert any(list(index.document["key"]) == ["event_type", "is_active"] for index in webhook_indexes)
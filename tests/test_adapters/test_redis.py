@@ -1,4 +1,5 @@
 import pytest
+import fakeredis
 from adapters.redis_adapter import RedisAdapter
 from models.user import User
 import json
@@ -15,4 +16,26 @@ async def test_redis_get_user(monkeypatch):
 
     monkeypatch.setattr(adapter, "client", MockRedis())
     user = await adapter.get_user("abc123")
-    assert user.email == "redis@example.com"
\ No newline at end of file
+    assert user.email == "redis@example.com"
+
+
+@pytest.mark.asyncio
+async def test_create_many_and_update_many_pipeline():
+    from pydantic import BaseModel
+
+    class Counter(BaseModel):
+        id: str
+        value: int
+
+    adapter = RedisAdapter(ttl_seconds=60)
+    adapter.client = fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    await adapter.create_many([Counter(id="c1", value=1), Counter(id="c2", value=2)])
+    await adapter.update_many([Counter(id="c1", value=10)])
+    assert [c.value for c in await adapter.read_many(Counter, ["c1", "c2"])] == [10, 2]
+    assert 0 < await adapter.client.ttl("counter:c2") <= 60
+
+    with pytest.raises(RuntimeError, match="c2"):
+        await adapter.create_many([Counter(id="c3", value=3), Counter(id="c2", value=5)])
+    assert (await adapter.read(Counter, "c2")).value == 2 # Existing records are not overwritten
+    assert (await adapter.read(Counter, "c3")).value == 3
@@ -0,0 +1,47 @@
+import pytest
+import fakeredis
+from datetime import datetime
+from adapters.redis_adapter import RedisAdapter
+from adapters.validation import construct_trusted, load_model, validation_is_costly
+from models.snft import Transaction, TransactionCategory
+from models.trade import PriceHistoryEntry, PropertyListing
+from models.user import User, Wallet
+
+def test_trusted_construction_skips_validators():
+    # Neither EmailStr nor the phone number validator runs on trusted rows
+    row = {"id": "u1", "display_name": "Ann", "email": "not-an-email", "phone": "n/a", "user_metadata": {}}
+    user = load_model(User, row, trusted=True)
+    assert user.phone == "n/a"
+    with pytest.raises(Exception):
+        load_model(User, row, trusted=False)
+
+def test_models_validated_in_core_keep_the_validated_path():
+    # Python-side construction only beats validation when validators run Python code
+    assert validation_is_costly(User)
+    assert not validation_is_costly(Wallet)
+
+def test_trusted_construction_rebuilds_nested_models_datetimes_and_enums():
+    listing = construct_trusted(PropertyListing, {
+        "id": "p1", "user_id": "u1", "name": "Loft", "address": "1 Main St", "image_url": "x.jpg", "token_symbol": "TKN",
+        "current_price": 1.0, "price_unit": "USD", "valuation": 10.0, "status": "For Sale",
+        "price_history": [{"date": "2024-01-01", "price": 1.0}], "unknown_column": True,
+    })
+    assert isinstance(listing.price_history[0], PriceHistoryEntry)
+    assert listing.apy is None # Default filled in
+    assert not hasattr(listing, "unknown_column")
+
+    transaction = construct_trusted(Transaction, {"id": "t1", "type": TransactionCategory.UNKNOWN.value, "timestamp": "2024-01-01T10:00:00"})
+    assert transaction.type is TransactionCategory.UNKNOWN
+    assert transaction.timestamp == datetime(2024, 1, 1, 10, 0)
+
+@pytest.mark.asyncio
+async def test_trusted_redis_reads_match_validated_reads():
+    adapter = RedisAdapter(trusted_reads=True)
+    adapter.client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    wallet = Wallet(id="w1", user_id="u1", address="0xabc", balance=1.5, created_at=datetime(2024, 1, 1), nfts=[{"id": "n1", "token_id": "7"}])
+    await adapter.create(wallet)
+
+    trusted = await adapter.read(Wallet, "w1")
+    adapter.trusted_reads = False
+    validated = await adapter.read(Wallet, "w1")
+    assert trusted == validated
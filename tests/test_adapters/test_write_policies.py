@@ -0,0 +1,186 @@
+import pytest
+import fakeredis
+from pydantic import BaseModel
+from adapters.base import AbstractStorageAdapter
+from adapters.caching_adapter import CachingAdapter
+from adapters.redis_adapter import RedisAdapter
+from adapters.write_behind import WriteBehindQueue
+from models.user import User
+
+class Listing(BaseModel):
+    id: str
+    price: float
+
+class Counter(BaseModel):
+    id: str
+    value: int
+
+class MemoryAdapter(AbstractStorageAdapter):
+    """Primary store that records every call."""
+
+    def __init__(self):
+        self.records = {}
+        self.calls = []
+
+    async def create(self, model_instance):
+        self.calls.append(("create", model_instance.id))
+        self.records[model_instance.id] = model_instance
+        return model_instance
+
+    async def create_many(self, model_instances):
+        self.calls.append(("create_many", sorted(m.id for m in model_instances)))
+        self.records.update({m.id: m for m in model_instances})
+        return model_instances
+
+    async def read(self, model_type, id):
+        self.calls.append(("read", id))
+        return self.records.get(id)
+
+    async def update(self, model_instance):
+        self.calls.append(("update", model_instance.id))
+        self.records[model_instance.id] = model_instance
+        return model_instance
+
+    async def update_many(self, model_instances):
+        self.calls.append(("update_many", sorted(m.id for m in model_instances)))
+        self.records.update({m.id: m for m in model_instances})
+        return model_instances
+
+    async def delete(self, model_type, id):
+        self.calls.append(("delete", id))
+        self.records.pop(id, None)
+
+    async def list(self, model_type):
+        return list(self.records.values())
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+@pytest.fixture
+def primary():
+    return MemoryAdapter()
+
+@pytest.fixture
+def adapter(redis_client, primary):
+    cache = RedisAdapter()
+    cache.client = redis_client
+    return CachingAdapter(
+        cache=cache,
+        primary=primary,
+        write_policies={"Listing": "write_through", "Counter": "write_behind"},
+        write_behind=WriteBehindQueue(redis_client),
+    )
+
+@pytest.mark.asyncio
+async def test_invalidate_is_the_default(adapter, primary, redis_client):
+    adapter.write_policies = {}
+    await adapter.create(Listing(id="l1", price=1.0))
+    assert await redis_client.dbsize() == 0
+    await adapter.read(Listing, "l1") # Fills the cache
+    await adapter.update(Listing(id="l1", price=2.0))
+    assert not await redis_client.exists("listing:l1")
+
+@pytest.mark.asyncio
+async def test_write_through_serves_the_next_read_from_cache(adapter, primary):
+    await adapter.create(Listing(id="l1", price=1.0))
+    await adapter.update(Listing(id="l1", price=2.0))
+
+    assert (await adapter.read(Listing, "l1")).price == 2.0
+    assert ("read", "l1") not in primary.calls
+
+@pytest.mark.asyncio
+async def test_write_behind_coalesces_and_flushes_in_batches(adapter, primary, redis_client):
+    await adapter.create(Counter(id="c1", value=0))
+    for value in range(1, 6):
+        await adapter.update(Counter(id="c1", value=value))
+    await adapter.update_many([Counter(id="c2", value=7), Counter(id="c3", value=8)])
+
+    assert primary.calls == [] # Nothing written yet
+    assert (await adapter.read(Counter, "c1")).value == 5 # Readers see the queued value
+
+    # A new queue (e.g. after a restart) finds the durable entries
+    written = await WriteBehindQueue(redis_client).flush(primary)
+
+    assert written == 3
+    assert primary.calls == [("create_many", ["c1"]), ("update_many", ["c2", "c3"])]
+    assert primary.records["c1"].value == 5
+    assert await WriteBehindQueue(redis_client).flush(primary) == 0
+
+@pytest.mark.asyncio
+async def test_write_behind_delete_drops_queued_write(adapter, primary):
+    await adapter.update(Counter(id="c1", value=1))
+    await adapter.delete(Counter, "c1")
+    assert await adapter.write_behind.flush(primary) == 0
+    assert "c1" not in primary.records
+
+@pytest.mark.asyncio
+async def test_delete_during_a_flush_is_not_undone(adapter, primary):
+    await adapter.update(Counter(id="c1", value=1))
+    await adapter.update(Counter(id="c2", value=2))
+    update_many = primary.update_many
+    async def racing_update_many(model_instances):
+        await adapter.delete(Counter, "c1") # Lands after the flush claimed c1, before its write
+        return await update_many(model_instances)
+    primary.update_many = racing_update_many
+
+    await adapter.write_behind.flush(primary)
+
+    assert "c1" not in primary.records
+    assert primary.records["c2"].value == 2
+
+    # Re-creating the record under its ID lifts the tombstone
+    primary.update_many = update_many
+    await adapter.update(Counter(id="c1", value=3))
+    assert await adapter.write_behind.flush(primary) == 1
+    assert primary.records["c1"].value == 3
+
+@pytest.mark.asyncio
+async def test_write_behind_assigns_the_id_the_primary_stores(redis_client, primary):
+    adapter = CachingAdapter(
+        cache=RedisAdapter(client=redis_client), primary=primary,
+        write_policies={"User": "write_behind"}, write_behind=WriteBehindQueue(redis_client),
+    )
+    user = User(id=None, display_name="New User", email="new@example.com", phone="+12025550123", user_metadata={})
+
+    created = await adapter.create(user)
+    assert created.id
+    assert await WriteBehindQueue(redis_client).flush(primary) == 1
+
+    assert primary.records[created.id].id == created.id # The flushed record keeps the ID it is cached under
+    assert (await adapter.read(User, created.id)).email == "new@example.com"
+
+def test_write_behind_is_refused_for_models_without_an_id(redis_client, primary):
+    # models.reputation.Reputation has no id field, though models.user.Reputation does
+    with pytest.raises(ValueError, match="models.reputation.Reputation"):
+        CachingAdapter(
+            cache=RedisAdapter(client=redis_client), primary=primary,
+            write_policies={"Reputation": "write_behind"}, write_behind=WriteBehindQueue(redis_client),
+        )
+
+def test_one_queue_per_redis_client(redis_client):
+    from adapters import write_behind_queue
+    assert write_behind_queue(redis_client) is write_behind_queue(redis_client)
+    assert write_behind_queue(fakeredis.FakeAsyncRedis()) is not write_behind_queue(redis_client)
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_retried(adapter, primary, redis_client):
+    await adapter.update(Counter(id="c1", value=1))
+    await adapter.update(Counter(id="c2", value=2))
+    failing = MemoryAdapter()
+    async def broken_update(model_instance):
+        if model_instance.id == "c2":
+            raise RuntimeError("primary unavailable")
+        return await MemoryAdapter.update(failing, model_instance)
+    async def broken_update_many(model_instances):
+        raise RuntimeError("primary unavailable")
+    failing.update = broken_update
+    failing.update_many = broken_update_many
+
+    assert await adapter.write_behind.flush(failing) == 1 # c1 written record by record, c2 kept
+    await adapter.update(Counter(id="c2", value=3)) # Queued behind the in-flight write
+
+    assert await adapter.write_behind.flush(primary) == 1 # Retries the in-flight c2=2 first
+    assert primary.records["c2"].value == 2
+    assert await adapter.write_behind.flush(primary) == 1
+    assert primary.records["c2"].value == 3
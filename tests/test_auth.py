@@ -0,0 +1,69 @@
+import json
+import time
+import pytest
+import jwt
+from jwt.algorithms import RSAAlgorithm
+from cryptography.hazmat.primitives.asymmetric import rsa
+from auth.jwks import JWKSVerifier
+
+def make_key(kid: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return private_key, jwk
+
+def make_token(private_key, kid: str, **claims) -> str:
+    payload = {"sub": "user-1", "role": "user", "exp": int(time.time()) + 60, **claims}
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+@pytest.fixture
+def jwks_file(tmp_path):
+    private_key, jwk = make_key("key-1")
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps({"keys": [jwk]}))
+    return path, private_key
+
+@pytest.mark.asyncio
+async def test_verifies_token_from_local_jwks(jwks_file):
+    path, private_key = jwks_file
+    verifier = JWKSVerifier(jwks_path=str(path))
+    assert await verifier.refresh()
+
+    claims = verifier.verify(make_token(private_key, "key-1"))
+    assert claims["sub"] == "user-1"
+
+@pytest.mark.asyncio
+async def test_unknown_kid_is_rejected_and_schedules_refresh(jwks_file):
+    path, _ = jwks_file
+    verifier = JWKSVerifier(jwks_path=str(path), min_refresh_interval=0)
+    await verifier.refresh()
+
+    other_key, _ = make_key("key-2")
+    with pytest.raises(jwt.InvalidTokenError):
+        verifier.verify(make_token(other_key, "key-2"))
+    assert verifier._refresh_requested.is_set()
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_serving_cached_keys(jwks_file):
+    path, private_key = jwks_file
+    verifier = JWKSVerifier(jwks_path=str(path))
+    await verifier.refresh()
+
+    path.write_text("not json")
+    assert not await verifier.refresh()
+    assert verifier.verify(make_token(private_key, "key-1"))["sub"] == "user-1"
+
+@pytest.mark.asyncio
+async def test_expired_token_raises(jwks_file):
+    path, private_key = jwks_file
+    verifier = JWKSVerifier(jwks_path=str(path))
+    await verifier.refresh()
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        verifier.verify(make_token(private_key, "key-1", exp=int(time.time()) - 10))
+
+def test_hs256_only_accepted_with_shared_secret():
+    token = jwt.encode({"sub": "user-1", "exp": int(time.time()) + 60}, "s" * 32, algorithm="HS256")
+    assert JWKSVerifier(shared_secret="s" * 32).verify(token)["sub"] == "user-1"
+    with pytest.raises(jwt.InvalidTokenError):
+        JWKSVerifier().verify(token)
@@ -0,0 +1,103 @@
+import asyncio
+from types import SimpleNamespace
+import fakeredis
+import fakeredis.aioredis
+import pytest
+import redis.asyncio as redis
+from pymongo import monitoring
+from redis.exceptions import ConnectionError as RedisConnectionError
+from utils.connections import ConnectionManager, MeteredRedisPool, MongoPoolMetrics
+from utils.metrics import BACKEND_UP, POOL_IN_USE, POOL_TIMEOUTS, POOL_WAITING
+
+# Renamed in newer fakeredis releases
+FakeConnection = getattr(fakeredis.aioredis, "FakeAsyncRedisConnection", fakeredis.aioredis.FakeConnection)
+
+def make_pool(name: str, max_connections: int = 1, timeout: float = 0.05) -> MeteredRedisPool:
+    return MeteredRedisPool(
+        name,
+        max_connections=max_connections,
+        timeout=timeout,
+        connection_class=FakeConnection,
+        server=fakeredis.FakeServer(),
+        decode_responses=True,
+    )
+
+def value(metric, name: str) -> float:
+    return metric.labels(name)._value.get()
+
+@pytest.mark.asyncio
+async def test_exhausted_pool_times_out_instead_of_opening_connections():
+    pool = make_pool("test-exhausted")
+    held = await pool.get_connection()
+    assert value(POOL_IN_USE, "test-exhausted") == 1
+
+    with pytest.raises(RedisConnectionError):
+        await pool.get_connection()
+    assert value(POOL_TIMEOUTS, "test-exhausted") == 1
+    assert len(pool._in_use_connections) + len(pool._available_connections) == 1 # No extra socket was opened
+
+    await pool.release(held)
+    assert value(POOL_IN_USE, "test-exhausted") == 0
+
+@pytest.mark.asyncio
+async def test_waiters_queue_for_a_released_connection():
+    pool = make_pool("test-queue", timeout=1.0)
+    held = await pool.get_connection()
+
+    waiter = asyncio.create_task(pool.get_connection())
+    await asyncio.sleep(0.01)
+    assert value(POOL_WAITING, "test-queue") == 1
+    await pool.release(held)
+
+    assert await asyncio.wait_for(waiter, 1.0) is held
+    assert value(POOL_WAITING, "test-queue") == 0
+
+@pytest.mark.asyncio
+async def test_idle_connections_are_closed_and_reconnect_on_use():
+    pool = make_pool("test-idle", max_connections=2)
+    client = redis.Redis(connection_pool=pool)
+    await client.set("k", "v")
+
+    assert await pool.close_idle(max_idle=60) == 0 # Not idle long enough
+    assert await pool.close_idle(max_idle=0) == 1
+    assert not any(connection.is_connected for connection in pool._available_connections)
+    assert await client.get("k") == "v"
+
+@pytest.mark.asyncio
+async def test_check_reports_each_backend():
+    manager = ConnectionManager()
+
+    async def healthy():
+        return True
+
+    async def down():
+        raise ConnectionError("refused")
+
+    manager.watch("test-healthy", healthy)
+    manager.watch("test-down", down)
+
+    assert await manager.check() == {"test-healthy": True, "test-down": False}
+    assert value(BACKEND_UP, "test-healthy") == 1
+    assert value(BACKEND_UP, "test-down") == 0
+
+def test_clients_are_shared_and_built_lazily():
+    manager = ConnectionManager(redis_db=3)
+    assert manager.redis() is manager.redis(3)
+    assert manager.redis(4) is not manager.redis()
+    assert set(manager._pings) == {"redis", "redis/4"}
+    assert manager._redis_pools["redis"].max_connections == manager.redis_max_connections
+    assert manager._mongo == {} and manager._supabase is None # Nothing else until asked for
+
+def test_mongo_pool_events_track_saturation():
+    listener = MongoPoolMetrics("test-mongodb")
+    listener.connection_check_out_started(SimpleNamespace())
+    assert value(POOL_WAITING, "test-mongodb") == 1
+    listener.connection_checked_out(SimpleNamespace(duration=0.01))
+    assert (value(POOL_WAITING, "test-mongodb"), value(POOL_IN_USE, "test-mongodb")) == (0, 1)
+
+    listener.connection_check_out_started(SimpleNamespace())
+    listener.connection_check_out_failed(SimpleNamespace(reason=monitoring.ConnectionCheckOutFailedReason.TIMEOUT))
+    assert value(POOL_TIMEOUTS, "test-mongodb") == 1
+
+    listener.connection_checked_in(SimpleNamespace())
+    assert value(POOL_IN_USE, "test-mongodb") == 0
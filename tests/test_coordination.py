@@ -0,0 +1,87 @@
+import asyncio
+import fakeredis
+import pytest
+import pytest_asyncio
+from utils.coordination import Coordinator
+
+CHANNEL = "realtime_events"
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+@pytest_asyncio.fixture
+async def workers(server):
+    """Two coordinators over one Redis, as two workers of a deployment see it."""
+    coordinators = [
+        Coordinator(fakeredis.FakeAsyncRedis(server=server, decode_responses=True), fanout_channels=[CHANNEL], reconnect_delay=0.01)
+        for _ in range(2)
+    ]
+    for coordinator in coordinators:
+        await coordinator.start()
+    yield coordinators
+    for coordinator in coordinators:
+        await coordinator.stop()
+
+async def eventually(condition, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+@pytest.mark.asyncio
+async def test_broadcast_runs_handlers_once_in_every_worker(workers):
+    calls = {0: [], 1: []}
+    for index, coordinator in enumerate(workers):
+        async def handler(payload, index=index):
+            calls[index].append(payload)
+        coordinator.on("webhooks", handler)
+
+    await workers[0].broadcast("webhooks", {"id": "wh-1"})
+
+    assert calls[0] == [{"id": "wh-1"}] # Locally, before the broadcast returns
+    await eventually(lambda: calls[1] == [{"id": "wh-1"}])
+    await asyncio.sleep(0.05)
+    assert calls[0] == [{"id": "wh-1"}] # Not run again when our own message comes back
+
+@pytest.mark.asyncio
+async def test_fan_out_reaches_every_local_listener(workers, server):
+    queues = [workers[0].listen(CHANNEL), workers[0].listen(CHANNEL), workers[1].listen(CHANNEL)]
+
+    await fakeredis.FakeAsyncRedis(server=server).publish(CHANNEL, b'{"event_type":"trade.completed"}')
+
+    for queue in queues:
+        assert await asyncio.wait_for(queue.get(), 2.0) == '{"event_type":"trade.completed"}'
+
+@pytest.mark.asyncio
+async def test_slow_listener_keeps_the_newest_messages(workers):
+    queue = workers[0].listen(CHANNEL, max_queued=2)
+    for n in range(4):
+        workers[0]._fan_out(CHANNEL, str(n))
+    assert [queue.get_nowait(), queue.get_nowait()] == ["2", "3"]
+
+@pytest.mark.asyncio
+async def test_unlisten_stops_delivery(workers):
+    queue = workers[0].listen(CHANNEL)
+    workers[0].unlisten(CHANNEL, queue)
+    workers[0]._fan_out(CHANNEL, "event")
+    assert queue.empty()
+    with pytest.raises(ValueError):
+        workers[0].listen("unknown")
+
+@pytest.mark.asyncio
+async def test_handlers_reload_after_the_subscription_drops(server):
+    coordinator = Coordinator(fakeredis.FakeAsyncRedis(server=server, decode_responses=True), reconnect_delay=0.01, ready_timeout=0.05)
+    reloads = []
+
+    async def handler(payload):
+        reloads.append(payload)
+
+    coordinator.on("webhooks", handler)
+    server.connected = False
+    await coordinator.start() # Does not fail startup while Redis is unreachable
+    try:
+        server.connected = True
+        await eventually(lambda: reloads == [None]) # Broadcasts may have been missed: reload everything
+    finally:
+        await coordinator.stop()
@@ -0,0 +1,49 @@
+import threading
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from api import profiling
+from utils.profiler import SamplingProfiler, collapsed_stacks
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(100))
+
+def make_client(role="admin"):
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def set_role(request: Request, call_next):
+        request.state.role = role
+        return await call_next(request)
+
+    app.include_router(profiling.router)
+    return TestClient(app)
+
+def test_sampler_sees_other_threads_as_collapsed_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+    worker.start()
+    try:
+        profiler = SamplingProfiler(interval=0.001)
+        stacks = profiler.run(0.1)
+    finally:
+        stop.set()
+        worker.join()
+
+    busy = {stack: count for stack, count in stacks.items() if stack.startswith("busy;")}
+    assert busy and all("busy_loop (" in stack for stack in busy)
+    assert profiler.samples > 10
+    assert not any("utils/profiler.py" in stack for stack in stacks) # The sampling thread skips itself
+    lines = collapsed_stacks(stacks).splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+def test_profile_endpoint_returns_folded_stacks_for_admins():
+    response = make_client().get("/admin/profile", params={"seconds": 0.05, "interval_ms": 1})
+    assert response.status_code == 200
+    assert response.headers["content-disposition"].endswith('.folded"')
+    assert int(response.headers["x-profile-samples"]) > 0
+    assert response.text.splitlines()[0].rsplit(" ", 1)[1].isdigit()
+
+def test_profile_endpoint_is_admin_only_and_bounded():
+    assert make_client(role="user").get("/admin/profile", params={"seconds": 0.01}).status_code == 403
+    assert make_client().get("/admin/profile", params={"seconds": 3600}).status_code == 422
@@ -0,0 +1,119 @@
+import asyncio
+import pytest
+import fakeredis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from auth.rate_limit import RateLimiter, RateLimitRule, RateLimitMiddleware
+from schema.extensions.persisted_queries import PersistedQueryStore, query_hash
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+@pytest.mark.asyncio
+async def test_sliding_window_rejects_over_limit(redis_client):
+    limiter = RateLimiter(redis_client, local_reserve=0)
+    rule = RateLimitRule(name="test", limit=3, window_seconds=60, algorithm="sliding_window")
+
+    results = [await limiter.check(rule, "user:1") for _ in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert results[-1].retry_after > 0
+    # Other identities have their own window
+    assert (await limiter.check(rule, "user:2")).allowed
+
+@pytest.mark.asyncio
+async def test_token_bucket_rejects_when_empty(redis_client):
+    limiter = RateLimiter(redis_client, local_reserve=0)
+    rule = RateLimitRule(name="test", limit=2, window_seconds=60)
+
+    assert (await limiter.check(rule, "ip:1.2.3.4")).allowed
+    assert (await limiter.check(rule, "ip:1.2.3.4")).allowed
+    denied = await limiter.check(rule, "ip:1.2.3.4")
+    assert not denied.allowed and denied.retry_after > 0
+
+@pytest.mark.asyncio
+async def test_local_reserve_avoids_redis_round_trips(redis_client):
+    limiter = RateLimiter(redis_client, local_reserve=5)
+    calls = []
+    script = limiter._scripts["token_bucket"]
+
+    async def counting_script(keys, args):
+        calls.append(args[-1])
+        return await script(keys=keys, args=args)
+
+    limiter._scripts["token_bucket"] = counting_script
+    rule = RateLimitRule(name="test", limit=100, window_seconds=60)
+    for _ in range(10):
+        assert (await limiter.check(rule, "user:1")).allowed
+    assert calls == [5, 5] # Two leases of five tokens served ten checks
+
+@pytest.mark.asyncio
+async def test_reserve_falls_back_to_single_token(redis_client):
+    limiter = RateLimiter(redis_client, local_reserve=5)
+    rule = RateLimitRule(name="test", limit=3, window_seconds=60)
+    # A batch larger than the bucket cannot be leased, but single requests still go through
+    assert [(await limiter.check(rule, "user:1")).allowed for _ in range(4)] == [True, True, True, False]
+
+def test_middleware_limits_protected_mutation(redis_client):
+    app = FastAPI()
+
+    @app.post("/graphql")
+    async def graphql():
+        return {"data": {}}
+
+    operation_rules = {"createListing": RateLimitRule(name="createListing", limit=1, window_seconds=60, algorithm="sliding_window")}
+    app.add_middleware(RateLimitMiddleware, limiter=RateLimiter(redis_client, local_reserve=0), rules=[], operation_rules=operation_rules)
+    client = TestClient(app)
+
+    mutation = {"query": "mutation { createListing(listingData: {}) { id } }"}
+    assert client.post("/graphql", json=mutation).status_code == 200
+    response = client.post("/graphql", json=mutation)
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+    # Unprotected operations are not affected
+    assert client.post("/graphql", json={"query": "{ listings { id } }"}).status_code == 200
+
+def test_forwarded_for_is_only_trusted_from_known_proxies(redis_client):
+    app = FastAPI()
+
+    @app.get("/")
+    async def index():
+        return {}
+
+    rules = [RateLimitRule(name="ip", limit=1, window_seconds=60, algorithm="sliding_window", scope="ip")]
+    limiter = RateLimiter(redis_client, local_reserve=0)
+    app.add_middleware(RateLimitMiddleware, limiter=limiter, rules=rules, operation_rules={})
+    client = TestClient(app) # Peer "testclient", not a trusted proxy
+
+    assert client.get("/", headers={"X-Forwarded-For": "203.0.113.1"}).status_code == 200
+    # A new spoofed address per request no longer buys a new allowance
+    assert client.get("/", headers={"X-Forwarded-For": "203.0.113.2"}).status_code == 429
+
+    proxied = FastAPI()
+    proxied.add_api_route("/", index)
+    proxied.add_middleware(RateLimitMiddleware, limiter=limiter, rules=rules, operation_rules={}, trusted_proxies=["10.0.0.0/8"])
+    client = TestClient(proxied, client=("10.0.0.5", 50000))
+
+    # Behind the proxy, the client is the last hop it did not add; entries to its left are client-supplied
+    assert client.get("/", headers={"X-Forwarded-For": "198.51.100.7, 203.0.113.9, 10.0.0.6"}).status_code == 200
+    assert client.get("/", headers={"X-Forwarded-For": "198.51.100.8, 203.0.113.9"}).status_code == 429
+    assert client.get("/", headers={"X-Forwarded-For": "203.0.113.10"}).status_code == 200
+
+def test_persisted_hash_is_limited_like_its_query(redis_client):
+    app = FastAPI()
+
+    @app.post("/graphql")
+    async def graphql():
+        return {"data": {}}
+
+    query = "mutation { createListing(listingData: {}) { id } }"
+    store = PersistedQueryStore()
+    asyncio.run(store.register(query_hash(query), query)) # As the extension does for an APQ registration
+    operation_rules = {"createListing": RateLimitRule(name="createListing", limit=1, window_seconds=60, algorithm="sliding_window")}
+    app.add_middleware(RateLimitMiddleware, limiter=RateLimiter(redis_client, local_reserve=0), rules=[], operation_rules=operation_rules, persisted_queries=store)
+    client = TestClient(app)
+
+    persisted = {"extensions": {"persistedQuery": {"version": 1, "sha256Hash": query_hash(query)}}}
+    assert client.post("/graphql", json=persisted).status_code == 200
+    # Replaying the hash alone no longer dodges the operation limit
+    assert client.post("/graphql", json=persisted).status_code == 429
@@ -0,0 +1,33 @@
+from functools import partial
+from typing import Any, Awaitable, Callable, List, Sequence
+
+import pytest
+
+from schema.extensions.n_plus_one import AdapterCallReport, NPlusOneExtension
+
+class NPlusOneCheck:
+    """
+    Collects NPlusOneExtension reports for a schema built with `extension`,
+    and fails the test when an operation's adapter calls grow with result size.
+    """
+
+    def __init__(self) -> None:
+        self.reports: List[AdapterCallReport] = []
+        self.extension = partial(NPlusOneExtension, mode="raise", reports=self.reports)
+
+    async def assert_constant(self, run: Callable[[int], Awaitable[Any]], sizes: Sequence[int] = (1, 2, 5)) -> None:
+        """`run(size)` executes one operation returning `size` results."""
+        by_size = []
+        for size in sizes:
+            self.reports.clear()
+            await run(size)
+            assert len(self.reports) == 1, f"expected one operation for size {size}, got {len(self.reports)}"
+            by_size.append(self.reports[0])
+        for i in range(1, len(sizes)):
+            grown = by_size[i].growth_over(by_size[i - 1])
+            if grown:
+                pytest.fail(f"Adapter calls grow with result size ({sizes[i - 1]} -> {sizes[i]} results): " + "; ".join(grown))
+
+@pytest.fixture
+def n_plus_one() -> NPlusOneCheck:
+    return NPlusOneCheck()
@@ -0,0 +1,134 @@
+import pytest
+import strawberry
+import strawberry.federation as federation
+from typing import Any, List, Optional, Type
+from pydantic import BaseModel
+from adapters.base import AbstractStorageAdapter
+from adapters.caching_adapter import CachingAdapter
+from adapters.instrumented import InstrumentedAdapter
+from models.auction import Seller
+from models.trade import PropertyListing
+from models.user import User
+from schema import loaders
+from schema.types.trade_type import PropertyListingType
+from schema.types import user_type
+from schema.types.user_type import UserType
+
+class RecordingAdapter(AbstractStorageAdapter):
+    """In-memory adapter that records every batched read."""
+
+    def __init__(self, records: List[BaseModel]):
+        self.records = {(type(r), str(r.id)): r for r in records}
+        self.batches: List[tuple] = []
+        self.batch_writes: List[List[str]] = []
+
+    async def create(self, model_instance): self.records[(type(model_instance), str(model_instance.id))] = model_instance; return model_instance
+    async def read(self, model_type, id): return self.records.get((model_type, str(id)))
+    async def update(self, model_instance): return model_instance
+    async def delete(self, model_type, id): self.records.pop((model_type, str(id)), None)
+    async def list(self, model_type): return [r for (t, _), r in self.records.items() if t is model_type]
+
+    async def create_many(self, model_instances):
+        self.batch_writes.append([str(m.id) for m in model_instances])
+        return [await self.create(m) for m in model_instances]
+
+    async def read_many(self, model_type: Type[BaseModel], ids: List[Any]) -> List[Optional[BaseModel]]:
+        self.batches.append((model_type.__name__, list(ids)))
+        return [self.records.get((model_type, str(id))) for id in ids]
+
+def make_user(id: str) -> User:
+    return User(id=id, display_name=f"User {id}", email=f"{id}@example.com", phone="+12025550123", user_metadata={})
+
+def make_listing(id: str) -> PropertyListing:
+    return PropertyListing(
+        id=id, user_id="u1", name=f"Listing {id}", address="1 Main St", image_url="x.jpg", token_symbol="TKN",
+        current_price=1.0, price_unit="USD", valuation=10.0, status="For Sale",
+        price_history=[{"date": "2024-01-01", "price": 1.0}],
+    )
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def ping(self) -> str:
+        return "pong"
+
+schema = federation.Schema(query=Query, types=[UserType, PropertyListingType])
+
+ENTITIES_QUERY = """
+    query($representations: [_Any!]!) {
+        _entities(representations: $representations) {
+            ... on UserType { id }
+            ... on PropertyListingType { id title: name priceHistory { price } }
+        }
+    }
+"""
+
+@pytest.mark.asyncio
+async def test_entities_are_loaded_with_one_batch_per_typename(monkeypatch):
+    adapter = RecordingAdapter([make_user("u1"), make_user("u2"), make_listing("p1"), make_listing("p2")])
+    monkeypatch.setattr(loaders, "get_adapter", lambda: adapter)
+    representations = [
+        {"__typename": "UserType", "id": "u2"},
+        {"__typename": "PropertyListingType", "id": "p2"},
+        {"__typename": "UserType", "id": "missing"},
+        {"__typename": "UserType", "id": "u1"},
+        {"__typename": "PropertyListingType", "id": "p1"},
+    ]
+
+    result = await schema.execute(ENTITIES_QUERY, variable_values={"representations": representations}, context_value={})
+
+    assert result.errors is None
+    assert result.data["_entities"] == [
+        {"id": "u2"},
+        {"id": "p2", "title": "Listing p2", "priceHistory": [{"price": 1.0}]},
+        None,
+        {"id": "u1"},
+        {"id": "p1", "title": "Listing p1", "priceHistory": [{"price": 1.0}]},
+    ]
+    assert sorted(adapter.batches) == [("PropertyListing", ["p2", "p1"]), ("User", ["u2", "missing", "u1"])]
+
+@pytest.mark.asyncio
+async def test_entity_reads_do_not_grow_with_representations(monkeypatch, n_plus_one):
+    adapter = RecordingAdapter([make_user(f"u{i}") for i in range(5)] + [make_listing(f"p{i}") for i in range(5)])
+    monkeypatch.setattr(loaders, "get_adapter", lambda: InstrumentedAdapter(adapter, "memory"))
+    detecting = federation.Schema(query=Query, types=[UserType, PropertyListingType], extensions=[n_plus_one.extension])
+
+    async def run(size):
+        representations = [{"__typename": typename, "id": f"{prefix}{i}"} for i in range(size) for typename, prefix in (("UserType", "u"), ("PropertyListingType", "p"))]
+        result = await detecting.execute(ENTITIES_QUERY, variable_values={"representations": representations}, context_value={})
+        assert result.errors is None
+
+    await n_plus_one.assert_constant(run)
+
+@pytest.mark.asyncio
+async def test_caching_adapter_reads_only_misses_from_primary():
+    cache = RecordingAdapter([make_user("u1")])
+    primary = RecordingAdapter([make_user("u1"), make_user("u2"), make_user("u3")])
+    adapter = CachingAdapter(cache=cache, primary=primary)
+
+    users = await adapter.read_many(User, ["u2", "u1", "missing", "u3"])
+
+    assert [u.id if u else None for u in users] == ["u2", "u1", None, "u3"]
+    assert primary.batches == [("User", ["u2", "missing", "u3"])]
+    assert cache.batch_writes == [["u2", "u3"]] # Filled for the next request in one batched write
+
+@pytest.mark.asyncio
+async def test_user_entities_resolve_seller_fields(monkeypatch):
+    adapter = RecordingAdapter([make_user("u1"), make_user("u2")])
+    sellers = [Seller(user_id="u1", name="Ann's Homes", verified=True)]
+    monkeypatch.setattr(adapter, "list", lambda model_type: _async(sellers if model_type is Seller else []))
+    monkeypatch.setattr(loaders, "get_adapter", lambda: adapter)
+    monkeypatch.setattr(user_type, "get_adapter", lambda: adapter)
+    query = "query ($representations: [_Any!]!) { _entities(representations: $representations) { ... on UserType { id name verified } } }"
+    representations = [{"__typename": "UserType", "id": "u1"}, {"__typename": "UserType", "id": "u2"}]
+
+    result = await schema.execute(query, variable_values={"representations": representations}, context_value={"request": None})
+
+    assert result.errors is None
+    assert result.data["_entities"] == [
+        {"id": "u1", "name": "Ann's Homes", "verified": True},
+        {"id": "u2", "name": None, "verified": None}, # Not a seller
+    ]
+
+async def _async(value):
+    return value
@@ -0,0 +1,97 @@
+import pytest
+import pytest_asyncio
+import fakeredis
+import strawberry
+from typing import List, Optional
+from adapters.instrumented import InstrumentedAdapter
+from adapters.redis_adapter import RedisAdapter
+from models.user import User
+from schema import loaders
+from schema.resolvers import user_resolver
+from schema.types import user_type
+from strawberry.types import Info
+
+def make_user(id: str) -> User:
+    return User(id=id, display_name=f"User {id}", email=f"{id}@example.com", phone="+12025550123", user_metadata={})
+
+@pytest_asyncio.fixture
+async def adapter(monkeypatch):
+    redis_adapter = RedisAdapter()
+    redis_adapter.client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    adapter = InstrumentedAdapter(redis_adapter, "redis")
+    await adapter.create_many([make_user(f"u{i}") for i in range(5)])
+    monkeypatch.setattr(user_resolver, "get_adapter", lambda: adapter)
+    monkeypatch.setattr(user_type, "get_adapter", lambda: adapter)
+    monkeypatch.setattr(loaders, "get_adapter", lambda: adapter)
+    return adapter
+
+@strawberry.type
+class SellerProfileType:
+    id: strawberry.ID
+    # The seller fields UserType exposes; each call lists every seller
+    name: Optional[str] = user_type.resolve_name
+    verified: Optional[bool] = user_type.resolve_verified
+
+@strawberry.type
+class OwnedType:
+    owner_id: strawberry.ID
+
+    @strawberry.field
+    async def owner_email(self, info: Info) -> Optional[str]:
+        user = await loaders.get_loader(info, User).load(str(self.owner_id)) # Batched into one read_many
+        return user.email if user else None
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def sellers(self, first: int) -> List[SellerProfileType]:
+        return [SellerProfileType(id=strawberry.ID(f"u{i}")) for i in range(first)]
+
+    @strawberry.field
+    def owned(self, first: int) -> List[OwnedType]:
+        return [OwnedType(owner_id=strawberry.ID(f"u{i}")) for i in range(first)]
+
+    @strawberry.field
+    async def pair(self) -> List[str]:
+        first = await user_resolver.get_adapter().read(User, "u0")
+        second = await user_resolver.get_adapter().read(User, "u1")
+        return [first.email, second.email]
+
+def context():
+    return {"request": None}
+
+@pytest.mark.asyncio
+async def test_per_item_seller_lookups_are_flagged(adapter, n_plus_one):
+    schema = strawberry.Schema(query=Query, extensions=[n_plus_one.extension])
+
+    result = await schema.execute("query Sellers { sellers(first: 3) { id name verified } }", context_value=context())
+
+    [error] = result.errors
+    assert "sellers.name: redis.list(Seller) issued 3 times over 3 resolver calls" in error.message
+    assert "sellers.verified: redis.list(Seller) issued 3 times over 3 resolver calls" in error.message
+    assert result.data["sellers"][0] == {"id": "u0", "name": None, "verified": None} # Data is still returned
+
+    with pytest.raises(pytest.fail.Exception, match=r"sellers.name: redis.list\(Seller\) 1 -> 2"):
+        await n_plus_one.assert_constant(lambda size: schema.execute(f"{{ sellers(first: {size}) {{ name }} }}", context_value=context()))
+
+@pytest.mark.asyncio
+async def test_batched_loads_do_not_grow_with_result_size(adapter, n_plus_one):
+    schema = strawberry.Schema(query=Query, extensions=[n_plus_one.extension])
+
+    async def run(size):
+        result = await schema.execute(f"{{ owned(first: {size}) {{ ownerEmail }} }}", context_value=context())
+        assert result.errors is None
+        assert len(result.data["owned"]) == size
+
+    await n_plus_one.assert_constant(run)
+    assert n_plus_one.reports[0].calls_by_path == {"owned.ownerEmail": {"redis.read_many(User)": 1}}
+
+@pytest.mark.asyncio
+async def test_repeated_calls_within_one_resolver_call_are_not_flagged(adapter, n_plus_one):
+    schema = strawberry.Schema(query=Query, extensions=[n_plus_one.extension])
+
+    result = await schema.execute("{ pair }", context_value=context())
+
+    assert result.errors is None
+    assert n_plus_one.reports[0].calls_by_path == {"pair": {"redis.read(User)": 2}}
+    assert n_plus_one.reports[0].repeated() == []
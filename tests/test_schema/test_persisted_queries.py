@@ -0,0 +1,82 @@
+import json
+import pytest
+import fakeredis
+import strawberry
+from functools import partial
+from schema.extensions.persisted_queries import PersistedQueryExtension, PersistedQueryStore, query_hash
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def hello(self, name: str = "world") -> str:
+        return f"hello {name}"
+
+QUERY = "query Hello($name: String!) { hello(name: $name) }"
+
+def make_schema(store):
+    return strawberry.Schema(query=Query, extensions=[partial(PersistedQueryExtension, store=store)])
+
+def apq(sha):
+    return {"persistedQuery": {"version": 1, "sha256Hash": sha}}
+
+@pytest.mark.asyncio
+async def test_unknown_hash_asks_client_to_register_then_succeeds():
+    store = PersistedQueryStore(redis_client=fakeredis.FakeAsyncRedis(decode_responses=True))
+    schema = make_schema(store)
+    sha = query_hash(QUERY)
+
+    missing = await schema.execute(None, variable_values={"name": "a"}, operation_extensions=apq(sha))
+    assert missing.errors[0].extensions["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+    registered = await schema.execute(QUERY, variable_values={"name": "a"}, operation_extensions=apq(sha))
+    assert registered.data == {"hello": "hello a"}
+
+    hashed_only = await schema.execute(None, variable_values={"name": "b"}, operation_extensions=apq(sha))
+    assert hashed_only.data == {"hello": "hello b"}
+
+@pytest.mark.asyncio
+async def test_registered_query_is_shared_through_redis():
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    sha = query_hash(QUERY)
+    await make_schema(PersistedQueryStore(redis_client=redis_client)).execute(
+        QUERY, variable_values={"name": "a"}, operation_extensions=apq(sha)
+    )
+    # A different worker with a cold local cache finds it in Redis
+    result = await make_schema(PersistedQueryStore(redis_client=redis_client)).execute(
+        None, variable_values={"name": "b"}, operation_extensions=apq(sha)
+    )
+    assert result.data == {"hello": "hello b"}
+
+@pytest.mark.asyncio
+async def test_hash_mismatch_is_rejected():
+    schema = make_schema(PersistedQueryStore())
+    result = await schema.execute(QUERY, variable_values={"name": "a"}, operation_extensions=apq("0" * 64))
+    assert result.errors[0].extensions["code"] == "PERSISTED_QUERY_HASH_MISMATCH"
+
+@pytest.mark.asyncio
+async def test_manifest_operations_skip_parse_and_validate(tmp_path, monkeypatch):
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({query_hash(QUERY): QUERY}))
+    store = PersistedQueryStore(enforce=True)
+    schema = make_schema(store)
+    assert await store.warm(schema, str(manifest)) == 1
+
+    import strawberry.schema.schema as strawberry_schema
+    def fail(*args, **kwargs):
+        raise AssertionError("persisted operations must not be parsed or validated again")
+    monkeypatch.setattr(strawberry_schema, "parse", fail)
+    monkeypatch.setattr(strawberry_schema, "validate_document", fail)
+
+    result = await schema.execute(None, variable_values={"name": "a"}, operation_extensions=apq(query_hash(QUERY)))
+    assert result.data == {"hello": "hello a"}
+    # Full-text requests for a known operation use the compiled document too
+    result = await schema.execute(QUERY, variable_values={"name": "b"})
+    assert result.data == {"hello": "hello b"}
+
+@pytest.mark.asyncio
+async def test_enforced_mode_rejects_unknown_documents():
+    schema = make_schema(PersistedQueryStore(enforce=True))
+    result = await schema.execute("{ hello }")
+    assert result.errors[0].extensions["code"] == "PERSISTED_QUERY_REQUIRED"
+    result = await schema.execute("{ hello }", operation_extensions=apq(query_hash("{ hello }")))
+    assert result.errors[0].extensions["code"] == "PERSISTED_QUERY_REQUIRED"
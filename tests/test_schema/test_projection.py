@@ -0,0 +1,52 @@
+import pytest
+import strawberry
+from typing import List, Optional
+from pydantic import BaseModel
+from schema.projection import selected_fields
+
+class HookModel(BaseModel):
+    id: str
+    target_url: str
+    event_type: str
+    is_active: bool = True
+
+seen = []
+
+@strawberry.type
+class HookType:
+    id: str
+    target_url: str
+    event_type: str
+    is_active: bool
+
+    @strawberry.field
+    def label(self) -> str: # Computed, not stored
+        return self.event_type
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def hooks(self, info: strawberry.Info) -> List[HookType]:
+        seen.append(selected_fields(info, HookModel))
+        return []
+
+schema = strawberry.Schema(query=Query)
+
+async def fields_for(query: str) -> Optional[List[str]]:
+    seen.clear()
+    result = await schema.execute(query)
+    assert result.errors is None, result.errors
+    return seen[0]
+
+@pytest.mark.asyncio
+async def test_selected_fields_maps_camel_case_and_always_includes_id():
+    assert await fields_for("{ hooks { targetUrl __typename } }") == ["id", "target_url"]
+
+@pytest.mark.asyncio
+async def test_selected_fields_flattens_fragments():
+    query = "{ hooks { ...F ... on HookType { isActive } } } fragment F on HookType { eventType }"
+    assert await fields_for(query) == ["event_type", "id", "is_active"]
+
+@pytest.mark.asyncio
+async def test_selected_fields_falls_back_to_full_fetch_for_computed_fields():
+    assert await fields_for("{ hooks { id label } }") is None
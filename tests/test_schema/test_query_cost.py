@@ -0,0 +1,69 @@
+import pytest
+import strawberry
+from functools import partial
+from types import SimpleNamespace
+from typing import List
+from schema.extensions.query_cost import QueryCostExtension
+
+@strawberry.type
+class ItemType:
+    id: strawberry.ID
+    name: str
+
+@strawberry.type
+class OwnerType:
+    id: strawberry.ID
+
+    @strawberry.field
+    def items(self, first: int = 5) -> List[ItemType]:
+        return [ItemType(id=strawberry.ID(str(i)), name="item") for i in range(first)]
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def owners(self) -> List[OwnerType]:
+        return [OwnerType(id=strawberry.ID("1"))]
+
+def make_schema(**kwargs):
+    return strawberry.Schema(query=Query, extensions=[partial(QueryCostExtension, **kwargs)])
+
+def context(role=None):
+    return {"request": SimpleNamespace(state=SimpleNamespace(role=role))}
+
+@pytest.mark.asyncio
+async def test_cost_is_reported_in_extensions():
+    schema = make_schema(default_list_size=10, field_weights={})
+    result = await schema.execute("{ owners { id items { id name } } }", context_value=context("user"))
+
+    assert result.errors is None
+    # owners: 10 (root) + 10 owners * (items: 1 + 5 (default arg) * 0 for scalar children)
+    assert result.extensions["cost"]["requestedQueryCost"] == 20
+    assert result.extensions["cost"]["maximumAvailable"] == 5000
+    assert result.extensions["cost"]["depth"] == 3
+
+@pytest.mark.asyncio
+async def test_pagination_variables_drive_list_multiplier():
+    schema = make_schema(default_list_size=10, field_weights={"OwnerType.items": 100, "ItemType.name": 1})
+    query = "query($n: Int!) { owners { items(first: $n) { name } } }"
+    small = await schema.execute(query, variable_values={"n": 1}, context_value=context("user"))
+    large = await schema.execute(query, variable_values={"n": 50}, context_value=context("user"))
+    assert small.extensions["cost"]["requestedQueryCost"] == 10 + 10 * (100 + 1)
+    assert large.extensions["cost"]["requestedQueryCost"] == 10 + 10 * (100 + 50)
+
+@pytest.mark.asyncio
+async def test_operation_over_budget_is_rejected_before_execution():
+    schema = make_schema(default_list_size=100, role_budgets={"user": 50, "anonymous": 10})
+    result = await schema.execute("{ owners { items { id } } }", context_value=context("user"))
+
+    assert result.data is None
+    assert "exceeds the budget of 50" in result.errors[0].message
+
+@pytest.mark.asyncio
+async def test_depth_limit_uses_fragments():
+    schema = make_schema(max_depth=2)
+    query = """
+        query { owners { ...OwnerFields } }
+        fragment OwnerFields on OwnerType { items { id } }
+    """
+    result = await schema.execute(query, context_value=context("admin"))
+    assert "depth 3 exceeds" in result.errors[0].message
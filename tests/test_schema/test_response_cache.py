@@ -0,0 +1,87 @@
+import pytest
+import fakeredis
+import strawberry
+from functools import partial
+from typing import List, Optional
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from schema.directives import CacheControl, CacheScope
+from schema.extensions.response_cache import ResponseCache, ResponseCacheExtension
+from schema.router import CentralGraphQLRouter
+
+calls = {"sellers": 0}
+
+@strawberry.type(directives=[CacheControl(max_age=120, scope=CacheScope.PUBLIC)])
+class SellerType:
+    id: strawberry.ID
+    name: str
+
+@strawberry.type(directives=[CacheControl(max_age=30)])
+class StatsType:
+    count: int
+
+@strawberry.type
+class ProfileType:
+    id: strawberry.ID
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def sellers(self) -> List[SellerType]:
+        calls["sellers"] += 1
+        return [SellerType(id=strawberry.ID("1"), name="Acme")]
+
+    @strawberry.field
+    def stats(self) -> StatsType:
+        return StatsType(count=1)
+
+    @strawberry.field(directives=[CacheControl(scope=CacheScope.PRIVATE)])
+    def my_stats(self) -> StatsType:
+        return StatsType(count=2)
+
+    @strawberry.field
+    def profile(self) -> Optional[ProfileType]:
+        return ProfileType(id=strawberry.ID("1"))
+
+def make_client():
+    cache = ResponseCache(redis_client=fakeredis.FakeAsyncRedis(decode_responses=True))
+    schema = strawberry.Schema(query=Query, extensions=[partial(ResponseCacheExtension, cache=cache)])
+    app = FastAPI()
+    app.include_router(CentralGraphQLRouter(schema), prefix="/graphql")
+    return TestClient(app), cache
+
+def test_public_query_is_served_from_cache_with_headers():
+    client, _ = make_client()
+    calls["sellers"] = 0
+    query = {"query": "{ sellers { id name } }"}
+
+    first = client.post("/graphql", json=query)
+    second = client.post("/graphql", json=query)
+
+    assert first.json()["data"] == second.json()["data"] == {"sellers": [{"id": "1", "name": "Acme"}]}
+    assert second.json()["extensions"]["cacheControl"] == {"maxAge": 120, "scope": "PUBLIC"}
+    assert calls["sellers"] == 1
+    assert second.headers["cache-control"] == "public, max-age=120"
+    assert second.headers["etag"] == first.headers["etag"]
+
+def test_matching_if_none_match_returns_304():
+    client, _ = make_client()
+    query = {"query": "{ sellers { id } }"}
+    etag = client.post("/graphql", json=query).headers["etag"]
+
+    response = client.post("/graphql", json=query, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+def test_policy_is_minimum_max_age_and_private_wins():
+    client, _ = make_client()
+    response = client.post("/graphql", json={"query": "{ sellers { id } stats { count } }"})
+    assert response.headers["cache-control"] == "public, max-age=30"
+    # PRIVATE responses need an authenticated user to key on, so anonymous ones are not cached
+    response = client.post("/graphql", json={"query": "{ sellers { id } myStats { count } }"})
+    assert "cache-control" not in response.headers
+
+def test_unhinted_object_fields_are_not_cached():
+    client, _ = make_client()
+    response = client.post("/graphql", json={"query": "{ sellers { id } profile { id } }"})
+    assert "etag" not in response.headers
@@ -0,0 +1,98 @@
+import asyncio
+import fakeredis
+import strawberry
+from functools import partial
+from typing import List
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from adapters.instrumented import InstrumentedAdapter
+from adapters.redis_adapter import RedisAdapter
+from schema.extensions.slow_operations import SlowOperationExtension, SlowOperationLog, variables_hash
+from schema.resolvers.admin_resolver import Query as AdminQuery, slow_operation_log
+from schema.router import CentralGraphQLRouter
+
+class Gauge(BaseModel):
+    id: str
+    value: int
+
+store = {}
+
+@strawberry.type
+class GaugeType:
+    id: str
+
+    @strawberry.field
+    async def value(self) -> int:
+        record = await store["adapter"].read(Gauge, self.id)
+        await asyncio.sleep(0.01)
+        return record.value if record else 0
+
+@strawberry.type
+class Query(AdminQuery):
+    @strawberry.field
+    def gauges(self, ids: List[str]) -> List[GaugeType]:
+        return [GaugeType(id=id) for id in ids]
+
+def make_client(log, role="admin"):
+    adapter = RedisAdapter()
+    adapter.client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    store["adapter"] = InstrumentedAdapter(adapter, "redis")
+    schema = strawberry.Schema(query=Query, extensions=[partial(SlowOperationExtension, log=log)])
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def set_role(request: Request, call_next):
+        request.state.role = role
+        return await call_next(request)
+
+    app.include_router(CentralGraphQLRouter(schema), prefix="/graphql")
+    return TestClient(app)
+
+GAUGES = "query Gauges($ids: [String!]!) { gauges(ids: $ids) { id value } }"
+
+def test_slow_operation_is_captured_with_resolver_timings_and_adapter_calls():
+    log = SlowOperationLog(threshold_ms=5)
+    client = make_client(log)
+
+    response = client.post("/graphql", json={"query": GAUGES, "variables": {"ids": ["a", "b", "c"]}})
+    assert response.json()["data"]["gauges"][0] == {"id": "a", "value": 0}
+
+    [entry] = log.entries()
+    assert entry.operation_name == "Gauges"
+    assert entry.operation_type == "query"
+    assert entry.variables_hash == variables_hash({"ids": ["a", "b", "c"]})
+    assert entry.duration_ms >= 10
+    assert entry.adapter_calls == {"redis.read(Gauge)": 3}
+    timings = dict(entry.resolvers)
+    assert timings["gauges.value"].calls == 3 # List indices are folded into one path
+    assert timings["gauges.value"].max_ms >= 10
+    assert "gauges.id" not in timings # Attribute fields are not timed
+
+def test_fast_operations_are_not_kept_and_buffer_is_bounded():
+    log = SlowOperationLog(threshold_ms=60_000)
+    client = make_client(log)
+    client.post("/graphql", json={"query": GAUGES, "variables": {"ids": ["a"]}})
+    assert log.entries() == []
+
+    log = SlowOperationLog(threshold_ms=0, capacity=2)
+    client = make_client(log)
+    for name in ("One", "Two", "Three"):
+        client.post("/graphql", json={"query": f"query {name} {{ gauges(ids: []) {{ id }} }}"})
+    assert [entry.operation_name for entry in log.entries()] == ["Three", "Two"]
+
+def test_slow_operations_query_is_admin_only(monkeypatch):
+    slow_operation_log.clear()
+    monkeypatch.setattr(slow_operation_log, "threshold_ms", 0)
+    client = make_client(slow_operation_log)
+    client.post("/graphql", json={"query": GAUGES, "variables": {"ids": ["a", "b"]}})
+
+    query = "{ slowOperations(operationName: \"Gauges\") { operationName variablesHash resolvers { path calls } adapterCalls { call count } } }"
+    [entry] = client.post("/graphql", json={"query": query}).json()["data"]["slowOperations"]
+    assert entry["operationName"] == "Gauges"
+    assert entry["adapterCalls"] == [{"call": "redis.read(Gauge)", "count": 2}]
+    assert {"path": "gauges.value", "calls": 2} in entry["resolvers"]
+
+    denied = make_client(slow_operation_log, role="user").post("/graphql", json={"query": query}).json()
+    assert denied["data"] is None
+    assert denied["errors"]
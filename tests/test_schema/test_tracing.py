@@ -0,0 +1,102 @@
+import pytest
+import fakeredis
+import strawberry
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from opentelemetry import trace
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from pydantic import BaseModel
+from adapters.caching_adapter import CachingAdapter
+from adapters.instrumented import InstrumentedAdapter
+from adapters.redis_adapter import RedisAdapter
+from schema.extensions.tracing import TracingExtension
+from schema.router import CentralGraphQLRouter
+from app.config import settings
+from utils.tracing import configure_tracing, extract_context, inject_context, tracer
+
+TRACEPARENT = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+class Gauge(BaseModel):
+    id: str
+    value: int
+
+def redis_adapter(backend):
+    adapter = RedisAdapter()
+    adapter.client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    return InstrumentedAdapter(adapter, backend)
+
+store = {}
+
+@strawberry.input
+class SecretInput:
+    secret: str
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def gauge(self, id: str, token: str = "", options: SecretInput = None) -> int:
+        record = await store["adapter"].read(Gauge, id)
+        return record.value if record else 0
+
+# The SDK provider can only be installed once per process
+exporter = InMemorySpanExporter()
+
+@pytest.fixture(autouse=True)
+def spans(monkeypatch):
+    monkeypatch.setattr(settings, "OTEL_TRACES_SAMPLE_RATIO", 1.0)
+    assert configure_tracing(exporter)
+    exporter.clear()
+    yield exporter
+    exporter.clear()
+
+def by_name(spans):
+    return {span.name: span for span in spans.get_finished_spans()}
+
+@pytest.mark.asyncio
+async def test_cache_and_adapter_spans_nest(spans):
+    primary = redis_adapter("primary")
+    await primary.create(Gauge(id="g1", value=1))
+    adapter = CachingAdapter(cache=redis_adapter("redis"), primary=primary)
+    spans.clear()
+
+    with tracer.start_as_current_span("request"):
+        await adapter.read(Gauge, "g1")
+
+    named = by_name(spans)
+    assert named["cache.read"].parent.span_id == named["request"].context.span_id
+    assert named["cache.read"].attributes["cache.hit"] is False
+    assert named["redis.read"].parent.span_id == named["cache.read"].context.span_id
+    assert named["primary.read"].parent.span_id == named["cache.read"].context.span_id
+    assert named["primary.read"].attributes["db.rows"] == 1
+
+def test_operation_continues_incoming_trace_and_filters_args(spans):
+    primary = redis_adapter("primary")
+    store["adapter"] = primary
+    schema = strawberry.Schema(query=Query, extensions=[TracingExtension])
+    app = FastAPI()
+    app.include_router(CentralGraphQLRouter(schema), prefix="/graphql")
+
+    response = TestClient(app).post(
+        "/graphql",
+        json={"query": 'query Lookup { gauge(id: "g1", token: "t0p", options: {secret: "s3cret"}) }'},
+        headers={"traceparent": TRACEPARENT},
+    )
+    assert response.json()["data"] == {"gauge": 0}
+
+    named = by_name(spans)
+    operation = named["GraphQL Operation: Lookup"]
+    assert format(operation.context.trace_id, "032x") == TRACEPARENT.split("-")[1]
+    assert operation.attributes["graphql.operation.type"] == "query"
+    resolver = named["GraphQL Resolving: gauge"]
+    assert named["primary.read"].parent.span_id == resolver.context.span_id
+    recorded = " ".join(str(value) for value in resolver.attributes.values())
+    assert "t0p" not in recorded and "s3cret" not in recorded
+    assert resolver.attributes["graphql.param.id"] == "g1"
+
+def test_context_round_trips_through_headers():
+    with tracer.start_as_current_span("publish") as span:
+        carrier = inject_context()
+    assert carrier["traceparent"].split("-")[1] == format(span.get_span_context().trace_id, "032x")
+    parent = trace.get_current_span(extract_context(carrier))
+    assert parent.get_span_context().span_id == span.get_span_context().span_id
+    assert extract_context({}) is None
@@ -0,0 +1,103 @@
+import pytest
+from types import SimpleNamespace
+from adapters.base import AbstractStorageAdapter
+from models.trade import PropertyListing
+from schema.resolvers import schema, trade_resolver
+
+class MemoryAdapter(AbstractStorageAdapter):
+    def __init__(self):
+        self.records = {}
+
+    async def create(self, model_instance): self.records[str(model_instance.id)] = model_instance; return model_instance
+    async def read(self, model_type, id): return self.records.get(str(id))
+    async def update(self, model_instance): self.records[str(model_instance.id)] = model_instance; return model_instance
+    async def delete(self, model_type, id): self.records.pop(str(id), None)
+    async def list(self, model_type): return list(self.records.values())
+
+class RecordingPublisher:
+    def __init__(self):
+        self.events = []
+
+    async def publish(self, event_type, payload, is_realtime=False):
+        self.events.append(event_type)
+
+@pytest.fixture
+def adapter(monkeypatch):
+    adapter = MemoryAdapter()
+    adapter.records["p1"] = PropertyListing(
+        id="p1", user_id="u1", name="Listing p1", address="1 Main St", image_url="x.jpg", token_symbol="TKN",
+        current_price=1.0, price_unit="USD", valuation=10.0, status="For Sale",
+        price_history=[{"date": "2024-01-01", "price": 1.0}],
+    )
+    monkeypatch.setattr(trade_resolver, "get_adapter", lambda: adapter)
+    return adapter
+
+@pytest.fixture
+def publisher(monkeypatch):
+    publisher = RecordingPublisher()
+    monkeypatch.setattr(trade_resolver, "get_event_publisher", lambda: publisher)
+    return publisher
+
+def as_user(user_id):
+    return {"request": SimpleNamespace(state=SimpleNamespace(user_id=user_id))}
+
+CREATE_LISTING = """
+    mutation($data: PropertyListingInput!) {
+        createListing(listingData: $data) { id userId name currentPrice }
+    }
+"""
+
+UPDATE_LISTING = """
+    mutation($data: PropertyListingUpdateInput!) {
+        updateListing(listingData: $data) { id userId name currentPrice }
+    }
+"""
+
+@pytest.mark.asyncio
+async def test_create_listing_assigns_an_id_and_the_caller_as_owner(adapter, publisher):
+    data = {
+        "name": "New", "address": "2 Main St", "imageUrl": "y.jpg", "tokenSymbol": "NEW", "currentPrice": 2.0,
+        "priceUnit": "USD", "apy": None, "valuation": 20.0, "tokensOffered": None, "totalTokens": None,
+        "isFavorite": None, "status": "For Sale", "dateListed": "2024-01-01T00:00:00+00:00",
+    }
+
+    result = await schema.execute(CREATE_LISTING, variable_values={"data": data}, context_value=as_user("u2"))
+
+    assert result.errors is None
+    created = result.data["createListing"]
+    assert created["id"] and created["userId"] == "u2"
+    assert adapter.records[created["id"]].name == "New"
+    assert publisher.events == ["trade.submitted"]
+
+@pytest.mark.asyncio
+async def test_update_listing_applies_changes_to_the_stored_listing(adapter, publisher):
+    result = await schema.execute(
+        UPDATE_LISTING, variable_values={"data": {"id": "p1", "currentPrice": 2.5}}, context_value=as_user("u1")
+    )
+
+    assert result.errors is None
+    assert result.data["updateListing"] == {"id": "p1", "userId": "u1", "name": "Listing p1", "currentPrice": 2.5}
+    assert adapter.records["p1"].current_price == 2.5
+    assert publisher.events == ["trade.price_changed"]
+
+@pytest.mark.asyncio
+async def test_update_listing_hides_other_owners_listings(adapter, publisher):
+    for id in ("p1", "missing"):
+        result = await schema.execute(
+            UPDATE_LISTING, variable_values={"data": {"id": id, "currentPrice": 9.0}}, context_value=as_user("u2")
+        )
+        assert [error.message for error in result.errors] == ["404: Listing not found"]
+    assert adapter.records["p1"].current_price == 1.0
+    assert publisher.events == []
+
+@pytest.mark.asyncio
+async def test_delete_listing_is_limited_to_the_owner(adapter, publisher):
+    mutation = 'mutation { deleteListing(id: "p1") }'
+
+    denied = await schema.execute(mutation, context_value=as_user("u2"))
+    assert [error.message for error in denied.errors] == ["403: Not authorized to delete this listing"]
+
+    result = await schema.execute(mutation, context_value=as_user("u1"))
+    assert result.errors is None
+    assert result.data == {"deleteListing": True}
+    assert "p1" not in adapter.records
@@ -0,0 +1,61 @@
+import pytest
+import strawberry
+from typing import List, Optional, cast
+from pydantic import BaseModel
+from schema.conversion import resolve_attribute, strawberry_config
+
+class PriceModel(BaseModel):
+    date: str
+    price: float
+
+class ListingModel(BaseModel):
+    id: str
+    current_price: float
+    price_history: Optional[List[PriceModel]] = None
+
+@strawberry.experimental.pydantic.type(model=PriceModel, all_fields=True)
+class PriceType:
+    pass
+
+@strawberry.type
+class ListingType:
+    id: strawberry.ID
+    current_price: float
+    price_history: Optional[List[PriceType]]
+    nickname: Optional[str] # Not on the model
+
+ROWS = [
+    ListingModel(id="1", current_price=10.0, price_history=[PriceModel(date="2024-01-01", price=9.5)]),
+    {"id": "2", "current_price": 20.0, "price_history": None}, # Raw adapter row
+]
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def listings(self) -> List[ListingType]:
+        return cast(List[ListingType], ROWS)
+
+schema = strawberry.Schema(query=Query, config=strawberry_config)
+
+def test_resolve_attribute_reads_models_and_dicts():
+    assert resolve_attribute(ROWS[0], "current_price") == 10.0
+    assert resolve_attribute(ROWS[1], "current_price") == 20.0
+    assert resolve_attribute(ROWS[1], "nickname") is None # Raw rows are sparse
+    with pytest.raises(AttributeError, match="ListingModel has no field 'nickname'"):
+        resolve_attribute(ROWS[0], "nickname")
+
+@pytest.mark.asyncio
+async def test_models_and_raw_rows_are_served_without_conversion():
+    result = await schema.execute("{ listings { id currentPrice priceHistory { date price } } }")
+    assert result.errors is None
+    assert result.data["listings"] == [
+        {"id": "1", "currentPrice": 10.0, "priceHistory": [{"date": "2024-01-01", "price": 9.5}]},
+        {"id": "2", "currentPrice": 20.0, "priceHistory": None},
+    ]
+
+@pytest.mark.asyncio
+async def test_fields_missing_from_the_model_are_errors():
+    result = await schema.execute("{ listings { id nickname } }")
+    [error] = result.errors
+    assert error.path == ["listings", 0, "nickname"]
+    assert result.data["listings"] == [{"id": "1", "nickname": None}, {"id": "2", "nickname": None}]
@@ -0,0 +1,57 @@
+import hashlib
+import hmac
+import uuid
+import strawberry
+from datetime import datetime
+from decimal import Decimal
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from schema.router import CentralGraphQLRouter
+from utils.serialization import json_dumps, json_loads
+
+class Point(BaseModel):
+    at: datetime
+    price: Decimal
+
+def test_json_dumps_handles_datetimes_uuids_and_models():
+    token = uuid.UUID("12345678-1234-5678-1234-567812345678")
+    body = json_dumps({"id": token, "point": Point(at=datetime(2024, 1, 1), price=Decimal("1.5")), 1: "x"})
+    assert json_loads(body) == {
+        "id": "12345678-1234-5678-1234-567812345678",
+        "point": {"at": "2024-01-01T00:00:00", "price": "1.5"},
+        "1": "x",
+    }
+    assert json_dumps({"b": 1, "a": 2}, sort_keys=True) == b'{"a":2,"b":1}'
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def price(self) -> float:
+        return 1.25
+
+def test_router_encodes_responses_with_orjson():
+    app = FastAPI()
+    app.include_router(CentralGraphQLRouter(strawberry.Schema(query=Query)), prefix="/graphql")
+    response = TestClient(app).post("/graphql", json={"query": "{ price }"})
+    assert response.content == b'{"data":{"price":1.25}}'
+
+def test_webhook_signature_covers_the_exact_body_sent(monkeypatch):
+    from app.tasks import webhook_tasks
+    sent = {}
+
+    class Response:
+        status_code = 200
+        def raise_for_status(self):
+            pass
+
+    def post(url, content, headers, timeout):
+        sent.update(content=content, headers=headers)
+        return Response()
+
+    monkeypatch.setattr(webhook_tasks.httpx, "post", post)
+    webhook_tasks.send_webhook_task.run("https://example.com/hook", {"b": 1, "a": datetime(2024, 1, 1)}, "secret")
+
+    expected = hmac.new(b"secret", sent["content"], hashlib.sha256).hexdigest()
+    assert sent["headers"]["X-Webhook-Signature"] == expected
+    assert sent["content"] == b'{"a":"2024-01-01T00:00:00","b":1}'
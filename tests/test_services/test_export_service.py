@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+import pytest
+import fakeredis
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from adapters.redis_adapter import RedisAdapter
+from api import exports
+from models.auction import BidHistoryEntry
+from models.trade import PropertyListing
+from services.export_service import ExportService
+
+def make_listing(i: int) -> PropertyListing:
+    return PropertyListing(
+        id=str(i), user_id="u1", name=f"Listing {i}", address="1 Main St", image_url="x.jpg", token_symbol="TKN",
+        current_price=float(i), price_unit="USD", valuation=10.0, status="For Sale",
+        price_history=[{"date": "2024-01-01", "price": 1.0}],
+    )
+
+@pytest.fixture
+def adapter():
+    redis_adapter = RedisAdapter()
+    redis_adapter.client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    return redis_adapter
+
+def make_client(adapter, monkeypatch, role="admin"):
+    monkeypatch.setattr(exports, "get_adapter", lambda: adapter)
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def set_role(request: Request, call_next):
+        request.state.role = role
+        return await call_next(request)
+
+    app.include_router(exports.router)
+    return TestClient(app)
+
+@pytest.mark.asyncio
+async def test_rows_are_streamed_in_batches(adapter):
+    for i in range(7):
+        await adapter.create(make_listing(i))
+    await adapter.create(BidHistoryEntry(id="b1", bidder="u1", amount="1", time="now", timestamp=1))
+
+    rows = [row async for row in ExportService(adapter, batch_size=3).rows(PropertyListing)]
+    assert sorted(int(row["id"]) for row in rows) == list(range(7))
+    assert set(rows[0]) == set(PropertyListing.model_fields)
+
+@pytest.mark.asyncio
+async def test_ndjson_export_with_gzip(adapter, monkeypatch):
+    for i in range(3):
+        await adapter.create(make_listing(i))
+    client = make_client(adapter, monkeypatch)
+
+    response = client.get("/exports/listings", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    # TestClient transparently decompresses; check the stream is valid NDJSON
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["name"] for line in lines) == ["Listing 0", "Listing 1", "Listing 2"]
+
+@pytest.mark.asyncio
+async def test_csv_export(adapter, monkeypatch):
+    await adapter.create(make_listing(1))
+    client = make_client(adapter, monkeypatch)
+
+    response = client.get("/exports/listings?format=csv", headers={"Accept-Encoding": "identity"})
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert rows[0]["name"] == "Listing 1"
+    assert json.loads(rows[0]["price_history"]) == [{"date": "2024-01-01", "price": 1.0}]
+
+def test_exports_require_back_office_role(adapter, monkeypatch):
+    client = make_client(adapter, monkeypatch, role="user")
+    assert client.get("/exports/listings").status_code == 403
+    client = make_client(adapter, monkeypatch)
+    assert client.get("/exports/unknown").status_code == 404
@@ -0,0 +1,59 @@
+import asyncio
+import fakeredis
+import pytest
+from adapters.redis_adapter import RedisAdapter
+from app.models.webhook import Webhook
+from app.services.webhook_service import WebhookService
+from utils.coordination import Coordinator
+
+def make_webhook(id: str, event_type: str = "trade.completed", is_active: bool = True) -> Webhook:
+    return Webhook(id=id, target_url=f"https://example.com/{id}", event_type=event_type, secret="s", is_active=is_active)
+
+def make_service(server) -> WebhookService:
+    adapter = RedisAdapter()
+    adapter.client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    return WebhookService(storage_adapter=adapter)
+
+@pytest.mark.asyncio
+async def test_index_serves_publisher_lookups_without_queries():
+    service = make_service(fakeredis.FakeServer())
+    await service.create_webhook(make_webhook("wh-1"))
+    await service.create_webhook(make_webhook("wh-2", is_active=False))
+    await service.create_webhook(make_webhook("wh-3", event_type="auction.created"))
+    await service.load_index()
+
+    queries = []
+    iter_ = service.storage_adapter.iter
+    service.storage_adapter.iter = lambda *args, **kwargs: queries.append(args) or iter_(*args, **kwargs)
+
+    assert [w.id for w in await service.list_webhooks(event_type="trade.completed", is_active=True)] == ["wh-1"]
+    assert await service.list_webhooks(event_type="snft.minted", is_active=True) == []
+    assert queries == []
+    # Other filters still query the store
+    assert {w.id for w in await service.list_webhooks(event_type="trade.completed")} == {"wh-1", "wh-2"}
+    assert len(queries) == 1
+
+@pytest.mark.asyncio
+async def test_writes_refresh_the_index_in_every_worker():
+    server = fakeredis.FakeServer()
+    workers = [make_service(server), make_service(server)]
+    coordinators = [Coordinator(fakeredis.FakeAsyncRedis(server=server, decode_responses=True)) for _ in workers]
+    for service, coordinator in zip(workers, coordinators):
+        await coordinator.start()
+        service.use_coordinator(coordinator)
+        await service.load_index()
+    try:
+        await workers[0].create_webhook(make_webhook("wh-1"))
+        assert [w.id for w in await workers[0].list_webhooks(event_type="trade.completed", is_active=True)] == ["wh-1"]
+
+        for _ in range(200):
+            if await workers[1].list_webhooks(event_type="trade.completed", is_active=True):
+                break
+            await asyncio.sleep(0.01)
+        assert [w.id for w in await workers[1].list_webhooks(event_type="trade.completed", is_active=True)] == ["wh-1"]
+
+        await workers[1].delete_webhook("wh-1")
+        assert await workers[1].list_webhooks(event_type="trade.completed", is_active=True) == []
+    finally:
+        for coordinator in coordinators:
+            await coordinator.stop()
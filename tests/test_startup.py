@@ -0,0 +1,26 @@
+import subprocess
+import sys
+import pytest
+from benchmarks.importtime import deferred_imports, import_target, parse_importtime, startup_environment
+
+@pytest.mark.parametrize("engine", ["REDIS", "MONGODB"])
+def test_startup_defers_unused_backends_and_celery(engine):
+    entries = import_target(startup_environment(engine))
+    assert any(entry.module == "app.main" for entry in entries)
+    assert deferred_imports(entries) == []
+
+def test_no_network_clients_are_built_at_import():
+    script = "import app.main as main; print('client' in vars(main.mongodb_adapter.inner))"
+    completed = subprocess.run([sys.executable, "-c", script], env=startup_environment(), capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    assert completed.stdout.strip() == "False" # The Motor client is created on first use (ensure_indexes at startup)
+
+def test_parse_importtime_reads_nesting():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   celery.local\n"
+        "import time:       300 |        420 | app.main\n"
+    )
+    entries = parse_importtime(stderr)
+    assert [(e.module, e.depth, e.cumulative_us) for e in entries] == [("celery.local", 1, 120), ("app.main", 0, 420)]
+    assert deferred_imports(entries) == ["celery"]
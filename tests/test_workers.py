@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+import pytest
+from utils.workers import available_cpus, pool_share, worker_count
+
+@pytest.fixture
+def eight_cores(monkeypatch):
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(8)), raising=False)
+
+def test_cpu_quota_caps_available_cpus(tmp_path, eight_cores):
+    cpu_max = tmp_path / "cpu.max"
+    cpu_max.write_text("150000 100000\n")
+    assert available_cpus(str(cpu_max)) == 2 # 1.5 CPUs of quota rounds up
+    cpu_max.write_text("50000 100000\n")
+    assert available_cpus(str(cpu_max)) == 1
+
+def test_unlimited_or_missing_quota_uses_affinity(tmp_path, eight_cores):
+    cpu_max = tmp_path / "cpu.max"
+    cpu_max.write_text("max 100000\n")
+    assert available_cpus(str(cpu_max)) == 8
+    assert available_cpus(str(tmp_path / "missing")) == 8
+
+def test_worker_count_defaults_to_available_cpus():
+    assert worker_count(0) == available_cpus()
+    assert worker_count(None) == available_cpus()
+    assert worker_count(3) == 3
+
+def test_pool_share_splits_the_budget():
+    assert pool_share(256, 4) == 64
+    assert pool_share(200, 3) == 66 # Rounded down, so the workers together stay within the budget
+    assert pool_share(4, 8) == 2 # Never below the per-worker minimum
+
+def test_metrics_are_aggregated_over_workers(tmp_path):
+    # prometheus_client picks its value store at import, so each "worker" is a fresh interpreter
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "PYTHONPATH": os.pathsep.join(sys.path)}
+    record = "from utils.metrics import POOL_MAX, POOL_TIMEOUTS; POOL_MAX.labels('redis').set(64); POOL_TIMEOUTS.labels('redis').inc()"
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", record], env=env, check=True)
+    scrape = "import sys; from utils.metrics import exposition; sys.stdout.write(exposition().decode())"
+    payload = subprocess.run([sys.executable, "-c", scrape], env=env, check=True, capture_output=True, text=True).stdout
+    assert 'connection_pool_max{backend="redis"} 128.0' in payload
+    assert 'connection_pool_timeouts_total{backend="redis"} 2.0' in payload